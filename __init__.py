@@ -37,6 +37,9 @@ from . import fixture as fixture
 from .acn import DMX_sACN
 from .artnet import DMX_ArtNet
 from .data import DMX_Data
+from .decode_plan import DMX_Decode_Plan, DMX_Lookup_Tables
+from .fixture_index import DMX_Fixture_Index
+from .selection import DMX_Selection
 from .i18n import DMX_Lang
 from .mdns import DMX_Zeroconf
 from .mvrx_protocol import DMX_MVR_X_Client, DMX_MVR_X_Server, DMX_MVR_X_WS_Client
@@ -56,6 +59,9 @@ _MSG_BUS_OWNER = object()
 @bpy.app.handlers.persistent
 def onLoadFile(dummy):  # dummy is the filepath or None
     bpy.msgbus.clear_by_owner(_MSG_BUS_OWNER)
+    DMX_Decode_Plan.invalidate()
+    DMX_Lookup_Tables.clear()  # tables of the previous file are not used anymore
+    DMX_Fixture_Index.invalidate()
     scene = bpy.context.scene
     if scene and "DMX" in scene.collection.children:
         print("INFO", "File contains DMX show, linking...")
@@ -98,7 +104,9 @@ def onSavePre(scene):
 
 
 @bpy.app.handlers.persistent
-def onUndo(scene):
+def onUndo(scene):  # also runs after redo
+    DMX_Decode_Plan.invalidate()  # channels and patch may have been reverted
+    DMX_Fixture_Index.invalidate()
     if not scene.dmx.collection and DMX.linkedToFile:
         scene.dmx.unlinkFile()
 
@@ -106,19 +114,19 @@ def onUndo(scene):
 # Callbacks #
 
 
+@DMX_Selection.batched
 def onActiveChanged(*args):
     dmx = bpy.context.scene.dmx
     if dmx.volume_preview == "SELECTED":
         dmx.updatePreviewVolume()
 
     if dmx.display_2D:
-        selected = False
+        active_fixture = None
+        if bpy.context.active_object is not None:
+            active_fixture = dmx.findFixture(bpy.context.active_object)
+        selected = active_fixture is not None
         for fixture in dmx.fixtures:
-            if (
-                bpy.context.active_object is not None
-                and bpy.context.active_object.name in fixture.collection.objects
-            ):
-                selected = True
+            if fixture == active_fixture:
                 fixture.select()
             else:
                 fixture.unselect()
@@ -175,12 +183,14 @@ def register():
     bpy.app.handlers.load_post.append(onLoadFile)
     bpy.app.handlers.save_pre.append(onSavePre)
     bpy.app.handlers.undo_post.append(onUndo)
+    bpy.app.handlers.redo_post.append(onUndo)
 
     Timer(1, onRegister, ()).start()
 
 
 def unregister():
     DMX_GDTF_File.write_cache()
+    DMX_GDTF_File.release_gdtf_profile()
     # Stop ArtNet
     DMX_ArtNet.disable()
     DMX_sACN.disable()
@@ -216,6 +226,8 @@ def unregister():
 
     bpy.app.handlers.load_post.clear()
     bpy.app.handlers.undo_post.clear()
+    if onUndo in bpy.app.handlers.redo_post:
+        bpy.app.handlers.redo_post.remove(onUndo)
     bpy.msgbus.clear_by_owner(_MSG_BUS_OWNER)
 
     clean_module_imports()
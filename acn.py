@@ -16,41 +16,76 @@
 # with this program. If not, see <https://www.gnu.org/licenses/>.
 
 import bpy
-from sacn import sACNreceiver
+from sacn import DataPacket, sACNreceiver
 
-from .data import DMX_Data
+from .ingest import DMX_Ingest
 from .logging_setup import DMX_Log
+from .profiler import DMX_Profiler
 
 
 class DMX_sACN:
     _instance = None
+    _sequences = {}  # (cid, universe): last sequence number
 
     def __init__(self):
         super(DMX_sACN, self).__init__()
         self.data = None
         self.receiver = sACNreceiver()
+        # The receiver filters sequence and priority per universe and drops
+        # packets of all but one source. Take the packets before that filtering,
+        # sources are tracked and merged by DMX_Ingest.
+        self.receiver._handler.on_data = DMX_sACN.on_data
         self._dmx = bpy.context.scene.dmx
 
+    def on_data(data, current_time):
+        try:
+            packet = DataPacket.make_data_packet(data)
+        except TypeError:  # not a DMX data packet
+            return
+        DMX_sACN.callback(packet)
+
+    def is_legal_sequence(packet):
+        """Drop out of order packets of a source, see E1.31 6.7.2"""
+        key = (packet.cid, packet.universe)
+        if packet.option_StreamTerminated:
+            DMX_sACN._sequences.pop(key, None)
+            return True
+        last = DMX_sACN._sequences.get(key)
+        if last is not None:
+            diff = ((packet.sequence - last + 128) & 0xFF) - 128
+            if -20 < diff <= 0:
+                return False
+        DMX_sACN._sequences[key] = packet.sequence
+        return True
+
     def callback(packet):  # packet type: sacn.DataPacket
+        if DMX_Profiler.enabled:
+            DMX_Profiler.count_packet("sACN", packet.universe)
         if packet.dmxStartCode > 0:
             # See https://tsp.esta.org/tsp/working_groups/CP/DMXAlternateCodes.php
             DMX_Log.log.debug("Ignoring packet with start code %s", packet.dmxStartCode)
             return
-        dmx = bpy.context.scene.dmx
-        if packet.universe >= len(dmx.universes):
+        if not DMX_sACN.is_legal_sequence(packet):
+            DMX_Log.log.debug("Ignoring out of order packet %s", packet)
+            return
+        # runs in the receiver thread, bpy data must not be accessed here
+        inputs = DMX_Ingest.inputs()
+        if packet.universe >= len(inputs):
             DMX_Log.log.error(
                 "Not enough DMX universes set in BlenderDMX for incoming sACN data"
             )
             return
-        if dmx.universes[packet.universe].input != "sACN":
+        if inputs[packet.universe] != "sACN":
             DMX_Log.log.warning("This DMX universe is not set to accept sACN data")
             return
-        DMX_Data.set_universe(packet.universe, bytearray(packet.dmxData), "sACN")
-        try:
-            if dmx.sacn_status != "online":
-                dmx.sacn_status = "online"
-        except Exception as e:
-            DMX_Log.log.error(f"Error when setting status {e}")
+        DMX_Ingest.write(
+            "sACN",
+            packet.universe,
+            packet.dmxData,
+            origin=packet.cid,
+            priority=packet.priority,
+            terminated=packet.option_StreamTerminated,
+        )
 
     @staticmethod
     def enable():
@@ -66,9 +101,6 @@ class DMX_sACN:
                 continue
             if universe == 0:  # invalid for sACN
                 continue
-            DMX_sACN._instance.receiver.register_listener(
-                "universe", DMX_sACN.callback, universe=universe
-            )
             DMX_Log.log.info(("Joining sACN universe:", universe))
             DMX_sACN._instance.receiver.join_multicast(universe)
         dmx.sacn_status = "listen"
@@ -80,8 +112,9 @@ class DMX_sACN:
             for universe in range(1, len(dmx.universes) + 1):
                 DMX_Log.log.info(("Leaving sACN universe:", universe))
                 DMX_sACN._instance.receiver.leave_multicast(universe)
-            DMX_sACN._instance.receiver.remove_listener(DMX_sACN.callback)
             DMX_sACN._instance.receiver.stop()
             DMX_sACN._instance.data = None
             DMX_sACN._instance = None
-        dmx.set_acn_status = "offline"
+            DMX_sACN._sequences.clear()
+            DMX_Ingest.clear("sACN")
+        dmx.sacn_status = "offline"
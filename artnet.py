@@ -15,6 +15,7 @@
 # You should have received a copy of the GNU General Public License along
 # with this program. If not, see <https://www.gnu.org/licenses/>.
 
+import select
 import struct
 import threading
 from socket import (
@@ -29,8 +30,9 @@ from socket import (
 
 import bpy
 
-from .data import DMX_Data
+from .ingest import DMX_Ingest
 from .logging_setup import DMX_Log
+from .profiler import DMX_Profiler
 from .network import DMX_Network
 
 # ArtnetPacket class taken from here:
@@ -38,12 +40,19 @@ from .network import DMX_Network
 # Thank you, @alarrosa!
 
 ARTNET_PORT = 6454
+RECV_SIZE = 1024
+# max number of datagrams read in one go before the newest frames are stored
+MAX_DRAIN = 1024
 
 
 class ArtnetPacket:
     ARTNET_HEADER = b"Art-Net\x00"
     opcode_ArtDMX = 0x5000
     opcode_ArtPoll = 0x2000
+    # ID, OpCode (low byte first)
+    HEADER = struct.Struct("<8sH")
+    # ProtVer, Sequence, Physical, SubUni, Net, Length
+    DMX_HEADER = struct.Struct("!HBBBBH")
 
     def __init__(self):
         self.op_code = None
@@ -53,6 +62,7 @@ class ArtnetPacket:
         self.net = None
         self.subnet = None
         self.universe = None
+        self.port_address = None
         self.length = None
         self.data = None
 
@@ -72,25 +82,35 @@ class ArtnetPacket:
         )
 
     def build(udp_data):
-        if struct.unpack("!8s", udp_data[:8])[0] != ArtnetPacket.ARTNET_HEADER:
+        """Parse a datagram, the header is only decoded here. For ArtDMX packets,
+        data is a view into udp_data, valid only as long as the buffer is not reused."""
+        if len(udp_data) < 10:
+            return None
+        header, op_code = ArtnetPacket.HEADER.unpack_from(udp_data)
+        if header != ArtnetPacket.ARTNET_HEADER:
             DMX_Log.log.debug("Received a non Art-Net packet")
             return None
 
         packet = ArtnetPacket()
+        packet.op_code = op_code
+        if op_code != ArtnetPacket.opcode_ArtDMX:
+            return packet
+        if len(udp_data) < 18:
+            return None
+
         (
-            packet.op_code,
             packet.ver,
             packet.sequence,
             packet.physical,
             sub_uni,
             packet.net,
             packet.length,
-        ) = struct.unpack("!HHBBBBH", udp_data[8:18])
+        ) = ArtnetPacket.DMX_HEADER.unpack_from(udp_data, 10)
+        packet.net &= 0x7F
         (packet.subnet, packet.universe) = sub_uni >> 4, sub_uni & 0x0F
-
-        packet.data = struct.unpack(
-            "{0}s".format(int(packet.length)), udp_data[18 : 18 + int(packet.length)]
-        )[0]
+        # 15 bit Port-Address: Net (7 bits), Sub-Net (4 bits), Universe (4 bits)
+        packet.port_address = (packet.net << 8) | sub_uni
+        packet.data = udp_data[18 : 18 + packet.length]
 
         return packet
 
@@ -112,11 +132,14 @@ class DMX_ArtNet(threading.Thread):
             self._dmx.artnet_status = "socket_error"
             raise ValueError("Socket opening error")
 
-        # self._socket.settimeout(30)
+        # waiting is done by select, reading drains the socket until it is empty
+        self._socket.setblocking(False)
         self._stopped = False
-        # Used with the universe number to determine the Art-Net Port-Address
-        self.net = 0
-        self.subnet = 0
+        # preallocated receive buffers with their views, grows to the number of
+        # universes received in one burst
+        self._buffers = [self.new_buffer() for _ in range(4)]
+        # (online, inputs, replies), built on the first ArtPoll
+        self._poll_replies = None
 
     def stop(self):
         try:
@@ -127,147 +150,169 @@ class DMX_ArtNet(threading.Thread):
             raise ValueError("Socket closing error")
         self._stopped = True
 
+    @staticmethod
+    def new_buffer():
+        buffer = bytearray(RECV_SIZE)
+        return buffer, memoryview(buffer)
+
     def run(self):
         while not self._stopped:
-            data = b""
             try:
-                data = self._socket.recv(1024)
-            except Exception as e:
-                DMX_Log.log.error(e)
-            if len(data) < 8:
-                continue
-            if struct.unpack("!8s", data[:8])[0] != ArtnetPacket.ARTNET_HEADER:
-                continue
-            opcode = struct.unpack("<H", data[8:10])[0]
-            if opcode == ArtnetPacket.opcode_ArtDMX:
-                self.handleArtNet(data)
-            elif opcode == ArtnetPacket.opcode_ArtPoll:
-                self.handle_ArtPoll()
-            # DMX_Log.log.debug(packet)
-            # self._socket.close()
+                readable, _, _ = select.select([self._socket], [], [], 0.5)
+            except (OSError, ValueError) as e:
+                if not self._stopped:
+                    DMX_Log.log.error(e)
+                break
+            if readable:
+                self.drain()
         DMX_Log.log.info("Closing socket...")
-        self._dmx.artnet_status = "socket_close"
         self._socket.close()
-        self._dmx.artnet_status = "offline"
         self._stopped = True
 
     def handle_ArtPoll(self):
         """ArtPoll is a message to find out which other ArtNet devices are in the network.
-        Sends an ArtPollReply message as an answer."""
-        self._socket.sendto(self.build_ArtPollReply(), ("<broadcast>", ARTNET_PORT))
-
-    def handleArtNet(self, data):
-        packet = ArtnetPacket.build(data)
-        if not packet:
-            return
-
-        try:
-            if self._dmx.artnet_status != "online":
-                self._dmx.artnet_status = "online"
-        except Exception as e:
-            DMX_Log.log.error(f"Error when setting status {e}")
-
-        if not (packet.net == self.net and packet.subnet == self.subnet):
-            DMX_Log.log.info("rejected {packet}")
-            return
-        # we are not checking if we are actually subscribed to the universe
-        # so all packets with matching net and subnet will be accepted
-        if packet.universe >= len(self._dmx.universes):
-            return
-        if not self._dmx.universes[packet.universe]:
-            return
-        if self._dmx.universes[packet.universe].input != "ARTNET":
-            return
-        DMX_Data.set_universe(packet.universe, bytearray(packet.data), "ARTNET")
-
-    def build_ArtPollReply(self):
-        """Builds an ArtPollReply message."""
-        content = []
-        # Name, 7byte + 0x00
-        content.append(ArtnetPacket.ARTNET_HEADER)
-        # OpCode ArtPollReply -> 0x2100, Low Byte first
-        content.append(struct.pack("<H", 0x2100))
-        # Protocol Version 14, High Byte first
-        # content.append(struct.pack('>H', 14))  # <- not in ArtPollReply
-        # IP
-        if len(DMX_Network.cards(None, None)):
-            ip = DMX_Network.cards(None, None)[-1][0]
-        else:
-            ip = "0.0.0.0"
-        ip = [int(i) for i in ip.split(".")]
-        content += [struct.pack("B", i) for i in ip]
-        # Port
-        content.append(struct.pack("<H", 0x1936))
-        # Firmware Version
-        content.append(struct.pack("!H", 1))
-        # Net and subnet of this node
-        content.append(struct.pack("B", self.net))  # NetSwitch
-        content.append(struct.pack("B", self.subnet))  # SubSwitch
-
-        # BlenderDMX OEM registered code, do not reuse if copying this code.
-        # Programmers: do not copy for other Art-Net implementations,
-        # apply for your OEM code here: https://art-net.org.uk/join-the-club/oem-code-application/
-        # the process is simple.
-        content.append(struct.pack("H", 0x962C))
-
-        # UBEA Version -> Nope -> 0
-        # Status1
-        content.append(struct.pack("H", 0))
-        # Manufacture ESTA Code
-        content.append(
-            struct.pack("<H", 32767)
-        )  # ESTA RDM test code since we did not apply
-        # Short Name
-        content.append(struct.pack("18s", b"BlenderDMX"))
-        content.append(struct.pack("64s", b"BlenderDMX GDTF & MVR plugin for Blender"))
-        description = b"#0001 [0000] BlenderDMX. All your GDTFs are belong to us."
-        content.append(struct.pack("64s", description))
-        # ports
-        num_ports = 0  # how many universes do we want to subscribe to
-        subscribed_universes = []
-        for idx, universe in enumerate(self._dmx.universes):
-            if universe.input == "ARTNET":
-                num_ports += 1
-                subscribed_universes.append(idx)
-
-            # the spec limits this to a max of 4 per ArtPollReply
-            # for more than 4 ports, we would need to send multiple replies
-            # and set BindIndex
-            if num_ports == 4:
+        Sends ArtPollReply messages as an answer, these are cached until the
+        inputs of universes or the online status change."""
+        online = DMX_Ingest.is_online("ARTNET")
+        inputs = DMX_Ingest.inputs()  # replaced by a new snapshot on every change
+        poll_replies = self._poll_replies
+        if (
+            poll_replies is None
+            or poll_replies[0] != online
+            or poll_replies[1] is not inputs
+        ):
+            poll_replies = (online, inputs, self.build_ArtPollReply(online, inputs))
+            self._poll_replies = poll_replies
+        for reply in poll_replies[2]:
+            self._socket.sendto(reply, ("<broadcast>", ARTNET_PORT))
+
+    def drain(self):
+        """Read all queued datagrams. Of a burst, only the newest ArtDMX frame
+        of every universe is stored, older ones are dropped."""
+        pending = {}  # port_address: (buffer, packet)
+        for _ in range(MAX_DRAIN):
+            buffer = self._buffers.pop() if self._buffers else self.new_buffer()
+            try:
+                size = self._socket.recv_into(buffer[0])
+            except BlockingIOError:
+                self._buffers.append(buffer)
                 break
-
-        # NumPortsLo/Hi, may be ignored by nodes
-        content.append(struct.pack(">H", num_ports))
-        for i in range(4):  # PortTypes
-            if i < num_ports:
-                content.append(struct.pack("B", 0b1000_0000))  # Output DMX
-            else:
-                content.append(struct.pack("B", 0))
-        content.append(struct.pack(">L", 0))  # GoodInput
-
-        for i in range(4):  # GoodOutputA
-            if self._dmx.artnet_status == "online":
-                # confirm we are receiving DMX data. ideally we would check this for every universe individually
-                content.append(struct.pack("B", 0b1000_0000))
-            else:
-                content.append(struct.pack("B", 0))  # not receiving any data
-
-        for i in range(4):  # SwIn
-            content.append(struct.pack("B", 5))
-
-        for i in range(4):  # SwOut
-            if i < num_ports:
-                content.append(struct.pack("B", subscribed_universes[i]))
-            else:
-                content.append(struct.pack("B", 0))
-
-        # AcnPriority, SwMacro, SwRemote, Spare[3]
-        content.append(struct.pack("6s", b""))
-        content.append(struct.pack("B", 0x06))  # Style: StVisual, a visualiser
-        content.append(struct.pack("27s", b""))  # 0000
-
-        # stitch together
-        return b"".join(content)
+            except OSError as e:
+                if not self._stopped:
+                    DMX_Log.log.error(e)
+                self._buffers.append(buffer)
+                break
+            packet = ArtnetPacket.build(buffer[1][:size])
+            if packet is None or packet.op_code != ArtnetPacket.opcode_ArtDMX:
+                self._buffers.append(buffer)
+                if packet is not None and packet.op_code == ArtnetPacket.opcode_ArtPoll:
+                    self.handle_ArtPoll()
+                continue
+            if DMX_Profiler.enabled:
+                DMX_Profiler.count_packet("ARTNET", packet.port_address)
+            previous = pending.get(packet.port_address)
+            if previous is not None:
+                self._buffers.append(previous[0])
+            pending[packet.port_address] = (buffer, packet)
+
+        if pending:
+            self.handleArtNet([packet for _, packet in pending.values()])
+            self._buffers.extend(buffer for buffer, _ in pending.values())
+
+    def handleArtNet(self, packets):
+        # The Port-Address is used as the BlenderDMX universe number.
+        # We are not checking if we are actually subscribed to the universe,
+        # all packets for universes set to Art-Net input will be accepted.
+        # Data is published to DMX_Data and the status set by the main thread.
+        for packet in packets:
+            if DMX_Ingest.accepts("ARTNET", packet.port_address):
+                DMX_Ingest.write("ARTNET", packet.port_address, packet.data)
+
+    def build_ArtPollReply(self, online, inputs):
+        """Builds ArtPollReply messages, one for every group of up to 4 Art-Net
+        universes sharing Net and Sub-Net, numbered by BindIndex."""
+        # IP
+        ip = self.ip_addr
+        if ip in ("", "0.0.0.0"):
+            cards = DMX_Network.cards(None, None)
+            ip = cards[-1][0] if len(cards) else "0.0.0.0"
+        ip = bytes(int(i) for i in ip.split("."))
+
+        # ports, grouped by Net and Sub-Net, the spec limits this to a max of 4 per ArtPollReply
+        groups = {}
+        for idx, universe_input in enumerate(inputs):
+            if universe_input == "ARTNET":
+                groups.setdefault(idx >> 4, []).append(idx & 0x0F)
+        ports = [
+            (net_subnet, universes[i : i + 4])
+            for net_subnet, universes in groups.items()
+            for i in range(0, len(universes), 4)
+        ] or [(0, [])]
+
+        replies = []
+        for bind_index, (net_subnet, universes) in enumerate(ports, start=1):
+            num_ports = len(universes)
+            content = []
+            # Name, 7byte + 0x00
+            content.append(ArtnetPacket.ARTNET_HEADER)
+            # OpCode ArtPollReply -> 0x2100, Low Byte first
+            content.append(struct.pack("<H", 0x2100))
+            # IP
+            content.append(ip)
+            # Port
+            content.append(struct.pack("<H", 0x1936))
+            # Firmware Version
+            content.append(struct.pack("!H", 1))
+            # Net and subnet of this node
+            content.append(struct.pack("B", net_subnet >> 4))  # NetSwitch
+            content.append(struct.pack("B", net_subnet & 0x0F))  # SubSwitch
+
+            # BlenderDMX OEM registered code, do not reuse if copying this code.
+            # Programmers: do not copy for other Art-Net implementations,
+            # apply for your OEM code here: https://art-net.org.uk/join-the-club/oem-code-application/
+            # the process is simple.
+            content.append(struct.pack("H", 0x962C))
+
+            # UBEA Version -> Nope -> 0
+            # Status1
+            content.append(struct.pack("H", 0))
+            # Manufacture ESTA Code
+            content.append(
+                struct.pack("<H", 32767)
+            )  # ESTA RDM test code since we did not apply
+            # Short Name
+            content.append(struct.pack("18s", b"BlenderDMX"))
+            content.append(
+                struct.pack("64s", b"BlenderDMX GDTF & MVR plugin for Blender")
+            )
+            description = b"#0001 [0000] BlenderDMX. All your GDTFs are belong to us."
+            content.append(struct.pack("64s", description))
+
+            # NumPortsLo/Hi, may be ignored by nodes
+            content.append(struct.pack(">H", num_ports))
+            # PortTypes, Output DMX
+            content.append(bytes(0b1000_0000 if i < num_ports else 0 for i in range(4)))
+            content.append(struct.pack(">L", 0))  # GoodInput
+
+            # GoodOutputA, confirm we are receiving DMX data.
+            # ideally we would check this for every universe individually
+            good_output = 0b1000_0000 if online else 0
+            content.append(bytes([good_output] * 4))
+
+            content.append(bytes([5] * 4))  # SwIn
+            content.append(bytes(universes + [0] * (4 - num_ports)))  # SwOut
+
+            # AcnPriority, SwMacro, SwRemote, Spare[3]
+            content.append(struct.pack("6s", b""))
+            content.append(struct.pack("B", 0x06))  # Style: StVisual, a visualiser
+            content.append(struct.pack("6s", b""))  # MAC, not known
+            content.append(ip)  # BindIp
+            content.append(struct.pack("B", bind_index))  # BindIndex
+            content.append(struct.pack("16s", b""))  # 0000
+
+            # stitch together
+            replies.append(b"".join(content))
+        return replies
 
     @staticmethod
     def enable():
@@ -304,6 +349,7 @@ class DMX_ArtNet(threading.Thread):
             except Exception as e:
                 DMX_Log.log.exception(e)
             DMX_ArtNet._thread = None
+            DMX_Ingest.clear("ARTNET")
             dmx.artnet_status = "offline"
             DMX_Log.log.info("DONE")
         elif dmx:
@@ -77,7 +77,12 @@ def export_custom_data(directory_name, file_name):
     ignore = shutil.ignore_patterns("BlenderDMX*")
 
     try:
-        shutil.copytree(models_path, os.path.join(export_dir, "models"))
+        # the model library is specific to the Blender version, it is not exported
+        shutil.copytree(
+            models_path,
+            os.path.join(export_dir, "models"),
+            ignore=shutil.ignore_patterns("library"),
+        )
         if os.path.exists(mvrs_path):
             shutil.copytree(mvrs_path, os.path.join(export_dir, "mvrs"))
         shutil.copytree(
@@ -0,0 +1,143 @@
+# Copyright (C) 2026 vanous
+#
+# This file is part of BlenderDMX.
+#
+# BlenderDMX is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# BlenderDMX is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>.
+
+import json
+from contextlib import contextmanager
+
+import bpy
+
+from .util import generate_fixture_name
+
+
+class DMX_Bulk_Build:
+    """State shared while many fixtures are built in one go, as during MVR
+    import. Fixtures of the same profile and mode reuse one set of mode tables
+    (channels, gobo images, wheel colors), new fixture names are counted
+    instead of searched for and group memberships are written once when the
+    bulk build finishes.
+
+    The state lives on the instance and is only used while building() is
+    entered. A stepped import enters it for each step only, so fixtures added
+    from the UI between the steps are built as usual."""
+
+    _current = None  # instance in building(), None otherwise
+
+    def __init__(self):
+        self.depth = 0
+        self.names = None  # fixture names in use, taken when building starts
+        self.counters = {}  # base name: last number handed out
+        self.tables = {}  # (profile, mode name): mode tables
+        self.groups = {}  # group name: (group uuid, [fixture uuids])
+
+    @contextmanager
+    def building(self):
+        previous = DMX_Bulk_Build._current
+        if self.depth == 0:
+            # fixtures may have been added or renamed since the previous step
+            self.names = {fixture.name for fixture in bpy.context.scene.dmx.fixtures}
+        self.depth += 1
+        DMX_Bulk_Build._current = self
+        try:
+            yield self
+        finally:
+            self.depth -= 1
+            DMX_Bulk_Build._current = previous
+            if self.depth == 0:
+                self.names = None
+
+    def finish(self):
+        """Write the collected group memberships"""
+        groups, self.groups = self.groups, {}
+        for group_name, (group_uuid, fixture_uuids) in groups.items():
+            DMX_Bulk_Build._write_group(group_name, group_uuid, fixture_uuids)
+        self.tables = {}
+
+    def steps(self, generator):
+        """Run a generator of import steps, building in bulk while a step runs,
+        and finish when the generator is done or closed"""
+        try:
+            while True:
+                with self.building():
+                    try:
+                        step = next(generator)
+                    except StopIteration as stop:
+                        return stop.value
+                yield step
+        finally:
+            generator.close()
+            self.finish()
+
+    @staticmethod
+    def active():
+        return DMX_Bulk_Build._current is not None
+
+    @staticmethod
+    def fixture_name(base):
+        bulk = DMX_Bulk_Build._current
+        if bulk is None:
+            return generate_fixture_name(base)
+        number = bulk.counters.get(base, 0)
+        while True:
+            number += 1
+            name = f"{base} {number:>04}"
+            if name not in bulk.names:
+                break
+        bulk.counters[base] = number
+        bulk.names.add(name)
+        return name
+
+    @staticmethod
+    def mode_tables(profile, mode, build):
+        """Tables of a profile mode, built once per bulk build"""
+        bulk = DMX_Bulk_Build._current
+        if bulk is None:
+            return build()
+        key = (profile, mode)
+        tables = bulk.tables.get(key)
+        if tables is not None and all(
+            name in bpy.data.images for name in tables.gobo_images
+        ):
+            return tables
+        tables = build()
+        bulk.tables[key] = tables
+        return tables
+
+    @staticmethod
+    def add_to_group(group_name, group_uuid, fixture_uuid):
+        """Add the fixture to a group now or when the bulk build finishes"""
+        bulk = DMX_Bulk_Build._current
+        if bulk is not None:
+            entry = bulk.groups.setdefault(group_name, (group_uuid, []))
+            entry[1].append(fixture_uuid)
+            return
+        DMX_Bulk_Build._write_group(group_name, group_uuid, [fixture_uuid])
+
+    @staticmethod
+    def _write_group(group_name, group_uuid, fixture_uuids):
+        dmx = bpy.context.scene.dmx
+        if group_name in dmx.groups:
+            group = dmx.groups[group_name]
+        else:
+            group = dmx.groups.add()
+            group.name = group_name
+            group.uuid = group_uuid
+        if group.dump:
+            dump = json.loads(group.dump)
+        else:
+            dump = []
+        dump.extend(fixture_uuids)
+        group.dump = json.dumps(dump)
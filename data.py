@@ -17,7 +17,10 @@
 
 import bpy
 import base64
+import threading
 from pathlib import Path
+
+import numpy as np
 from bpy.props import IntProperty
 from bpy.types import PropertyGroup
 
@@ -37,18 +40,22 @@ class DMX_Value(PropertyGroup):
 
 
 class DMX_Data:
-    _universes = []
+    _buffer = bytearray()  # contiguous DMX data of all universes, 512 bytes each
+    _universes = []  # per-universe memoryviews into _buffer
     _virtuals = {}  # Virtual channels. These are per fixture and have an attribute and a value
     _dmx = None  # Cache access to the context.scene
     _live_view_data = [0] * 512
+    # Changes since the last render: {universe: [first, last]} address range (1-based)
+    # and names of fixtures with changed virtual channels
+    _dirty = {}
+    _dirty_virtuals = set()
+    _dirty_lock = threading.Lock()  # set_universe is called from network threads
 
     @staticmethod
     def save_data():
         name = "DMX_Data"
         try:
-            dmx_data = DMX_Data._universes
-            combined_data = b"".join(dmx_data)
-            encoded = base64.b64encode(combined_data).decode("ascii")
+            encoded = base64.b64encode(DMX_Data._buffer).decode("ascii")
             if name in bpy.data.texts:
                 text_block = bpy.data.texts[name]
                 text_block.clear()
@@ -70,10 +77,11 @@ class DMX_Data:
             encoded = bpy.data.texts[name].as_string()
             binary_data = base64.b64decode(encoded)
 
-            DMX_Data._universes = [
-                bytearray(binary_data[i : i + data_length])
-                for i in range(0, len(binary_data), data_length)
-            ]
+            universes = max(
+                len(DMX_Data._universes), -(-len(binary_data) // data_length)
+            )
+            DMX_Data.allocate(universes)
+            DMX_Data._buffer[: len(binary_data)] = binary_data
         except Exception as e:
             print("INFO", e)
 
@@ -96,15 +104,26 @@ class DMX_Data:
             pass
         DMX_Data.prepare_empty_buffer()
         old_n = len(DMX_Data._universes)
+        if universes == old_n:
+            return
         # shrinking (less universes then before)
         if universes < old_n:
             DMX_Log.log.info(f"DMX Universes Deallocated: {universes}, to {old_n}")
-            DMX_Data._universes = DMX_Data._universes[:universes]
         # growing (more universes then before)
         else:
-            for u in range(old_n, universes):
-                DMX_Data._universes.append(bytearray([0] * 512))
-                DMX_Log.log.debug(f"DMX Universe Allocated: {u}")
+            DMX_Log.log.debug(f"DMX Universes Allocated: {old_n} to {universes}")
+        DMX_Data.allocate(universes)
+
+    @staticmethod
+    def allocate(universes):
+        """Replace the buffer with one for the given number of universes, keeping
+        current values. Views of the old buffer stay valid but are not updated anymore."""
+        buffer = bytearray(universes * 512)
+        kept = min(len(DMX_Data._buffer), len(buffer))
+        buffer[:kept] = DMX_Data._buffer[:kept]
+        view = memoryview(buffer)
+        DMX_Data._universes = [view[u * 512 : (u + 1) * 512] for u in range(universes)]
+        DMX_Data._buffer = buffer
 
     @staticmethod
     def get_value(universe, *channels):
@@ -122,6 +141,7 @@ class DMX_Data:
             return bytearray([0] * n)
         if addr + n > 512:
             return bytearray([0] * n)
+        # a view into the universe buffer, not a copy
         return DMX_Data._universes[universe][addr - 1 : addr + n - 1]
 
     @staticmethod
@@ -147,7 +167,9 @@ class DMX_Data:
                 dmx = bpy.context.scene.dmx
                 dmx.dmx_values[addr - 1].channel = val
 
-        DMX_Data._universes[universe][addr - 1] = val
+        if DMX_Data._universes[universe][addr - 1] != val:
+            DMX_Data._universes[universe][addr - 1] = val
+            DMX_Data.mark_dirty(universe, addr, addr)
 
         # LiveDMX view
         if DMX_Data._dmx is not None:
@@ -165,6 +187,56 @@ class DMX_Data:
             ):
                 DMX_Data._live_view_data = DMX_Data._universes[universe]
 
+    @staticmethod
+    def set_many(writes):
+        """Same as set for many (universe, addr, val) items, checking the universe
+        inputs once and updating the LiveDMX view once"""
+        if not writes:
+            return
+        dmx = bpy.context.scene.dmx
+        accepted = {}
+        changed = {}
+        for universe, addr, val in writes:
+            allowed = accepted.get(universe)
+            if allowed is None:
+                allowed = (
+                    universe < len(DMX_Data._universes)
+                    and universe < len(dmx.universes)
+                    and dmx.universes[universe].input == "BLENDERDMX"
+                )
+                accepted[universe] = allowed
+            if not allowed or val > 255 or addr < 1 or addr > 511:
+                continue
+            data = DMX_Data._universes[universe]
+            if data[addr - 1] != val:
+                data[addr - 1] = val
+                span = changed.get(universe)
+                if span is None:
+                    changed[universe] = [addr, addr]
+                else:
+                    span[0] = min(span[0], addr)
+                    span[1] = max(span[1], addr)
+        for universe, (first, last) in changed.items():
+            DMX_Data.mark_dirty(universe, first, last)
+
+        # LiveDMX view
+        if DMX_Data._dmx is not None:
+            selected_live_dmx_universe = dmx.get_selected_live_dmx_universe()
+            if selected_live_dmx_universe is None:  # this should not happen
+                raise ValueError(
+                    "Missing selected universe, as if DMX base class is empty..."
+                )
+            universe = selected_live_dmx_universe.id
+            if selected_live_dmx_universe.input == "BLENDERDMX" and accepted.get(
+                universe
+            ):
+                span = changed.get(universe)
+                if span is not None:
+                    data = DMX_Data._universes[universe]
+                    for addr in range(span[0], span[1] + 1):
+                        dmx.dmx_values[addr - 1].channel = data[addr - 1]
+                DMX_Data._live_view_data = DMX_Data._universes[universe]
+
     @staticmethod
     def set_virtual(fixture, attribute, geometry, value):
         """Set value of virtual channel for given fixture"""
@@ -177,6 +249,8 @@ class DMX_Data:
             DMX_Data._virtuals[fixture][attribute] = {}
         DMX_Data._virtuals[fixture][attribute]["value"] = value
         DMX_Data._virtuals[fixture][attribute]["geometry"] = geometry
+        with DMX_Data._dirty_lock:
+            DMX_Data._dirty_virtuals.add(fixture)
 
     @staticmethod
     def get_virtual(fixture):
@@ -187,13 +261,23 @@ class DMX_Data:
 
     @staticmethod
     def set_universe(universe, data, source):
-        DMX_Log.log.debug((universe, data))
+        """Copy received DMX data (a buffer, ideally a memoryview of the receive buffer,
+        or a sequence of ints) into the universe. Slots beyond a short packet are kept."""
+        DMX_Log.log.debug((universe, source))
         if universe >= len(DMX_Data._universes):
             return
 
-        dmx_changed = DMX_Data._universes[universe] != data
+        length = min(len(data), 512)
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            new_data = np.frombuffer(data, dtype=np.uint8, count=length)
+        else:
+            new_data = np.asarray(data[:length], dtype=np.uint8)
+        old_data = np.frombuffer(DMX_Data._universes[universe], dtype=np.uint8)
+        changed = np.flatnonzero(old_data[:length] != new_data)
+        dmx_changed = len(changed) > 0
         if dmx_changed:
-            DMX_Data._universes[universe] = data
+            old_data[:length] = new_data
+            DMX_Data.mark_dirty(universe, changed[0] + 1, changed[-1] + 1)
 
         if DMX_Data._dmx is not None:
             dmx = bpy.context.scene.dmx
@@ -207,4 +291,24 @@ class DMX_Data:
                 and selected_live_dmx_universe.id == universe
             ):
                 if dmx_changed:
-                    DMX_Data._live_view_data = data
+                    DMX_Data._live_view_data = DMX_Data._universes[universe]
+
+    @staticmethod
+    def mark_dirty(universe, first, last):
+        """Record that addresses first..last (1-based) of the universe changed"""
+        with DMX_Data._dirty_lock:
+            dirty = DMX_Data._dirty.get(universe)
+            if dirty is None:
+                DMX_Data._dirty[universe] = [int(first), int(last)]
+            else:
+                dirty[0] = min(dirty[0], int(first))
+                dirty[1] = max(dirty[1], int(last))
+
+    @staticmethod
+    def pop_dirty():
+        """Return and reset changes recorded since the previous call,
+        as ({universe: [first, last]}, {fixture names with virtual changes})"""
+        with DMX_Data._dirty_lock:
+            dirty, DMX_Data._dirty = DMX_Data._dirty, {}
+            dirty_virtuals, DMX_Data._dirty_virtuals = DMX_Data._dirty_virtuals, set()
+        return dirty, dirty_virtuals
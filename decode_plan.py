@@ -0,0 +1,951 @@
+# Copyright (C) 2026 vanous
+#
+# This file is part of BlenderDMX.
+#
+# BlenderDMX is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# BlenderDMX is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>.
+
+# Compiled per-fixture DMX decode plans.
+#
+# A plan is a plain python snapshot of the fixture channels, channel functions,
+# channel sets and DMX breaks, taken once when the fixture is built or
+# re-patched. The render loop then decodes DMX data through the plan without
+# touching the RNA collections of the fixture, and dispatches every channel to
+# a handler resolved from dictionaries instead of a long elif chain.
+
+import numpy as np
+
+from .data import DMX_Data
+from .logging_setup import DMX_Log
+
+
+def normalize_dmx_value(value, source_bits, target_bits):
+    if source_bits <= 0 or target_bits <= 0:
+        return 0
+    target_max = (1 << target_bits) - 1
+    if source_bits == target_bits:
+        return max(0, min(int(value), target_max))
+    source_max = (1 << source_bits) - 1
+    scaled = round(int(value) * target_max / source_max)
+    return max(0, min(scaled, target_max))
+
+
+def dmx_to_physical(dmx_from, dmx_to, physical_from, physical_to, dmx_value):
+    """Same math as DMX_Fixture_Channel_Function.dmx_to_physical, on plain values"""
+    dmx_range = dmx_to - dmx_from
+    if dmx_range == 0:
+        return physical_from
+
+    if ((dmx_from - dmx_to) + physical_from) == 0:
+        return 0.0
+    return (dmx_value - dmx_from) * (physical_to - physical_from) / (
+        dmx_to - dmx_from
+    ) + physical_from
+
+
+class DMX_Lookup_Tables:
+    """DMX value → (function index, physical value, wheel slot) tables of channels.
+
+    A table is stored as segments, ranges of DMX values resolved by the same
+    channel function and channel set, so a 16 bit channel costs as much as an
+    8 bit one. Each table gets a base, a range of keys of its size, and the
+    segments of all tables live in shared arrays sorted by their first key,
+    so the values of all channels of a fixture are resolved with one search.
+    The arrays grow geometrically. Tables are keyed by the channel function
+    definitions, fixtures of the same type share them."""
+
+    starts = np.zeros(0, dtype=np.int64)  # table base + first DMX value
+    function_index = np.zeros(0, dtype=np.int16)  # -1: no function
+    wheel_slot = np.zeros(0, dtype=np.int32)  # -1: no channel set
+    # physical value = (DMX value - dmx_from) * physical_span / dmx_span + physical_from
+    dmx_from = np.zeros(0, dtype=np.float64)
+    dmx_span = np.ones(0, dtype=np.float64)
+    physical_from = np.zeros(0, dtype=np.float64)
+    physical_span = np.zeros(0, dtype=np.float64)
+    _count = 0  # used segments
+    _keys = 0  # base of the next table
+    _bases = {}
+
+    @staticmethod
+    def register(functions, size):
+        """Return the base of the table for these functions"""
+        key = (size, tuple(ch_f.key() for ch_f in functions))
+        base = DMX_Lookup_Tables._bases.get(key)
+        if base is not None:
+            return base
+
+        segments = DMX_Lookup_Tables.build(functions, size)
+        base = DMX_Lookup_Tables._keys
+        DMX_Lookup_Tables._keys += size
+        count = DMX_Lookup_Tables._count
+        DMX_Lookup_Tables.reserve(count + len(segments))
+        for position, segment in enumerate(segments, count):
+            start, function_index, wheel_slot, linear = segment
+            DMX_Lookup_Tables.starts[position] = base + start
+            DMX_Lookup_Tables.function_index[position] = function_index
+            DMX_Lookup_Tables.wheel_slot[position] = wheel_slot
+            (
+                DMX_Lookup_Tables.dmx_from[position],
+                DMX_Lookup_Tables.dmx_span[position],
+                DMX_Lookup_Tables.physical_from[position],
+                DMX_Lookup_Tables.physical_span[position],
+            ) = linear
+        DMX_Lookup_Tables._count = count + len(segments)
+        DMX_Lookup_Tables._bases[key] = base
+        return base
+
+    @staticmethod
+    def reserve(count):
+        capacity = len(DMX_Lookup_Tables.starts)
+        if count <= capacity:
+            return
+        capacity = max(count, capacity * 2, 256)
+        for name in (
+            "starts",
+            "function_index",
+            "wheel_slot",
+            "dmx_from",
+            "dmx_span",
+            "physical_from",
+            "physical_span",
+        ):
+            array = getattr(DMX_Lookup_Tables, name)
+            grown = np.zeros(capacity, dtype=array.dtype)
+            grown[: DMX_Lookup_Tables._count] = array[: DMX_Lookup_Tables._count]
+            setattr(DMX_Lookup_Tables, name, grown)
+
+    @staticmethod
+    def linear(dmx_from, dmx_to, physical_from, physical_to):
+        """Parameters of dmx_to_physical as (dmx_from, dmx_span, physical_from, physical_span)"""
+        if dmx_to - dmx_from == 0:
+            return dmx_from, 1, physical_from, 0
+        if ((dmx_from - dmx_to) + physical_from) == 0:
+            return dmx_from, 1, 0.0, 0
+        return dmx_from, dmx_to - dmx_from, physical_from, physical_to - physical_from
+
+    @staticmethod
+    def build(functions, size):
+        """Return the segments of a table as (first DMX value, function index,
+        wheel slot, linear parameters)"""
+        bounds = {0}
+        for ch_f in functions:
+            bounds.update((ch_f.dmx_from, ch_f.dmx_to + 1))
+            for dmx_from, dmx_to, _, _, _ in ch_f.channel_sets:
+                bounds.update((dmx_from, dmx_to + 1))
+        bounds = sorted(bound for bound in bounds if 0 <= bound < size)
+
+        segments = []
+        for start in bounds:
+            # the same value resolves the same way up to the next bound
+            segment = (start, -1, -1, (0, 1, 0.0, 0))
+            # the first function containing the value wins
+            for index, ch_f in enumerate(functions):
+                if not ch_f.dmx_from <= start <= ch_f.dmx_to:
+                    continue
+                wheel_slot = -1
+                linear = DMX_Lookup_Tables.linear(
+                    ch_f.dmx_from, ch_f.dmx_to, ch_f.physical_from, ch_f.physical_to
+                )
+                # the last channel set containing the value wins
+                for (
+                    dmx_from,
+                    dmx_to,
+                    physical_from,
+                    physical_to,
+                    slot,
+                ) in ch_f.channel_sets:
+                    if dmx_from <= start <= dmx_to:
+                        wheel_slot = slot
+                        linear = DMX_Lookup_Tables.linear(
+                            dmx_from, dmx_to, physical_from, physical_to
+                        )
+                segment = (start, index, wheel_slot, linear)
+                break
+            segments.append(segment)
+        return segments
+
+    @staticmethod
+    def lookup(bases, dmx_values):
+        """Resolve DMX values of tables at the bases, returns lists of function
+        indices, physical values and wheel slots"""
+        count = DMX_Lookup_Tables._count
+        segments = (
+            np.searchsorted(
+                DMX_Lookup_Tables.starts[:count], bases + dmx_values, side="right"
+            )
+            - 1
+        )
+        physical = (dmx_values - DMX_Lookup_Tables.dmx_from[segments]) * (
+            DMX_Lookup_Tables.physical_span[segments]
+        ) / DMX_Lookup_Tables.dmx_span[segments] + DMX_Lookup_Tables.physical_from[
+            segments
+        ]
+        return (
+            DMX_Lookup_Tables.function_index[segments].tolist(),
+            physical.tolist(),
+            DMX_Lookup_Tables.wheel_slot[segments].tolist(),
+        )
+
+    @staticmethod
+    def clear():
+        """Drop all tables, decode plans referencing them must be dropped too"""
+        DMX_Lookup_Tables.starts = np.zeros(0, dtype=np.int64)
+        DMX_Lookup_Tables.function_index = np.zeros(0, dtype=np.int16)
+        DMX_Lookup_Tables.wheel_slot = np.zeros(0, dtype=np.int32)
+        DMX_Lookup_Tables.dmx_from = np.zeros(0, dtype=np.float64)
+        DMX_Lookup_Tables.dmx_span = np.ones(0, dtype=np.float64)
+        DMX_Lookup_Tables.physical_from = np.zeros(0, dtype=np.float64)
+        DMX_Lookup_Tables.physical_span = np.zeros(0, dtype=np.float64)
+        DMX_Lookup_Tables._count = 0
+        DMX_Lookup_Tables._keys = 0
+        DMX_Lookup_Tables._bases.clear()
+
+
+class DMX_Decoded_Frame:
+    """Values collected from one DMX frame of a fixture, consumed by DMX_Fixture.render"""
+
+    __slots__ = (
+        "pan_tilt",
+        "cmy",
+        "zoom",
+        "playmode",
+        "recording",
+        "color_wheels",
+        "ctc",
+        "iris",
+        "gobo1",
+        "gobo2",
+        "rgb_mixing_geometries",
+        "xyz_moving_geometries",
+        "xyz_rotating_geometries",
+        "shutter_dimmer_geometries",
+        "pan_rotating_geometries",
+        "tilt_rotating_geometries",
+        "pan_cont_rotating_geometries",
+        "tilt_cont_rotating_geometries",
+    )
+
+    def __init__(self, geometries):
+        self.pan_tilt = [None, None]
+        self.cmy = [None, None, None]
+        self.zoom = None
+        self.playmode = 0
+        self.recording = 0
+        self.color_wheels = [None, None, None, None]  # Color1-3, ColorMacro1
+        self.ctc = None, None
+        self.iris = None
+        # gobo selection (GoboN), gobo indexing GoboNPos, rotation (GoboNPosRotate)
+        self.gobo1 = [None, None, None]
+        self.gobo2 = [None, None, None]
+        # R, G, B, White, WW, CW, Amber, Lime, UV, cyan, magenta, yellow
+        self.rgb_mixing_geometries = {g: [None] * 12 for g in geometries}
+        self.xyz_moving_geometries = {g: [None, None, None] for g in geometries}
+        self.xyz_rotating_geometries = {g: [None, None, None] for g in geometries}
+        # dimmer, shutter, strobe
+        self.shutter_dimmer_geometries = {g: [None, None, None] for g in geometries}
+        self.pan_rotating_geometries = {g: [None] for g in geometries}
+        self.tilt_rotating_geometries = {g: [None] for g in geometries}
+        self.pan_cont_rotating_geometries = {g: [None] for g in geometries}
+        self.tilt_cont_rotating_geometries = {g: [None] for g in geometries}
+
+
+# Handlers, called as handler(frame, geometry, physical_value, wheel_slot, dmx_value)
+
+
+def _rgb(index):
+    def handler(frame, geometry, physical, slot, value):
+        frame.rgb_mixing_geometries[geometry][index] = value
+
+    return handler
+
+
+def _cmy(index):
+    def handler(frame, geometry, physical, slot, value):
+        frame.cmy[index] = value
+
+    return handler
+
+
+def _xyz_move(index):
+    def handler(frame, geometry, physical, slot, value):
+        frame.xyz_moving_geometries[geometry][index] = value
+
+    return handler
+
+
+def _xyz_rotate(index):
+    def handler(frame, geometry, physical, slot, value):
+        frame.xyz_rotating_geometries[geometry][index] = value
+
+    return handler
+
+
+def _color_wheel(index):
+    def handler(frame, geometry, physical, slot, value):
+        frame.color_wheels[index] = slot
+
+    return handler
+
+
+def _gobo(n, index, use_slot=False):
+    def handler(frame, geometry, physical, slot, value):
+        gobo = frame.gobo1 if n == 1 else frame.gobo2
+        gobo[index] = slot if use_slot else physical
+
+    return handler
+
+
+def _dimmer(frame, geometry, physical, slot, value):
+    frame.shutter_dimmer_geometries[geometry][0] = physical
+
+
+def _shutter(frame, geometry, physical, slot, value):
+    # we set the shutter to be open by default
+    frame.shutter_dimmer_geometries[geometry][1] = physical if value > 0 else 1
+
+
+def _strobe(frame, geometry, physical, slot, value):
+    frame.shutter_dimmer_geometries[geometry][2] = physical
+
+
+def _pan(frame, geometry, physical, slot, value):
+    frame.pan_tilt[0] = physical
+    frame.pan_rotating_geometries[geometry][0] = physical
+
+
+def _tilt(frame, geometry, physical, slot, value):
+    frame.pan_tilt[1] = physical
+    frame.tilt_rotating_geometries[geometry][0] = physical
+
+
+def _pan_rotate(frame, geometry, physical, slot, value):
+    frame.pan_cont_rotating_geometries[geometry][0] = physical
+
+
+def _tilt_rotate(frame, geometry, physical, slot, value):
+    frame.tilt_cont_rotating_geometries[geometry][0] = physical
+
+
+def _zoom(frame, geometry, physical, slot, value):
+    frame.zoom = physical
+
+
+def _playmode(frame, geometry, physical, slot, value):
+    frame.playmode = physical
+
+
+def _recording(frame, geometry, physical, slot, value):
+    frame.recording = physical
+
+
+def _color_temperature(frame, geometry, physical, slot, value):
+    frame.ctc = physical, value
+
+
+def _iris(frame, geometry, physical, slot, value):
+    frame.iris = physical
+
+
+# The lookup order mirrors the precedence of the original attribute chain:
+# first the dimmer/shutter functions, then the raw color channels, then the
+# remaining channel functions and finally the raw position/rotation channels.
+
+_PRIORITY_FUNCTION_HANDLERS = {
+    "Dimmer": _dimmer,
+    "Shutter1": _shutter,
+    "Shutter1Strobe": _strobe,
+}
+
+_CHANNEL_HANDLERS = {
+    "ColorAdd_R": _rgb(0),
+    "ColorRGB_Red": _rgb(0),
+    "ColorAdd_G": _rgb(1),
+    "ColorRGB_Green": _rgb(1),
+    "ColorAdd_B": _rgb(2),
+    "ColorRGB_Blue": _rgb(2),
+    "ColorAdd_W": _rgb(3),
+    "ColorAdd_WW": _rgb(4),
+    "ColorAdd_CW": _rgb(5),
+    "ColorAdd_RY": _rgb(6),
+    "ColorAdd_GY": _rgb(7),
+    "ColorAdd_UV": _rgb(8),
+    "ColorAdd_C": _rgb(9),
+    "ColorAdd_M": _rgb(10),
+    "ColorAdd_Y": _rgb(11),
+    "ColorSub_C": _cmy(0),
+    "ColorSub_M": _cmy(1),
+    "ColorSub_Y": _cmy(2),
+}
+
+_FUNCTION_HANDLERS = {
+    "Pan": _pan,
+    "Tilt": _tilt,
+    "PanRotate": _pan_rotate,
+    "TiltRotate": _tilt_rotate,
+    "Zoom": _zoom,
+    "Playmode": _playmode,
+    "Recording": _recording,
+    "Color1": _color_wheel(0),
+    "Color2": _color_wheel(1),
+    "Color3": _color_wheel(2),
+    "ColorMacro1": _color_wheel(3),
+    "CTC": _color_temperature,
+    "CTO": _color_temperature,
+    "CTB": _color_temperature,
+    "Iris": _iris,
+    "Gobo1": _gobo(1, 0, use_slot=True),
+    "Gobo1Pos": _gobo(1, 1),
+    "Gobo1PosRotate": _gobo(1, 2),
+    "Gobo2": _gobo(2, 0, use_slot=True),
+    "Gobo2Pos": _gobo(2, 1),
+    "Gobo2PosRotate": _gobo(2, 2),
+}
+
+_TRAILING_CHANNEL_HANDLERS = {
+    "XYZ_X": _xyz_move(0),
+    "XYZ_Y": _xyz_move(1),
+    "XYZ_Z": _xyz_move(2),
+    "Rot_X": _xyz_rotate(0),
+    "Rot_Y": _xyz_rotate(1),
+    "Rot_Z": _xyz_rotate(2),
+}
+
+# Virtual channels only support a subset of the attributes
+_VIRTUAL_CHANNEL_HANDLERS = {
+    attribute: _CHANNEL_HANDLERS[attribute]
+    for attribute in (
+        "ColorAdd_R",
+        "ColorRGB_Red",
+        "ColorAdd_G",
+        "ColorRGB_Green",
+        "ColorAdd_B",
+        "ColorRGB_Blue",
+        "ColorSub_C",
+        "ColorSub_M",
+        "ColorSub_Y",
+    )
+}
+
+_VIRTUAL_FUNCTION_HANDLERS = {
+    attribute: _FUNCTION_HANDLERS[attribute]
+    for attribute in (
+        "Pan",
+        "Tilt",
+        "PanRotate",
+        "TiltRotate",
+        "Zoom",
+        "Playmode",
+        "Recording",
+        "CTC",
+        "CTO",
+        "CTB",
+    )
+}
+
+
+class DMX_Function_Plan:
+    __slots__ = (
+        "attribute",
+        "dmx_from",
+        "dmx_to",
+        "physical_from",
+        "physical_to",
+        "mode_master",
+        "mode_from",
+        "mode_to",
+        "mm_dmx_break",
+        "mm_offsets",
+        "channel_sets",
+    )
+
+    def __init__(self, ch_function):
+        self.attribute = ch_function.attribute
+        self.dmx_from = ch_function.dmx_from
+        self.dmx_to = ch_function.dmx_to
+        self.physical_from = ch_function.physical_from
+        self.physical_to = ch_function.physical_to
+        self.mode_master = ch_function.mode_master
+        self.mode_from = ch_function.mode_from
+        self.mode_to = ch_function.mode_to
+        self.mm_dmx_break = ch_function.mm_dmx_break
+        self.mm_offsets = tuple(
+            ch_function.mm_offsets[: max(1, ch_function.mm_offsets_bytes)]
+        )
+        self.channel_sets = tuple(
+            (
+                ch_set.dmx_from,
+                ch_set.dmx_to,
+                ch_set.physical_from,
+                ch_set.physical_to,
+                ch_set.wheel_slot,
+            )
+            for ch_set in ch_function.channel_sets
+        )
+
+    def key(self):
+        return (
+            self.attribute,
+            self.dmx_from,
+            self.dmx_to,
+            self.physical_from,
+            self.physical_to,
+            self.channel_sets,
+        )
+
+    def resolve(self, dmx_value):
+        physical_value = dmx_to_physical(
+            self.dmx_from,
+            self.dmx_to,
+            self.physical_from,
+            self.physical_to,
+            dmx_value,
+        )
+        wheel_slot = None
+        for dmx_from, dmx_to, physical_from, physical_to, slot in self.channel_sets:
+            if dmx_from <= dmx_value <= dmx_to:
+                wheel_slot = slot
+                physical_value = dmx_to_physical(
+                    dmx_from, dmx_to, physical_from, physical_to, dmx_value
+                )
+        return self.attribute, physical_value, wheel_slot
+
+    def mode_master_value(self, dmx_data):
+        break_data = dmx_data.get(self.mm_dmx_break)
+        if break_data is None:
+            return None
+        coarse = _byte(break_data, self.mm_offsets[0])
+        if coarse is None:
+            return None
+        if len(self.mm_offsets) == 1:
+            return coarse
+        offsets_full = [offset for offset in self.mm_offsets if offset > 0]
+        if not offsets_full:
+            # Fallback for classic 16-bit (coarse+fine).
+            return (coarse << 8) | (_byte(break_data, self.mm_offsets[1]) or 0)
+        # Build the full multi-byte DMX value, then scale down
+        # to 16-bit so it matches the stored mode range scale.
+        raw_value = 0
+        for offset in offsets_full:
+            raw_value = (raw_value << 8) | (_byte(break_data, offset) or 0)
+        source_bits = len(offsets_full) * 8
+        if source_bits > 16:
+            return normalize_dmx_value(raw_value, source_bits, 16)
+        return raw_value
+
+
+def _byte(break_data, offset):
+    """1-based access into the data of a DMX break, None when out of range"""
+    if 0 < offset <= len(break_data):
+        return break_data[offset - 1]
+    return None
+
+
+class DMX_Channel_Plan:
+    __slots__ = (
+        "attribute",
+        "name",
+        "geometry",
+        "dmx_break",
+        "offsets",
+        "shifted",
+        "universe",
+        "address",
+        "functions",
+        "has_mode_master",
+        "channel_handler",
+        "trailing_handler",
+        "table_base",
+        "table_size",
+    )
+
+    def __init__(self, channel, dmx_break=None, is_virtual=False):
+        self.attribute = channel.attribute
+        self.name = channel.name_
+        self.geometry = str(channel.geometry)
+        self.dmx_break = channel.dmx_break
+        self.offsets = ()
+        if channel.offsets_bytes > 0 and channel.offsets[0] > 0:
+            self.offsets = tuple(
+                offset
+                for offset in channel.offsets[: channel.offsets_bytes]
+                if offset > 0
+            )
+        # multi-byte channel with only the coarse offset known
+        self.shifted = channel.offsets_bytes > 1 and len(self.offsets) == 1
+        self.universe = None
+        self.address = None
+        if dmx_break is not None and self.offsets:
+            # absolute position of the coarse byte in the universe
+            self.universe = dmx_break.universe
+            self.address = dmx_break.address + self.offsets[0] - 1
+        self.functions = tuple(
+            DMX_Function_Plan(ch_f) for ch_f in channel.channel_functions
+        )
+        self.has_mode_master = not is_virtual and any(
+            ch_f.mode_master != "" for ch_f in self.functions
+        )
+        if is_virtual:
+            self.channel_handler = _VIRTUAL_CHANNEL_HANDLERS.get(self.attribute)
+        else:
+            self.channel_handler = _CHANNEL_HANDLERS.get(self.attribute)
+        self.trailing_handler = _TRAILING_CHANNEL_HANDLERS.get(self.attribute)
+
+        # Channels without mode master dependencies are resolved by a lookup
+        # table, 8 bit channels (and virtual channels) have 256 values,
+        # multi-byte channels are resolved as 16 bit values.
+        self.table_base = None
+        self.table_size = 256
+        if len(self.offsets) > 1 or self.shifted:
+            self.table_size = 65536
+        if not self.has_mode_master and self.functions:
+            self.table_base = DMX_Lookup_Tables.register(
+                self.functions, self.table_size
+            )
+
+    def read(self, break_data):
+        """Return coarse and final (up to 16-bit) value of the channel"""
+        coarse = break_data[self.offsets[0] - 1]
+        if self.shifted:
+            return coarse, coarse << 8
+        if len(self.offsets) == 1:
+            return coarse, coarse
+        raw_value = 0
+        for offset in self.offsets:
+            raw_value = (raw_value << 8) | (_byte(break_data, offset) or 0)
+        source_bits = len(self.offsets) * 8
+        if source_bits > 16:
+            return coarse, normalize_dmx_value(raw_value, source_bits, 16)
+        return coarse, raw_value
+
+    def from_table(self, function_index, physical_value, wheel_slot):
+        if function_index < 0:
+            return None, None, None
+        return (
+            self.functions[function_index].attribute,
+            physical_value,
+            None if wheel_slot < 0 else wheel_slot,
+        )
+
+    def get_function_attribute_data(self, dmx_value, dmx_data, skip_mode_master=False):
+        if self.table_base is not None and 0 <= dmx_value < self.table_size:
+            function_indices, physical_values, wheel_slots = DMX_Lookup_Tables.lookup(
+                np.array([self.table_base], dtype=np.int64),
+                np.array([dmx_value], dtype=np.float64),
+            )
+            return self.from_table(
+                function_indices[0], physical_values[0], wheel_slots[0]
+            )
+
+        for ch_f in self.functions:
+            # get a function which contains dmx from/to encapsulating our current dmx value
+            if not ch_f.dmx_from <= dmx_value <= ch_f.dmx_to:
+                continue
+            if ch_f.mode_master != "" and not skip_mode_master:
+                mm_dmx_value = ch_f.mode_master_value(dmx_data)
+                if mm_dmx_value is None:
+                    continue
+                if not ch_f.mode_from <= mm_dmx_value <= ch_f.mode_to:
+                    # try another channel function or exit
+                    continue
+            return ch_f.resolve(dmx_value)
+        return None, None, None
+
+
+class DMX_Decode_Plan:
+    """Per-fixture decode plan, stored outside of RNA and keyed by fixture name"""
+
+    _plans = {}
+    # address index, {universe: ((first, last, fixture_name), ...)}, rebuilt after invalidation
+    _footprints = None
+
+    __slots__ = (
+        "fixture_name",
+        "breaks",
+        "channels",
+        "virtual_channels",
+        "geometries",
+        "table_channels",
+        "table_bases",
+        "last_values",
+        "writes",
+    )
+
+    def __init__(self, fixture):
+        self.fixture_name = fixture.name
+        # (dmx_break, universe, address, channels_count)
+        self.breaks = tuple(
+            (
+                dmx_break.dmx_break,
+                dmx_break.universe,
+                dmx_break.address,
+                dmx_break.channels_count,
+            )
+            for dmx_break in fixture.dmx_breaks
+        )
+        breaks_by_id = {
+            dmx_break.dmx_break: dmx_break for dmx_break in fixture.dmx_breaks
+        }
+        channels_count = {item[0]: item[3] for item in self.breaks}
+
+        geometries = {}
+        for vchannel in fixture.virtual_channels:
+            geometries[str(vchannel.geometry)] = None
+        self.virtual_channels = tuple(
+            DMX_Channel_Plan(vchannel, is_virtual=True)
+            for vchannel in fixture.virtual_channels
+        )
+
+        channels = []
+        for channel in fixture.channels:
+            if channel.dmx_break not in breaks_by_id:
+                continue  # this happens before the fixture is fully patched
+            geometries[channel.geometry] = None
+            channel_plan = DMX_Channel_Plan(
+                channel, dmx_break=breaks_by_id[channel.dmx_break]
+            )
+            if not channel_plan.offsets:
+                # if channel has no address, we cannot continue
+                DMX_Log.log.error(
+                    (
+                        "No offsets in channel, skipping",
+                        channel.attribute,
+                        channel.offsets_bytes,
+                    )
+                )
+                continue
+            if channel_plan.offsets[0] > channels_count[channel.dmx_break]:
+                DMX_Log.log.error(
+                    (
+                        "Address offset not in dmx data, skipping. You may have to re-insert or re-edit the GDTF fixture into the scene",
+                        channel.attribute,
+                        channel.dmx_break,
+                        channel_plan.offsets[0],
+                    )
+                )
+                continue
+            channels.append(channel_plan)
+        self.channels = tuple(channels)
+        self.geometries = tuple(geometries)
+        # indices of channels resolved in batch by the lookup tables
+        self.table_channels = tuple(
+            index
+            for index, channel in enumerate(self.channels)
+            if channel.table_base is not None
+        )
+        self.table_bases = np.array(
+            [self.channels[index].table_base for index in self.table_channels],
+            dtype=np.int64,
+        )
+        self.last_values = None
+        self.writes = {}  # attribute: write targets, filled by write_targets
+
+    def write_targets(self, attribute):
+        """Where the programmer writes an attribute, as
+        (((geometry, universe, address, fine address or None), ...), (virtual channel geometries))"""
+        targets = self.writes.get(attribute)
+        if targets is None:
+            targets = (
+                tuple(
+                    (
+                        channel.geometry,
+                        channel.universe,
+                        channel.address,
+                        channel.address + channel.offsets[1] - channel.offsets[0]
+                        if len(channel.offsets) > 1
+                        else None,
+                    )
+                    for channel in self.channels
+                    if channel.attribute == attribute
+                    or any(ch_f.attribute == attribute for ch_f in channel.functions)
+                ),
+                tuple(
+                    vchannel.geometry
+                    for vchannel in self.virtual_channels
+                    if vchannel.attribute == attribute
+                ),
+            )
+            self.writes[attribute] = targets
+        return targets
+
+    @staticmethod
+    def get(fixture):
+        plan = DMX_Decode_Plan._plans.get(fixture.name)
+        if plan is None:
+            plan = DMX_Decode_Plan(fixture)
+            DMX_Decode_Plan._plans[fixture.name] = plan
+            DMX_Log.log.debug(f"Compiled decode plan for {fixture.name}")
+        return plan
+
+    @staticmethod
+    def invalidate(fixture_name=None):
+        """Drop the plan of a fixture, or all plans if no name is given"""
+        if fixture_name is None:
+            DMX_Decode_Plan._plans.clear()
+        else:
+            DMX_Decode_Plan._plans.pop(fixture_name, None)
+        DMX_Decode_Plan._footprints = None
+
+    @staticmethod
+    def build_footprints(fixtures):
+        footprints = {}
+        for fixture in fixtures:
+            for dmx_break in fixture.dmx_breaks:
+                if dmx_break.channels_count < 1:
+                    continue
+                footprints.setdefault(dmx_break.universe, []).append(
+                    (
+                        dmx_break.address,
+                        dmx_break.address + dmx_break.channels_count - 1,
+                        fixture.name,
+                    )
+                )
+        DMX_Decode_Plan._footprints = {
+            universe: tuple(sorted(items)) for universe, items in footprints.items()
+        }
+        DMX_Log.log.debug(f"Built address index for {len(fixtures)} fixtures")
+
+    @staticmethod
+    def dirty_fixtures(fixtures, dirty, dirty_virtuals):
+        """Names of fixtures with a patch overlapping the dirty address ranges or
+        with changed virtual channels. Returns None if the address index had to
+        be rebuilt, as the patch changed and all fixtures should be rendered."""
+        if DMX_Decode_Plan._footprints is None:
+            DMX_Decode_Plan.build_footprints(fixtures)
+            return None
+        names = set(dirty_virtuals)
+        for universe, (first, last) in dirty.items():
+            for start, end, fixture_name in DMX_Decode_Plan._footprints.get(
+                universe, ()
+            ):
+                if start > last:
+                    break  # footprints are sorted by the start address
+                if end >= first:
+                    names.add(fixture_name)
+        return names
+
+    def read(self):
+        """Read DMX and virtual data of the fixture. Returns (dmx_data, data_virtual, values),
+        values is a flat list used to detect changes between frames."""
+        dmx_data = {}
+        values = []
+        for dmx_break, universe, address, channels_count in self.breaks:
+            new_data = DMX_Data.get(universe, address, channels_count)
+            dmx_data[dmx_break] = new_data
+            values += new_data
+        data_virtual = DMX_Data.get_virtual(self.fixture_name)
+        for item in data_virtual.values():
+            values.append(int(item["value"]))
+        return dmx_data, data_virtual, values
+
+    def resolve(self, values, dmx_data):
+        """Resolve channel functions of all channels for their final DMX values.
+        Table based channels are resolved with a single gather."""
+        results = [None] * len(self.channels)
+        if self.table_channels:
+            dmx_values = np.fromiter(
+                (values[index] for index in self.table_channels),
+                dtype=np.float64,
+                count=len(self.table_channels),
+            )
+            function_indices, physical_values, wheel_slots = DMX_Lookup_Tables.lookup(
+                self.table_bases, dmx_values
+            )
+            for position, index in enumerate(self.table_channels):
+                results[index] = self.channels[index].from_table(
+                    function_indices[position],
+                    physical_values[position],
+                    wheel_slots[position],
+                )
+        for index, channel in enumerate(self.channels):
+            if results[index] is None:
+                results[index] = channel.get_function_attribute_data(
+                    values[index], dmx_data
+                )
+        return results
+
+    def decode(self, dmx_data, data_virtual, use_fixture_functions, default_function):
+        """Decode DMX data into a DMX_Decoded_Frame.
+        default_function(attribute) returns a default channel function (with
+        dmx_to_physical) used when the fixture channel functions are disabled."""
+
+        frame = DMX_Decoded_Frame(self.geometries)
+
+        for vchannel in self.virtual_channels:
+            if vchannel.attribute not in data_virtual:
+                continue
+            dmx_value = data_virtual[vchannel.attribute]["value"]
+            attribute, physical_value, wheel_slot = (
+                vchannel.get_function_attribute_data(
+                    dmx_value, None, skip_mode_master=True
+                )
+            )
+            if not use_fixture_functions:
+                channel_function = default_function(attribute)
+                if channel_function:
+                    attribute = channel_function.attribute
+                    physical_value = channel_function.dmx_to_physical(dmx_value)
+
+            handler = (
+                _PRIORITY_FUNCTION_HANDLERS.get(attribute)
+                or vchannel.channel_handler
+                or _VIRTUAL_FUNCTION_HANDLERS.get(attribute)
+                or vchannel.trailing_handler
+            )
+            if handler is not None:
+                handler(frame, vchannel.geometry, physical_value, wheel_slot, dmx_value)
+
+        coarse_values = []
+        final_values = []
+        for channel in self.channels:
+            dmx_value_coarse, dmx_value_final = channel.read(
+                dmx_data[channel.dmx_break]
+            )
+            coarse_values.append(dmx_value_coarse)
+            final_values.append(dmx_value_final)
+
+        resolved = None
+        if use_fixture_functions:
+            resolved = self.resolve(final_values, dmx_data)
+
+        for index, channel in enumerate(self.channels):
+            dmx_value_coarse = coarse_values[index]
+
+            # Default to the channel's own attribute when fixture functions are disabled.
+            attribute = channel.attribute
+            physical_value = None
+            wheel_slot = None
+
+            if use_fixture_functions:
+                attribute, physical_value, wheel_slot = resolved[index]
+            else:
+                channel_function = default_function(attribute)
+                if channel_function:
+                    attribute = channel_function.attribute
+                    physical_value = channel_function.dmx_to_physical(dmx_value_coarse)
+
+            handler = (
+                _PRIORITY_FUNCTION_HANDLERS.get(attribute)
+                or channel.channel_handler
+                or _FUNCTION_HANDLERS.get(attribute)
+                or channel.trailing_handler
+            )
+            if handler is not None:
+                handler(
+                    frame,
+                    channel.geometry,
+                    physical_value,
+                    wheel_slot,
+                    dmx_value_coarse,
+                )
+
+        return frame
@@ -53,13 +53,25 @@ from .psn import DMX_PSN
 from .artnet import DMX_ArtNet
 from .blender_utils import copy_blender_profiles, get_application_version
 from .data import DMX_Data, DMX_Value
+from .decode_plan import DMX_Decode_Plan
+from .fixture_index import DMX_Fixture_Index
+from .ingest import DMX_Ingest
+from .scheduler import DMX_Render_Scheduler
+from .selection import DMX_Selection
+from .profiler import DMX_Profiler
 from .gdtf_file import DMX_GDTF_File
 from .group import DMX_Group
 from .i18n import DMX_Lang
 from .logging_setup import DMX_Log
 from .material import get_gobo_material, set_light_nodes
 from .mdns import DMX_Zeroconf
-from .mvr import load_mvr, load_mvr_steps, export_mvr as mvr_export_mvr
+from .mvr import (
+    load_mvr,
+    load_mvr_steps,
+    export_mvr as mvr_export_mvr,
+    export_mvr_steps as mvr_export_mvr_steps,
+)
+from .mvr_delta import DMX_MVR_Delta
 from .mvr_objects import DMX_MVR_Class, DMX_MVR_Layer, DMX_MVR_Object
 from .mvrx_protocol import DMX_MVR_X_Client, DMX_MVR_X_Server, DMX_MVR_X_WS_Client
 from .mvrxchange.mvr_xchange_blender import (
@@ -162,6 +174,9 @@ class DMX(PropertyGroup):
         setup.DMX_PT_Setup_Viewport,
         setup.DMX_PT_Setup_Logging,
         setup.DMX_OT_Setup_Open_LogFile,
+        setup.DMX_PT_Setup_Profiler,
+        setup.DMX_OT_Profiler_Export,
+        setup.DMX_OT_Profiler_Reset,
         setup.DMX_PT_Setup_Import,
         setup.DMX_PT_Setup_Export,
         setup.DMX_PT_Setup_Extras,
@@ -663,6 +678,7 @@ class DMX(PropertyGroup):
 
         DMX_Log.enable(self.logging_level)
         DMX_Log.log.info("BlenderDMX: Linking to file")
+        DMX_Fixture_Index.invalidate()
 
         # Link pointer properties to file objects
         if "DMX" in bpy.data.collections:
@@ -690,6 +706,7 @@ class DMX(PropertyGroup):
 
         # Allocate universes data
         DMX_Data.setup(self.universes_n)
+        DMX_Ingest.update_inputs(self.universes)
 
         # make sure that selection of ip address points to an item in enum
         dmx = bpy.context.scene.dmx
@@ -728,6 +745,7 @@ class DMX(PropertyGroup):
             self.migrations()
         except Exception as e:
             traceback.print_exception(e)
+        DMX_Fixture_Index.invalidate()  # migrations may have changed UUIDs
         self.ensure_application_uuid()
         # enable in extension
         self.ensure_directories_exist()
@@ -1449,6 +1467,7 @@ class DMX(PropertyGroup):
             DMX_Log.log.info("disabled all")
 
     def onMVR_xchange_enable(self, context):
+        DMX_MVR_Delta.forget_shared()  # a new session starts with a full commit
         if self.mvrx_enabled:
             DMX_MVR_X_Server.enable()  # start the MVR-xchange TCP server for incoming connections
             DMX_MVR_X_Server._instance.server.get_port()
@@ -1479,6 +1498,7 @@ class DMX(PropertyGroup):
         shared_commits.clear()
         ws_commits = bpy.context.window_manager.dmx.mvr_xchange.websocket_commits
         ws_commits.clear()
+        DMX_MVR_Delta.forget_shared()
         if self.mvrx_socket_client_enabled:
             DMX_Log.log.info("joining server")
             url = self.mvr_x_ws_url
@@ -1536,6 +1556,28 @@ class DMX(PropertyGroup):
         update = onsACNEnable
     )
 
+    render_rate : EnumProperty(
+        name = _("Render Rate"),
+        description=_("Target rate of updating fixtures from DMX input, in Hz. Updates exceeding the time of a frame are spread over following frames"),
+        default = "24",
+        items = (
+            ("24", "24 Hz", ""),
+            ("30", "30 Hz", ""),
+            ("44", "44 Hz", ""),
+            ("60", "60 Hz", ""),
+        )
+    )
+
+    sacn_merge_mode : EnumProperty(
+        name = _("Merge Mode"),
+        description=_("How data of multiple sACN sources with the same priority are merged"),
+        default = "HTP",
+        items = (
+            ("HTP", _("HTP"), _("Highest value of all sources wins")),
+            ("LTP", _("LTP"), _("Source with the latest change wins")),
+        )
+    )
+
     osc_enabled : BoolProperty(
         name = _("Enable OSC Output"),
         description=_("Enables Open Sound Control protocol to send fixture selection to a console"),
@@ -1613,6 +1655,7 @@ class DMX(PropertyGroup):
         )
     # fmt: on
 
+    @DMX_Selection.batched
     def onProgrammerApplyManually(self, context):
         self.onProgrammerPan(context)
         self.onProgrammerTilt(context)
@@ -1629,21 +1672,12 @@ class DMX(PropertyGroup):
         self.onProgrammerShutter(context)
         self.onProgrammerZoom(context)
         self.onProgrammerPlaymode(context)
-        self.onProgrammerRecorging(context)
+        self.onProgrammerRecording(context)
 
     # # Programmer > Dimmer
 
     def onProgrammerDimmer(self, context):
-        for fixture_ in self.fixtures:
-            if not hasattr(fixture_, "collection"):
-                continue
-            if not hasattr(fixture_.collection, "objects"):
-                continue
-            if fixture_.collection is None:
-                continue
-            if fixture_.is_selected():
-                fixture_.setDMX({"Dimmer": int(255 * self.programmer_dimmer)})
-        self.render()
+        self.setSelectedDMX({"Dimmer": int(255 * self.programmer_dimmer)})
 
     # fmt: off
     programmer_dimmer: FloatProperty(
@@ -1657,242 +1691,136 @@ class DMX(PropertyGroup):
     # # Programmer > Color
 
     def onProgrammerColor(self, context):
-        for fixture_ in self.fixtures:
-            if fixture_.collection is None:
-                continue
-            if fixture_.is_selected():
-                rgb = [int(255 * x) for x in self.programmer_color]
-                cmy = rgb_to_cmy(rgb)
-                automatic_white = calculate_automatic_white(rgb[:3])
-
-                fixture_.setDMX(
-                    {
-                        "ColorAdd_R": rgb[0],
-                        "ColorAdd_G": rgb[1],
-                        "ColorAdd_B": rgb[2],
-                        "ColorRGB_Red": rgb[0],
-                        "ColorRGB_Green": rgb[1],
-                        "ColorRGB_Blue": rgb[2],
-                        "ColorSub_C": cmy[0],
-                        "ColorSub_M": cmy[1],
-                        "ColorSub_Y": cmy[2],
-                        "ColorAdd_W": automatic_white,
-                    }
-                )
-        self.render()
+        rgb = [int(255 * x) for x in self.programmer_color]
+        cmy = rgb_to_cmy(rgb)
+        automatic_white = calculate_automatic_white(rgb[:3])
+
+        self.setSelectedDMX(
+            {
+                "ColorAdd_R": rgb[0],
+                "ColorAdd_G": rgb[1],
+                "ColorAdd_B": rgb[2],
+                "ColorRGB_Red": rgb[0],
+                "ColorRGB_Green": rgb[1],
+                "ColorRGB_Blue": rgb[2],
+                "ColorSub_C": cmy[0],
+                "ColorSub_M": cmy[1],
+                "ColorSub_Y": cmy[2],
+                "ColorAdd_W": automatic_white,
+            }
+        )
 
     def onProgrammerTilt(self, context):
-        for fixture_ in self.fixtures:
-            if fixture_.collection is None:
-                continue
-            if fixture_.is_selected():
-                fixture_.setDMX({"Tilt": one_float_to_u16(self.programmer_tilt)})
-        self.render()
+        self.setSelectedDMX({"Tilt": one_float_to_u16(self.programmer_tilt)})
 
     def onProgrammerTiltRotate(self, context):
-        for fixture_ in self.fixtures:
-            if fixture_.collection is None:
-                continue
-            if fixture_.is_selected():
-                fixture_.setDMX({"TiltRotate": int(self.programmer_tilt_rotate)})
-        self.render()
+        self.setSelectedDMX({"TiltRotate": int(self.programmer_tilt_rotate)})
 
     def onProgrammerPan(self, context):
-        for fixture_ in self.fixtures:
-            if fixture_.collection is None:
-                continue
-            if fixture_.is_selected():
-                fixture_.setDMX({"Pan": one_float_to_u16(self.programmer_pan)})
-        self.render()
+        self.setSelectedDMX({"Pan": one_float_to_u16(self.programmer_pan)})
 
     def onProgrammerPanRotate(self, context):
-        for fixture_ in self.fixtures:
-            if fixture_.collection is None:
-                continue
-            if fixture_.is_selected():
-                fixture_.setDMX({"PanRotate": int(self.programmer_pan_rotate)})
-        self.render()
+        self.setSelectedDMX({"PanRotate": int(self.programmer_pan_rotate)})
 
     def onProgrammerZoom(self, context):
-        for fixture_ in self.fixtures:
-            if fixture_.collection is None:
-                continue
-            if fixture_.is_selected():
-                fixture_.setDMX({"Zoom": int(self.programmer_zoom)})
-        self.render()
+        self.setSelectedDMX({"Zoom": int(self.programmer_zoom)})
 
     def onProgrammerPlaymode(self, context):
-        for fixture_ in self.fixtures:
-            if fixture_.collection is None:
-                continue
-            if fixture_.is_selected():
-                fixture_.setDMX({"Playmode": int(self.programmer_playmode)})
-        self.render()
+        self.setSelectedDMX({"Playmode": int(self.programmer_playmode)})
 
     def onProgrammerRecording(self, context):
-        for fixture_ in self.fixtures:
-            if fixture_.collection is None:
-                continue
-            if fixture_.is_selected():
-                fixture_.setDMX({"Recording": int(self.programmer_recording)})
-        self.render()
+        self.setSelectedDMX({"Recording": int(self.programmer_recording)})
 
     def onProgrammerColorTemperature(self, context):
-        for fixture_ in self.fixtures:
-            if fixture_.collection is None:
-                continue
-            if fixture_.is_selected():
-                fixture_.setDMX(
-                    {
-                        "CTO": int(self.programmer_color_temperature),
-                        "CTC": int(self.programmer_color_temperature),
-                        "CTB": int(self.programmer_color_temperature),
-                    }
-                )
-        self.render()
+        self.setSelectedDMX(
+            {
+                "CTO": int(self.programmer_color_temperature),
+                "CTC": int(self.programmer_color_temperature),
+                "CTB": int(self.programmer_color_temperature),
+            }
+        )
 
     def onProgrammerIris(self, context):
-        for fixture_ in self.fixtures:
-            if fixture_.collection is None:
-                continue
-            if fixture_.is_selected():
-                fixture_.setDMX(
-                    {
-                        "Iris": int(self.programmer_iris),
-                    }
-                )
-        self.render()
+        self.setSelectedDMX(
+            {
+                "Iris": int(self.programmer_iris),
+            }
+        )
 
     def onProgrammerColorWheel1(self, context):
-        for fixture_ in self.fixtures:
-            if fixture_.collection is None:
-                continue
-            if fixture_.is_selected():
-                fixture_.setDMX(
-                    {
-                        "Color1": int(self.programmer_color_wheel1),
-                    }
-                )
-        self.render()
+        self.setSelectedDMX(
+            {
+                "Color1": int(self.programmer_color_wheel1),
+            }
+        )
 
     def onProgrammerColorWheel2(self, context):
-        for fixture_ in self.fixtures:
-            if fixture_.collection is None:
-                continue
-            if fixture_.is_selected():
-                fixture_.setDMX(
-                    {
-                        "Color2": int(self.programmer_color_wheel2),
-                    }
-                )
-        self.render()
+        self.setSelectedDMX(
+            {
+                "Color2": int(self.programmer_color_wheel2),
+            }
+        )
 
     def onProgrammerColorWheel3(self, context):
-        for fixture_ in self.fixtures:
-            if fixture_.collection is None:
-                continue
-            if fixture_.is_selected():
-                fixture_.setDMX(
-                    {
-                        "Color3": int(self.programmer_color_wheel3),
-                    }
-                )
-        self.render()
+        self.setSelectedDMX(
+            {
+                "Color3": int(self.programmer_color_wheel3),
+            }
+        )
 
     def onProgrammerColorWheel4(self, context):
-        for fixture_ in self.fixtures:
-            if fixture_.collection is None:
-                continue
-            if fixture_.is_selected():
-                fixture_.setDMX(
-                    {
-                        "ColorMacro1": int(self.programmer_color_wheel4),
-                    }
-                )
-        self.render()
+        self.setSelectedDMX(
+            {
+                "ColorMacro1": int(self.programmer_color_wheel4),
+            }
+        )
 
     def onProgrammerGobo1(self, context):
-        for fixture_ in self.fixtures:
-            if fixture_.collection is None:
-                continue
-            if fixture_.is_selected():
-                fixture_.setDMX(
-                    {
-                        "Gobo1": int(self.programmer_gobo1),
-                    }
-                )
-        self.render()
+        self.setSelectedDMX(
+            {
+                "Gobo1": int(self.programmer_gobo1),
+            }
+        )
 
     def onProgrammerGoboIndex1(self, context):
-        for fixture_ in self.fixtures:
-            if fixture_.collection is None:
-                continue
-            if fixture_.is_selected():
-                fixture_.setDMX(
-                    {
-                        "Gobo1Pos": int(self.programmer_gobo_index1),
-                        "Gobo1PosRotate": int(self.programmer_gobo_index1),
-                    }
-                )
-        self.render()
+        self.setSelectedDMX(
+            {
+                "Gobo1Pos": int(self.programmer_gobo_index1),
+                "Gobo1PosRotate": int(self.programmer_gobo_index1),
+            }
+        )
 
     def onProgrammerGobo2(self, context):
-        for fixture_ in self.fixtures:
-            if fixture_.collection is None:
-                continue
-            if fixture_.is_selected():
-                fixture_.setDMX(
-                    {
-                        "Gobo2": int(self.programmer_gobo2),
-                    }
-                )
-        self.render()
+        self.setSelectedDMX(
+            {
+                "Gobo2": int(self.programmer_gobo2),
+            }
+        )
 
     def onProgrammerGoboIndex2(self, context):
-        for fixture_ in self.fixtures:
-            if fixture_.collection is None:
-                continue
-            if fixture_.is_selected():
-                fixture_.setDMX(
-                    {
-                        "Gobo2Pos": int(self.programmer_gobo_index2),
-                        "Gobo2PosRotate": int(self.programmer_gobo_index2),
-                    }
-                )
-        self.render()
+        self.setSelectedDMX(
+            {
+                "Gobo2Pos": int(self.programmer_gobo_index2),
+                "Gobo2PosRotate": int(self.programmer_gobo_index2),
+            }
+        )
 
     def onProgrammerShutter(self, context):
-        for fixture_ in self.fixtures:
-            if fixture_.collection is None:
-                continue
-            if fixture_.is_selected():
-                fixture_.setDMX({"Shutter1": int(self.programmer_shutter)})
-                fixture_.setDMX({"Shutter1Strobe": int(self.programmer_shutter)})
-        self.render()
+        self.setSelectedDMX(
+            {
+                "Shutter1": int(self.programmer_shutter),
+                "Shutter1Strobe": int(self.programmer_shutter),
+            }
+        )
 
     def onProgrammerPanMode(self, context):
-        for fixture_ in self.fixtures:
-            if fixture_.collection is None:
-                continue
-            if fixture_.is_selected():
-                fixture_.setDMX({"PanMode": int(self.programmer_pan_mode)})
-        self.render()
+        self.setSelectedDMX({"PanMode": int(self.programmer_pan_mode)})
 
     def onProgrammerTiltMode(self, context):
-        for fixture_ in self.fixtures:
-            if fixture_.collection is None:
-                continue
-            if fixture_.is_selected():
-                fixture_.setDMX({"TiltMode": int(self.programmer_tilt_mode)})
-        self.render()
+        self.setSelectedDMX({"TiltMode": int(self.programmer_tilt_mode)})
 
     def onProgrammerPanTiltMode(self, context):
-        for fixture_ in self.fixtures:
-            if fixture_.collection is None:
-                continue
-            if fixture_.is_selected():
-                fixture_.setDMX({"PanTiltMode": int(self.programmer_pan_tilt_mode)})
-        self.render()
+        self.setSelectedDMX({"PanTiltMode": int(self.programmer_pan_tilt_mode)})
 
     # fmt: off
 
@@ -2255,6 +2183,8 @@ class DMX(PropertyGroup):
             bpy.data.collections.remove(fixture.collection)
         except Exception as e:
             DMX_Log.log.error(f"Error while removing fixture {e}")
+        DMX_Decode_Plan.invalidate(fixture.name)
+        DMX_Fixture_Index.remove(fixture.name)
         self.fixtures.remove(self.fixtures.find(fixture.name))
 
     def getFixture(self, collection):
@@ -2263,27 +2193,49 @@ class DMX(PropertyGroup):
                 return fixture_
 
     def findFixture(self, object):
-        for fixture_ in self.fixtures:
-            if fixture_ is None:
-                continue
-            if object.name in fixture_.collection.objects:
-                return fixture_
-        return None
+        return DMX_Fixture_Index.by_object(self.fixtures, object)
 
     def findFixtureByUUID(self, uuid):
-        for fixture_ in self.fixtures:
-            if fixture_ is None:
-                continue
-            if fixture_.uuid == uuid:
-                return fixture_
-        return None
+        return DMX_Fixture_Index.by_uuid(self.fixtures, uuid)
+
+    def findFixturesByAddress(self, universe, address):
+        """Fixtures patched on the given DMX address"""
+        names = DMX_Fixture_Index.by_address(self.fixtures, universe, address)
+        return [self.fixtures[name] for name in names if name in self.fixtures]
 
+    @DMX_Selection.batched
     def selectedFixtures(self):
-        selected = []
-        for fixture_ in self.fixtures:
-            if fixture_.is_selected():
-                selected.append(fixture_)
-        return selected
+        return [
+            fixture_
+            for fixture_ in DMX_Selection.fixtures(self)
+            if fixture_.is_selected()
+        ]
+
+    def setSelectedDMX(self, pvalues):
+        """Programmer: write the attribute values of all selected fixtures in one
+        pass and render only these fixtures"""
+        fixtures = [
+            fixture_
+            for fixture_ in self.selectedFixtures()
+            if fixture_.collection is not None
+        ]
+        if not fixtures:
+            return
+        subfixtures = {
+            geometry.name
+            for geometry in bpy.context.window_manager.dmx.active_subfixtures
+        }
+        writes = []
+        for fixture_ in fixtures:
+            fixture_.collectDMX(pvalues, writes, subfixtures)
+        DMX_Data.set_many(writes)
+
+        if bpy.context.scene.tool_settings.use_keyframe_insert_auto:
+            current_frame = bpy.data.scenes[0].frame_current
+        else:
+            current_frame = None
+        for fixture_ in fixtures:
+            fixture_.render(current_frame=current_frame)
 
     def sortedFixtures(self):
         def string_to_pairs(s, pairs=re.compile(r"(\D*)(\d*)").findall):
@@ -2445,6 +2397,7 @@ class DMX(PropertyGroup):
         selected_fixtures_only=False,
         export_fixtures_only=False,
         export_active_layer_only=False,
+        only_changed=None,
     ):
         return mvr_export_mvr(
             self,
@@ -2453,6 +2406,27 @@ class DMX(PropertyGroup):
             selected_fixtures_only=selected_fixtures_only,
             export_fixtures_only=export_fixtures_only,
             export_active_layer_only=export_active_layer_only,
+            only_changed=only_changed,
+        )
+
+    def export_mvr_steps(
+        self,
+        file_name,
+        export_focus_points=True,
+        selected_fixtures_only=False,
+        export_fixtures_only=False,
+        export_active_layer_only=False,
+        *,
+        progress_cb=None,
+    ):
+        return mvr_export_mvr_steps(
+            self,
+            file_name,
+            export_focus_points=export_focus_points,
+            selected_fixtures_only=selected_fixtures_only,
+            export_fixtures_only=export_fixtures_only,
+            export_active_layer_only=export_active_layer_only,
+            progress_cb=progress_cb,
         )
 
     def ensureUniverseExists(self, universe):
@@ -2623,6 +2597,7 @@ class DMX(PropertyGroup):
         new_commit.file_size = commit.file_size
         new_commit.file_name = commit.file_name
         new_commit.timestamp = now
+        new_commit.changes_only = getattr(commit, "changes_only", False)
 
         if DMX_MVR_X_WS_Client._instance is not None:
             DMX_MVR_X_WS_Client._instance.client.send_commit(new_commit)
@@ -2697,6 +2672,8 @@ class DMX(PropertyGroup):
     def remove_fixture_from_groups(self, fixture_uuid):
         dmx = bpy.context.scene.dmx
         for group in dmx.groups:
+            if fixture_uuid not in group.dump:
+                continue
             dump = json.loads(group.dump)
             if fixture_uuid in dump:
                 dump.remove(fixture_uuid)
@@ -2704,6 +2681,7 @@ class DMX(PropertyGroup):
 
     # # Preview Volume
 
+    @DMX_Selection.batched
     def updatePreviewVolume(self):
         if self.volume_preview == "SELECTED":
             self.disable_overlays = False  # overlay must be enabled
@@ -2776,15 +2754,34 @@ class DMX(PropertyGroup):
 
     # # Render
 
-    def render(self):
+    def render(self, changed_only=False):
         if bpy.context.scene.tool_settings.use_keyframe_insert_auto:
             # make the frame the same for all fixtures
             current_frame = bpy.data.scenes[0].frame_current
         else:
             current_frame = None
 
-        for fixture_ in self.fixtures:
-            fixture_.render(current_frame=current_frame)
+        # keep the changes while paused, so they are rendered after resuming
+        paused = bpy.context.window_manager.dmx.pause_render
+        if changed_only and not paused:
+            dirty, dirty_virtuals = DMX_Data.pop_dirty()
+            fixtures = DMX_Decode_Plan.dirty_fixtures(
+                self.fixtures, dirty, dirty_virtuals
+            )
+            if fixtures is None:
+                fixtures = [fixture_.name for fixture_ in self.fixtures]
+            DMX_Render_Scheduler.add(fixtures)
+            # when recording, keyframes of all fixtures must be on the same frame
+            deadline = None
+            if current_frame is None:
+                deadline = DMX_Render_Scheduler.deadline(int(self.render_rate))
+            DMX_Render_Scheduler.run(self.fixtures, deadline, current_frame)
+        else:
+            if not paused:
+                DMX_Data.pop_dirty()
+                DMX_Render_Scheduler.clear()
+            for fixture_ in self.fixtures:
+                fixture_.render(current_frame=current_frame)
         for tracker_ in self.trackers:
             tracker_.render(current_frame=current_frame)
 
@@ -2823,5 +2820,16 @@ class DMX(PropertyGroup):
     def run_render(self):
         if not self._wm_dmx.render_running:
             return None
-        self.render()
-        return 1.0 / 24
+        DMX_Render_Scheduler.start_tick()
+        profile_start = time.perf_counter() if DMX_Profiler.enabled else None
+        # data received by network threads since the last tick
+        DMX_Ingest.publish(self)
+        if profile_start is not None:
+            profile_render = time.perf_counter()
+            DMX_Profiler.add("tick", "ingest", profile_render - profile_start)
+        self.render(changed_only=True)
+        if profile_start is not None:
+            profile_end = time.perf_counter()
+            DMX_Profiler.add("tick", "render", profile_end - profile_render)
+            DMX_Profiler.add("tick", "total", profile_end - profile_start)
+        return DMX_Render_Scheduler.end_tick(int(self.render_rate))
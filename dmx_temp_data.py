@@ -29,6 +29,7 @@ from bpy.types import PropertyGroup
 
 from .i18n import DMX_Lang
 from .logging_setup import DMX_Log
+from .profiler import DMX_Profiler
 from .mvrxchange.mvr_xchange_blender import DMX_MVR_Xchange
 from .panels import profiles as Profiles
 from .panels import subfixtures
@@ -103,6 +104,18 @@ class DMX_TempData(PropertyGroup):
 
     mvr_xchange: PointerProperty(name=_("MVR-xchange"), type=DMX_MVR_Xchange)
 
+    def onProfilingEnable(self, context):
+        DMX_Profiler.enable(self.profiling_enabled)
+
+    profiling_enabled: BoolProperty(
+        name=_("Enable Profiling"),
+        description=_(
+            "Measure time spent in the render loop and rates of received packets"
+        ),
+        default=False,
+        update=onProfilingEnable,
+    )
+
     def onUpdateLoggingFilter(self, context):
         DMX_Log.update_filters()
 
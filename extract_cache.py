@@ -0,0 +1,100 @@
+# Copyright (C) 2026 vanous
+#
+# This file is part of BlenderDMX.
+#
+# BlenderDMX is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# BlenderDMX is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>.
+
+import json
+import os
+import shutil
+import threading
+
+from .logging_setup import DMX_Log
+
+
+class DMX_Extract_Cache:
+    """Extraction of GDTF archive members, skipped when the file on disk is known
+    to hold the same member. Each target folder keeps a manifest of
+    {relative path: [CRC of the member, size, mtime of the file]}, the CRC comes
+    from the zip directory, so checking a file does not read it. Safe to use
+    from worker threads."""
+
+    MANIFEST = ".extracted.json"
+    _manifests = {}  # folder: manifest
+    _lock = threading.RLock()
+
+    @staticmethod
+    def get_manifest(folder):
+        with DMX_Extract_Cache._lock:
+            manifest = DMX_Extract_Cache._manifests.get(folder)
+            if manifest is None:
+                try:
+                    with open(os.path.join(folder, DMX_Extract_Cache.MANIFEST)) as f:
+                        manifest = json.load(f)
+                except (OSError, ValueError):
+                    manifest = {}
+                DMX_Extract_Cache._manifests[folder] = manifest
+            return manifest
+
+    @staticmethod
+    def is_current(folder, relative_path, crc):
+        entry = DMX_Extract_Cache.get_manifest(folder).get(relative_path)
+        if entry is None or entry[0] != crc:
+            return False
+        try:
+            stat = os.stat(os.path.join(folder, relative_path))
+        except OSError:
+            return False
+        return entry[1] == stat.st_size and entry[2] == stat.st_mtime_ns
+
+    @staticmethod
+    def record(folder, relative_path, crc):
+        stat = os.stat(os.path.join(folder, relative_path))
+        with DMX_Extract_Cache._lock:
+            manifest = DMX_Extract_Cache.get_manifest(folder)
+            manifest[relative_path] = [crc, stat.st_size, stat.st_mtime_ns]
+            try:
+                with open(os.path.join(folder, DMX_Extract_Cache.MANIFEST), "w") as f:
+                    json.dump(manifest, f)
+            except OSError as e:
+                DMX_Log.log.error(f"Cannot write extraction manifest in {folder}: {e}")
+
+    @staticmethod
+    def extract(package, member, folder):
+        """Extract the member of the zip package into folder, unless it is already
+        there, and return the path of the file"""
+        info = package.getinfo(member)
+        path = os.path.join(folder, member)
+        if DMX_Extract_Cache.is_current(folder, member, info.CRC):
+            return path
+        DMX_Log.log.debug(f"Extracting {member} to {folder}")
+        path = package.extract(info, folder)
+        DMX_Extract_Cache.record(folder, member, info.CRC)
+        return path
+
+    @staticmethod
+    def copy(package, member, source_path, folder, relative_path):
+        """Copy an extracted member to folder/relative_path, unless it is already there"""
+        crc = package.getinfo(member).CRC
+        path = os.path.join(folder, relative_path)
+        if DMX_Extract_Cache.is_current(folder, relative_path, crc):
+            return path
+        shutil.copyfile(source_path, path)
+        DMX_Extract_Cache.record(folder, relative_path, crc)
+        return path
+
+    @staticmethod
+    def clear():
+        with DMX_Extract_Cache._lock:
+            DMX_Extract_Cache._manifests.clear()
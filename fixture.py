@@ -46,7 +46,11 @@ from bpy.types import (
     Text,
 )
 
+from .bulk_build import DMX_Bulk_Build
 from .data import DMX_Data
+from .decode_plan import DMX_Decode_Plan
+from .fixture_index import DMX_Fixture_Index
+from .profiler import DMX_Profiler
 from .gdtf import DMX_GDTF
 from .i18n import DMX_Lang
 from .gdtf_file import DMX_GDTF_File
@@ -58,9 +62,9 @@ from .material import (
     getGeometryNodes,
     set_light_nodes,
 )
-from .util import generate_fixture_name
 from .model import DMX_Model
 from .osc_utils import DMX_OSC_Handlers
+from .selection import DMX_Selection
 from .color_utils import (
     apply_rgb_filter,
     cmy_to_rgb,
@@ -227,99 +231,6 @@ class DMX_Fixture_Channel(PropertyGroup):
             getattr(item, "attribute") == attribute for item in self.channel_functions
         )
 
-    def get_function_attribute_data(self, dmx_value, dmx_data, skip_mode_master=False):
-        def _normalize_dmx_value(value, source_bits, target_bits):
-            if source_bits <= 0 or target_bits <= 0:
-                return 0
-            target_max = (1 << target_bits) - 1
-            if source_bits == target_bits:
-                return max(0, min(int(value), target_max))
-            source_max = (1 << source_bits) - 1
-            scaled = round(int(value) * target_max / source_max)
-            return max(0, min(scaled, target_max))
-
-        wheel_slot = None
-        for ch_f in self.channel_functions:
-            # get a function which contains dmx from/to encapsulating our current dmx value
-            if ch_f.dmx_from <= dmx_value <= ch_f.dmx_to:
-                DMX_Log.log.debug(("have a function", ch_f.attribute))
-                if ch_f.mode_master != "" and skip_mode_master is False:
-                    DMX_Log.log.debug("check if mm confirms it")
-                    mode_from = ch_f.mode_from
-                    mode_to = ch_f.mode_to
-                    mm_dmx_value_coarse = dmx_data[ch_f.mm_dmx_break].get(
-                        ch_f.mm_offsets[0], None
-                    )
-                    if mm_dmx_value_coarse is not None:
-                        mm_dmx_value_final = mm_dmx_value_coarse
-                        if ch_f.mm_offsets_bytes > 1:
-                            offsets_full = [
-                                offset
-                                for offset in ch_f.mm_offsets[: ch_f.mm_offsets_bytes]
-                                if offset > 0
-                            ]
-                            if offsets_full:
-                                # Build the full multi-byte DMX value, then scale down
-                                # to 16-bit so it matches the stored mode range scale.
-                                raw_value = 0
-                                for offset in offsets_full:
-                                    raw_value = (raw_value << 8) | dmx_data[
-                                        ch_f.mm_dmx_break
-                                    ].get(offset, 0)
-                                source_bits = len(offsets_full) * 8
-                                if source_bits > 16:
-                                    mm_dmx_value_final = _normalize_dmx_value(
-                                        raw_value, source_bits, 16
-                                    )
-                                else:
-                                    mm_dmx_value_final = raw_value
-                            else:
-                                # Fallback for classic 16-bit (coarse+fine).
-                                mm_dmx_value_fine = dmx_data[ch_f.mm_dmx_break].get(
-                                    ch_f.mm_offsets[1], 0
-                                )
-                                mm_dmx_value_final = (
-                                    mm_dmx_value_coarse << 8
-                                ) | mm_dmx_value_fine
-
-                        DMX_Log.log.debug(
-                            ("mm_dmx_value", mm_dmx_value_final, mode_from, mode_to)
-                        )
-                        if mode_from <= mm_dmx_value_final <= mode_to:
-                            DMX_Log.log.debug(
-                                ("return the function confirmed by mm", ch_f.attribute)
-                            )
-                            attribute = ch_f.attribute
-                            physical_value = ch_f.dmx_to_physical(
-                                dmx_value
-                            )  # calculate physical value for this dmx value
-
-                            for ch_s in ch_f.channel_sets:
-                                if ch_s.dmx_from <= dmx_value <= ch_s.dmx_to:
-                                    wheel_slot = ch_s.wheel_slot
-                                    physical_value = ch_s.dmx_to_physical(
-                                        dmx_value
-                                    )  # calculate physical value for this dmx value
-                            return attribute, physical_value, wheel_slot
-
-                        DMX_Log.log.debug("try another channel function or exit")
-                else:
-                    DMX_Log.log.debug(("no mm, return", ch_f.attribute))
-                    attribute = ch_f.attribute
-                    physical_value = ch_f.dmx_to_physical(
-                        dmx_value
-                    )  # calculate physical value for this dmx value
-
-                    for ch_s in ch_f.channel_sets:
-                        if ch_s.dmx_from <= dmx_value <= ch_s.dmx_to:
-                            wheel_slot = ch_s.wheel_slot
-                            physical_value = ch_s.dmx_to_physical(
-                                dmx_value
-                            )  # calculate physical value for this dmx value
-                    return attribute, physical_value, wheel_slot
-        DMX_Log.log.debug("exit with None")
-        return None, None, None
-
     # fmt: off
     attribute: StringProperty(
         name = "Attribute",
@@ -356,6 +267,18 @@ class DMX_Break(PropertyGroup):
     def ensure_universe_exists(self, context):
         dmx = bpy.context.scene.dmx
         dmx.ensureUniverseExists(self.universe)
+        self.on_patch_changed(context)
+
+    def on_patch_changed(self, context):
+        """Re-patching invalidates the decode plan of the fixture owning this break"""
+        try:
+            fixture_path = self.path_from_id().rsplit(".dmx_breaks", 1)[0]
+            fixture = self.id_data.path_resolve(fixture_path)
+        except Exception:
+            # break of an operator (Add/Edit fixture dialog), not of a fixture
+            return
+        DMX_Decode_Plan.invalidate(fixture.name)
+        DMX_Fixture_Index.add(fixture)
 
     dmx_break: IntProperty(
         name="DMX Break",
@@ -374,7 +297,11 @@ class DMX_Break(PropertyGroup):
     )
 
     address: IntProperty(
-        name="Fixture > Address", description="Fixture DMX Address", default=1, min=1
+        name="Fixture > Address",
+        description="Fixture DMX Address",
+        default=1,
+        min=1,
+        update=on_patch_changed,
     )  # no max for now
 
     channels_count: IntProperty(
@@ -599,11 +526,9 @@ class DMX_Fixture(PropertyGroup):
         user_fixture_name="",
         use_high_mesh=False,
     ):
-        bpy.ops.object.select_all(action="DESELECT")
-        for obj in bpy.data.objects:
-            obj.select_set(False)
-        # clear possible existing selections in Blender
-        bpy.context.view_layer.objects.active = None
+        # hashes of the imported MVR fixture no longer describe a rebuilt one
+        self.pop("mvr_hash", None)
+        self.pop("mvr_patch_hash", None)
 
         # (Edit) Store objects positions
         old_pos = {obj.name: obj.object.location.copy() for obj in self.objects}
@@ -648,9 +573,10 @@ class DMX_Fixture(PropertyGroup):
         self.ies_data.clear()
         self.dmx_cache_dirty = False
         self.dmx_breaks.clear()
+        DMX_Decode_Plan.invalidate(self.name)
+        DMX_Fixture_Index.remove(self.name)  # the name can change during build
 
         # Custom python data storage, outside of bpy.props. So called ID props
-        self["dmx_values"] = []
         self["layer_name"] = None
         self["layer_uuid"] = None
         self["blender_control_playmode"] = None
@@ -670,7 +596,7 @@ class DMX_Fixture(PropertyGroup):
         self.profile = profile
 
         if self.name is None or regenerate_name:
-            self.name = generate_fixture_name(gdtf_profile.name)
+            self.name = DMX_Bulk_Build.fixture_name(gdtf_profile.name)
 
         # Create clean Collection
         self.collection = bpy.data.collections.new(self.name)
@@ -694,20 +620,15 @@ class DMX_Fixture(PropertyGroup):
             dmx_mode = gdtf_profile.dmx_modes[0]
             mode = dmx_mode.name
 
-        has_gobos = False
-
-        self.process_channels(dmx_mode.dmx_channels, self.channels)
-        self.process_channels(dmx_mode.virtual_channels, self.virtual_channels)
+        tables = DMX_Bulk_Build.mode_tables(
+            profile,
+            dmx_mode.name,
+            lambda: self.build_mode_tables(gdtf_profile, dmx_mode),
+        )
 
-        for channel in self.channels:
-            if "Gobo" in channel.attribute:
-                has_gobos = True
-                break
-        if not has_gobos:
-            for channel in self.virtual_channels:
-                if "Gobo" in channel.attribute:
-                    has_gobos = True
-                    break
+        self.process_channels(tables.channels, self.channels)
+        self.process_channels(tables.virtual_channels, self.virtual_channels)
+        has_gobos = tables.has_gobos
 
         for mode_dmx_break, provided_dmx_break in zip_longest(
             dmx_mode.dmx_breaks, dmx_breaks
@@ -729,52 +650,20 @@ class DMX_Fixture(PropertyGroup):
             new_break.address = 0
             new_break.channels_count = 0
 
-        # Get all gobos
-        if has_gobos:
-            gobo_wheels_links = set(
-                [
-                    (ch_fnc.attribute.str_link, ch_fnc.wheel.str_link)
-                    for channel in dmx_mode.dmx_channels
-                    for logical in channel.logical_channels
-                    for ch_fnc in logical.channel_functions
-                    if ch_fnc.attribute.str_link in ["Gobo1", "Gobo2"]
-                ]
-            )
-
-            if gobo_wheels_links:
-                gobo_seq = DMX_GDTF.extract_gobos_as_sequence(
-                    gdtf_profile, gobo_wheels_links
-                )
-                for gobo in gobo_seq:
-                    gobo1 = self.images.add()
-                    gobo1.name = gobo["attribute"]
-                    gobo1.image = gobo
-                    gobo1.count = gobo["count"]
-                    gobo1.attribute = gobo["attribute"]
-                    gobo1.wheel = gobo["wheel"]
-                    gobo1.image.pack()
+        # Gobo images are shared by fixtures of the same mode
+        for image_name in tables.gobo_images:
+            gobo = bpy.data.images[image_name]
+            gobo1 = self.images.add()
+            gobo1.name = gobo["attribute"]
+            gobo1.image = gobo
+            gobo1.count = gobo["count"]
+            gobo1.attribute = gobo["attribute"]
+            gobo1.wheel = gobo["wheel"]
 
         if "Gobo1" not in self.images:
             has_gobos = False  # faulty GDTF might have channels but no images
 
-        color_wheels_links = set(
-            [
-                (ch_fnc.attribute.str_link, ch_fnc.wheel.str_link)
-                for channel in dmx_mode.dmx_channels
-                for logical in channel.logical_channels
-                for ch_fnc in logical.channel_functions
-                if ch_fnc.attribute.str_link
-                in ["Color1", "Color2", "Color3", "ColorMacro1"]
-            ]
-        )
-
-        self["slot_colors"] = {}
-
-        if color_wheels_links:
-            slot_colors = DMX_GDTF.get_wheel_slot_colors(
-                gdtf_profile, color_wheels_links
-            )
-            self["slot_colors"] = slot_colors
+        self["slot_colors"] = tables.slot_colors
 
         links = {}
         base = self.get_root(model_collection)
@@ -817,7 +706,8 @@ class DMX_Fixture(PropertyGroup):
                 self.objects.add().name = "2D Symbol"
                 self.objects["2D Symbol"].object = links[obj.name]
             elif obj.get("text_label", None) == "text_label":
-                obj.data = obj.data.copy()  # ensure unique data block for each
+                # the label text differs per fixture, all other meshes stay shared
+                links[obj.name].data = obj.data.copy()
                 self.objects.add().name = "Text Label"
                 self.objects["Text Label"].object = links[obj.name]
 
@@ -847,17 +737,7 @@ class DMX_Fixture(PropertyGroup):
                     obj.object.rotation_mode = "XYZ"
                     obj.object.rotation_euler = old_rot[obj.name]
 
-        # Set position from MVR
-        if mvr_position is not None:
-            for obj in self.objects:
-                if obj.object.get("geometry_root", False):
-                    obj.object.matrix_world = mvr_position
-
-        # Set target's position from MVR
-        if focus_point is not None:
-            for obj in self.objects:
-                if "Target" in obj.name:
-                    obj.object.matrix_world = focus_point
+        self.set_mvr_placement(mvr_position, focus_point)
 
         # Setup emitter
         for obj in self.collection.objects:
@@ -951,17 +831,92 @@ class DMX_Fixture(PropertyGroup):
 
             obj.hide_select = not bpy.context.scene.dmx.select_geometries
 
+        # channels and breaks are final now, compile the decode plan
+        DMX_Decode_Plan.invalidate(self.name)
+        DMX_Fixture_Index.add(self)
         self.clear()
         self.hide_gobo()
         # self.render()
 
-    def process_channels(self, dmx_mode_channels, channels):
+    def set_mvr_placement(self, mvr_position=None, focus_point=None):
+        # Set position from MVR
+        if mvr_position is not None:
+            for obj in self.objects:
+                if obj.object.get("geometry_root", False):
+                    obj.object.matrix_world = mvr_position
+
+        # Set target's position from MVR
+        if focus_point is not None:
+            for obj in self.objects:
+                if "Target" in obj.name:
+                    obj.object.matrix_world = focus_point
+
+    def build_mode_tables(self, gdtf_profile, dmx_mode):
+        """Everything a fixture takes from its profile mode, as plain data which
+        can be reused for other fixtures of the same mode"""
+
+        channels = self.channel_table(dmx_mode.dmx_channels)
+        virtual_channels = self.channel_table(dmx_mode.virtual_channels)
+        has_gobos = any(
+            "Gobo" in channel["attribute"] for channel, _ in channels + virtual_channels
+        )
+
+        # Get all gobos
+        gobo_images = []
+        if has_gobos:
+            gobo_wheels_links = set(
+                [
+                    (ch_fnc.attribute.str_link, ch_fnc.wheel.str_link)
+                    for channel in dmx_mode.dmx_channels
+                    for logical in channel.logical_channels
+                    for ch_fnc in logical.channel_functions
+                    if ch_fnc.attribute.str_link in ["Gobo1", "Gobo2"]
+                ]
+            )
+
+            if gobo_wheels_links:
+                gobo_seq = DMX_GDTF.extract_gobos_as_sequence(
+                    gdtf_profile, gobo_wheels_links
+                )
+                for gobo in gobo_seq:
+                    gobo.pack()
+                    gobo_images.append(gobo.name)
+
+        color_wheels_links = set(
+            [
+                (ch_fnc.attribute.str_link, ch_fnc.wheel.str_link)
+                for channel in dmx_mode.dmx_channels
+                for logical in channel.logical_channels
+                for ch_fnc in logical.channel_functions
+                if ch_fnc.attribute.str_link
+                in ["Color1", "Color2", "Color3", "ColorMacro1"]
+            ]
+        )
+
+        slot_colors = {}
+        if color_wheels_links:
+            slot_colors = DMX_GDTF.get_wheel_slot_colors(
+                gdtf_profile, color_wheels_links
+            )
+
+        return SimpleNamespace(
+            channels=channels,
+            virtual_channels=virtual_channels,
+            has_gobos=has_gobos,
+            gobo_images=gobo_images,
+            slot_colors=slot_colors,
+        )
+
+    def channel_table(self, dmx_mode_channels):
+        """Channel properties as (channel, [(function, [sets])]) dictionaries"""
+        table = []
         for dmx_channel in dmx_mode_channels:
-            new_channel = channels.add()
-            new_channel.attribute = dmx_channel.attribute.str_link
-            new_channel.name_ = dmx_channel.name
-            new_channel.geometry = dmx_channel.geometry
-            new_channel.dmx_break = dmx_channel.dmx_break
+            channel = {
+                "attribute": dmx_channel.attribute.str_link,
+                "name_": dmx_channel.name,
+                "geometry": dmx_channel.geometry,
+                "dmx_break": dmx_channel.dmx_break,
+            }
             is_virtual = False
             if dmx_channel.offset is None:
                 # we detect virtual channels by no offset
@@ -969,12 +924,12 @@ class DMX_Fixture(PropertyGroup):
 
             if not is_virtual:
                 offsets_full = (dmx_channel.offset + [0, 0, 0, 0])[:4]
-                new_channel.offsets = tuple(offsets_full)
-                new_channel.offsets_bytes = len(dmx_channel.offset)
+                channel["offsets"] = tuple(offsets_full)
+                channel["offsets_bytes"] = len(dmx_channel.offset)
             else:
                 # virtual channels are 8 bit for now
-                new_channel.offsets = (0, 0, 0, 0)
-                new_channel.offsets_bytes = 1
+                channel["offsets"] = (0, 0, 0, 0)
+                channel["offsets_bytes"] = 1
 
             # blender programmer cannot control white, set it to 0
 
@@ -985,243 +940,147 @@ class DMX_Fixture(PropertyGroup):
                 "ColorAdd_CW",
                 "ColorAdd_RY",
             ]:
-                new_channel.defaults = (0, 0)
+                channel["defaults"] = (0, 0)
             else:
                 fine_default = 0
-                if new_channel.offsets_bytes > 1:
+                if channel["offsets_bytes"] > 1:
                     fine_default = dmx_channel.default.get_value(fine=True)
-                new_channel.defaults = (dmx_channel.default.get_value(), fine_default)
+                channel["defaults"] = (dmx_channel.default.get_value(), fine_default)
 
+            functions = []
             for logical_channel in dmx_channel.logical_channels:
                 for channel_function in logical_channel.channel_functions:
-                    new_channel_function = new_channel.channel_functions.add()
-                    new_channel_function.attribute = channel_function.attribute.str_link
-                    new_channel_function.name_ = channel_function.name
+                    function = {
+                        "attribute": channel_function.attribute.str_link,
+                        "name_": channel_function.name,
+                    }
 
                     if channel_function.mode_master is not None:
                         mode_master = channel_function.mode_master.str_link
-                        new_channel_function.mode_master = (
+                        function["mode_master"] = (
                             mode_master if mode_master is not None else ""
                         )
-                        new_channel_function.mode_from = (
-                            channel_function.mode_from.value
-                        )
-                        new_channel_function.mode_to = channel_function.mode_to.value
+                        function["mode_from"] = channel_function.mode_from.value
+                        function["mode_to"] = channel_function.mode_to.value
 
                     # virtual channels have byte count 4 which is too much for blender int
                     # and we treat them as 8 bit only anyways
                     # if channel_function.dmx_from.byte_count > 2:
                     if is_virtual:
-                        new_channel_function.dmx_from = (
-                            channel_function.dmx_from.get_value()
-                        )
+                        function["dmx_from"] = channel_function.dmx_from.get_value()
                     else:
-                        new_channel_function.dmx_from = channel_function.dmx_from.value
+                        function["dmx_from"] = channel_function.dmx_from.value
 
                     # if channel_function.dmx_to.byte_count > 2:
                     if is_virtual:
-                        new_channel_function.dmx_to = (
-                            channel_function.dmx_to.get_value()
-                        )
+                        function["dmx_to"] = channel_function.dmx_to.get_value()
                     else:
-                        new_channel_function.dmx_to = min(
+                        function["dmx_to"] = min(
                             channel_function.dmx_to.value, 65535
                         )  # TODO: fix this properly, here we trim to 16bit, to prevent crash with 24/32bit channels
 
-                    new_channel_function.physical_from = (
-                        channel_function.physical_from.value
-                    )
-                    new_channel_function.physical_to = (
-                        channel_function.physical_to.value
-                    )
+                    function["physical_from"] = channel_function.physical_from.value
+                    function["physical_to"] = channel_function.physical_to.value
 
+                    sets = []
                     for channel_set in channel_function.channel_sets:
-                        new_channel_set = new_channel_function.channel_sets.add()
-                        new_channel_set.name_ = channel_set.name or ""
+                        new_set = {"name_": channel_set.name or ""}
                         # if channel_set.dmx_from.byte_count > 2:
                         if is_virtual:
-                            new_channel_set.dmx_from = channel_set.dmx_from.get_value()
+                            new_set["dmx_from"] = channel_set.dmx_from.get_value()
                         else:
-                            new_channel_set.dmx_from = channel_set.dmx_from.value
+                            new_set["dmx_from"] = channel_set.dmx_from.value
 
                         # if channel_set.dmx_to.byte_count > 2:
                         if is_virtual:
-                            new_channel_set.dmx_to = channel_set.dmx_to.get_value()
+                            new_set["dmx_to"] = channel_set.dmx_to.get_value()
                         else:
-                            new_channel_set.dmx_to = channel_set.dmx_to.value
-
-                        new_channel_set.physical_from = channel_set.physical_from.value
-                        new_channel_set.physical_to = channel_set.physical_to.value
-                        new_channel_set.wheel_slot = channel_set.wheel_slot_index
+                            new_set["dmx_to"] = channel_set.dmx_to.value
+
+                        new_set["physical_from"] = channel_set.physical_from.value
+                        new_set["physical_to"] = channel_set.physical_to.value
+                        new_set["wheel_slot"] = channel_set.wheel_slot_index
+                        sets.append(new_set)
+                    functions.append((function, sets))
+            table.append((channel, functions))
+        return table
+
+    def process_channels(self, channel_table, channels):
+        for channel, functions in channel_table:
+            new_channel = channels.add()
+            for key, value in channel.items():
+                setattr(new_channel, key, value)
+            for function, sets in functions:
+                new_channel_function = new_channel.channel_functions.add()
+                for key, value in function.items():
+                    setattr(new_channel_function, key, value)
+                for channel_set in sets:
+                    new_channel_set = new_channel_function.channel_sets.add()
+                    for key, value in channel_set.items():
+                        setattr(new_channel_set, key, value)
 
         # create a link from channel function to a mode_master channel:
         for dmx_channel in channels:
-            modemasters_exist = False
             for ch_function in dmx_channel.channel_functions:
                 if ch_function.mode_master != "":
                     for ch in channels:
                         if ch.name_ == ch_function.mode_master:
-                            modemasters_exist = True
                             ch_function.mm_dmx_break = ch.dmx_break
                             ch_function.mm_offsets = ch.offsets
                             ch_function.mm_offsets_bytes = ch.offsets_bytes
                             # mm_offsets holds up to 4 ordered offsets; use
                             # mm_offsets_bytes to read the valid prefix.
-            if not modemasters_exist:
-                # create some caching of dmx channel data
-                # we ignore channels with mode dependencies
-                # as checking for the cache and then finding that we need
-                # to re-calculate the value anyways is probably more expensive
-                dmx_channel["cached_channel"] = {
-                    "dmx_value": -1,
-                    "attribute": None,
-                    "value": -1,
-                    "index": -1,
-                }
 
     # Interface Methods #
 
     def setDMX(self, pvalues):
-        temp_data = bpy.context.window_manager.dmx
-
-        # channels = [c.id for c in self.channels]
-        # virtuals = [c.id for c in self.virtual_channels]
-
+        subfixtures = {
+            geometry.name
+            for geometry in bpy.context.window_manager.dmx.active_subfixtures
+        }
+        writes = []
+        self.collectDMX(pvalues, writes, subfixtures)
+        DMX_Data.set_many(writes)
+
+    def collectDMX(self, pvalues, writes, subfixtures):
+        """Append (universe, address, value) of the attribute values to writes, to be
+        written by DMX_Data.set_many. Virtual channels are set directly. If subfixtures
+        (geometry names) are given, only their channels are set."""
+        plan = DMX_Decode_Plan.get(self)
+        DMX_Log.log.info(("Set DMX data", self.name, pvalues))
         for attribute, value in pvalues.items():
-            for channel in self.channels:
-                if channel.attribute == attribute or channel.has_attribute(attribute):
-                    if len(temp_data.active_subfixtures) > 0:
-                        if any(
-                            channel.geometry == g.name
-                            for g in temp_data.active_subfixtures
-                        ):
-                            for dmx_break in self.dmx_breaks:
-                                if dmx_break.dmx_break == channel.dmx_break:
-                                    DMX_Log.log.info(
-                                        ("Set DMX data", channel.attribute, value)
-                                    )
-                                    if attribute == "Pan" or attribute == "Tilt":
-                                        hi = (value >> 8) & 0xFF
-                                        lo = value & 0xFF
-                                        if channel.offsets_bytes == 2:
-                                            DMX_Data.set(
-                                                dmx_break.universe,
-                                                dmx_break.address
-                                                + channel.offsets[0]
-                                                - 1,
-                                                hi,
-                                            )
-                                            DMX_Data.set(
-                                                dmx_break.universe,
-                                                dmx_break.address
-                                                + channel.offsets[1]
-                                                - 1,
-                                                lo,
-                                            )
-                                        else:
-                                            DMX_Data.set(
-                                                dmx_break.universe,
-                                                dmx_break.address
-                                                + channel.offsets[0]
-                                                - 1,
-                                                value,
-                                            )
-                                    else:
-                                        DMX_Data.set(
-                                            dmx_break.universe,
-                                            dmx_break.address + channel.offsets[0] - 1,
-                                            value,
-                                        )
-
-                    else:
-                        for dmx_break in self.dmx_breaks:
-                            if dmx_break.dmx_break == channel.dmx_break:
-                                DMX_Log.log.info(
-                                    (
-                                        "Set DMX data",
-                                        channel.attribute,
-                                        channel.offsets[0],
-                                        value,
-                                    )
-                                )
-                                if attribute == "Pan" or attribute == "Tilt":
-                                    hi = (value >> 8) & 0xFF
-                                    lo = value & 0xFF
-                                    if channel.offsets_bytes == 2:
-                                        DMX_Data.set(
-                                            dmx_break.universe,
-                                            dmx_break.address + channel.offsets[0] - 1,
-                                            hi,
-                                        )
-                                        DMX_Data.set(
-                                            dmx_break.universe,
-                                            dmx_break.address + channel.offsets[1] - 1,
-                                            lo,
-                                        )
-                                    else:
-                                        DMX_Data.set(
-                                            dmx_break.universe,
-                                            dmx_break.address + channel.offsets[0] - 1,
-                                            value,
-                                        )
-                                else:
-                                    DMX_Data.set(
-                                        dmx_break.universe,
-                                        dmx_break.address + channel.offsets[0] - 1,
-                                        value,
-                                    )
-            for vchannel in self.virtual_channels:
-                if vchannel.attribute == attribute:
-                    if attribute == "Pan" or attribute == "Tilt":
-                        value = (value >> 8) & 0xFF
-                    if len(temp_data.active_subfixtures) > 0:
-                        if any(
-                            vchannel.geometry == g.name
-                            for g in temp_data.active_subfixtures
-                        ):
-                            DMX_Log.log.info(("Set Virtual data", attribute, value))
-                            geometry = next(
-                                vchannel.geometry == g.name
-                                for g in temp_data.active_subfixtures
-                            )
-                            DMX_Data.set_virtual(self.name, attribute, geometry, value)
-                    else:
-                        DMX_Log.log.info(("Set Virtual data", attribute, value))
-                        DMX_Data.set_virtual(self.name, attribute, None, value)
+            targets, virtual_geometries = plan.write_targets(attribute)
+            pan_tilt = attribute == "Pan" or attribute == "Tilt"
+            for geometry, universe, address, fine_address in targets:
+                if subfixtures and geometry not in subfixtures:
+                    continue
+                if pan_tilt and fine_address is not None:
+                    writes.append((universe, address, (value >> 8) & 0xFF))
+                    writes.append((universe, fine_address, value & 0xFF))
+                else:
+                    writes.append((universe, address, value))
+            if pan_tilt:
+                value = (value >> 8) & 0xFF
+            for geometry in virtual_geometries:
+                if subfixtures:
+                    if geometry in subfixtures:
+                        DMX_Data.set_virtual(self.name, attribute, geometry, value)
+                else:
+                    DMX_Data.set_virtual(self.name, attribute, None, value)
 
     def render(self, skip_cache=False, current_frame=None):
-        def _normalize_dmx_value(value, source_bits, target_bits):
-            if source_bits <= 0 or target_bits <= 0:
-                return 0
-            target_max = (1 << target_bits) - 1
-            if source_bits == target_bits:
-                return max(0, min(int(value), target_max))
-            source_max = (1 << source_bits) - 1
-            scaled = round(int(value) * target_max / source_max)
-            return max(0, min(scaled, target_max))
-
         if bpy.context.window_manager.dmx.pause_render:
             # do not run render loop when paused
             return
 
-        dmx_data = {}
-        data_for_cached = []
-
-        for dmx_break in self.dmx_breaks:
-            new_data = DMX_Data.get(
-                dmx_break.universe, dmx_break.address, dmx_break.channels_count
-            )
-            result = {i: value for i, value in enumerate(new_data, 1)}
-            dmx_data[dmx_break.dmx_break] = result
-            data_for_cached += new_data
-
-        data_virtual = DMX_Data.get_virtual(self.name)
+        profiler = DMX_Profiler.start(self) if DMX_Profiler.enabled else None
+        plan = DMX_Decode_Plan.get(self)
+        dmx_data, data_virtual, cached_dmx_data = plan.read()
+        if profiler:
+            profiler.mark("read")
 
-        cached_dmx_data = [int(b) for b in data_for_cached] + [
-            int(b["value"]) for b in data_virtual.values()
-        ]  # create cache
         if (
-            list(self["dmx_values"]) == cached_dmx_data
+            plan.last_values == cached_dmx_data
         ):  # this helps to eliminate flicker with Ethernet DMX signal when the data for this particular device is not changing
             if (
                 skip_cache is False
@@ -1239,484 +1098,32 @@ class DMX_Fixture(PropertyGroup):
         DMX_Log.log.debug(f"{current_frame=}, {self.dmx_cache_dirty=}")
 
         dmx = bpy.context.scene.dmx
-        self["dmx_values"] = cached_dmx_data
-        panTilt = [None, None]
-        cmy = [None, None, None]
-        zoom = None
-        playmode = 0
-        recording = 0
-        color1 = None
-        color2 = None
-        color3 = None
-        color4 = None
-        ctc = None, None
-        iris = None
-        rgb_mixing_geometries = {}
-        xyz_moving_geometries = {}
-        xyz_rotating_geometries = {}
-        shutter_dimmer_geometries = {}  # dimmer, shutter, strobe
-        pan_rotating_geometries = {}
-        tilt_rotating_geometries = {}
-
-        pan_cont_rotating_geometries = {}
-        tilt_cont_rotating_geometries = {}
-
-        gobo1 = [
-            None,
-            None,
-            None,
-        ]  # gobo selection (Gobo1), gobo indexing Gobo1Pos, rotation (Gobo1PosRotate)
-        gobo2 = [
-            None,
-            None,
-            None,
-        ]  # gobo selection (Gobo2), gobo indexing Gobo2Pos, rotation (Gobo2PosRotate)
-
-        for vchannel in self.virtual_channels:
-            geometry = str(
-                vchannel.geometry
-            )  # for now. But, no way to know, as BlenderDMX controls are universal
-            if geometry not in rgb_mixing_geometries.keys():
-                rgb_mixing_geometries[geometry] = [
-                    None
-                ] * 12  # R, G, B, White, WW, CW, Amber, Lime, UV, cyan, magenta, yellow
-            if geometry not in xyz_moving_geometries.keys():
-                xyz_moving_geometries[geometry] = [None, None, None]
-            if geometry not in xyz_rotating_geometries.keys():
-                xyz_rotating_geometries[geometry] = [None, None, None]
-            if geometry not in shutter_dimmer_geometries.keys():
-                shutter_dimmer_geometries[geometry] = [None, None, None]
-            if geometry not in pan_rotating_geometries.keys():
-                pan_rotating_geometries[geometry] = [None]
-            if geometry not in tilt_rotating_geometries.keys():
-                tilt_rotating_geometries[geometry] = [None]
-            if geometry not in pan_cont_rotating_geometries.keys():
-                pan_cont_rotating_geometries[geometry] = [None]
-            if geometry not in tilt_cont_rotating_geometries.keys():
-                tilt_cont_rotating_geometries[geometry] = [None]
-
-            DMX_Log.log.debug(("virtual", vchannel.attribute))
-            if vchannel.attribute in data_virtual:
-                dmx_value_virtual = data_virtual[vchannel.attribute]["value"]
-                DMX_Log.log.debug(("data virtual", dmx_value_virtual))
-                channel_function_attribute = None
-
-                (
-                    channel_function_attribute,
-                    channel_function_physical_value,
-                    channel_set_wheel_slot,
-                ) = vchannel.get_function_attribute_data(
-                    dmx_value_virtual, None, skip_mode_master=True
-                )
-                if not self.use_fixtures_channel_functions:
-                    channel_function = dmx.get_default_channel_function_by_attribute(
-                        channel_function_attribute
-                    )
-                    if channel_function:
-                        channel_function_attribute = channel_function.attribute
-                        channel_function_physical_value = (
-                            channel_function.dmx_to_physical(dmx_value_virtual)
-                        )
-
-                DMX_Log.log.debug(
-                    (
-                        "virtual result",
-                        channel_function_attribute,
-                        channel_function_physical_value,
-                    )
-                )
-
-                if channel_function_attribute == "Dimmer":
-                    shutter_dimmer_geometries[geometry][0] = (
-                        channel_function_physical_value
-                    )
-                elif channel_function_attribute == "Shutter1":
-                    shutter_dimmer_geometries[geometry][1] = (
-                        channel_function_physical_value if dmx_value_virtual > 0 else 1
-                    )
-                    # we set the shutter to be open by default
-
-                elif channel_function_attribute == "Shutter1Strobe":
-                    shutter_dimmer_geometries[geometry][2] = (
-                        channel_function_physical_value
-                    )
-                elif (
-                    vchannel.attribute == "ColorAdd_R"
-                    or vchannel.attribute == "ColorRGB_Red"
-                ):
-                    rgb_mixing_geometries[geometry][0] = data_virtual[
-                        vchannel.attribute
-                    ]["value"]
-                elif (
-                    vchannel.attribute == "ColorAdd_G"
-                    or vchannel.attribute == "ColorRGB_Green"
-                ):
-                    rgb_mixing_geometries[geometry][1] = data_virtual[
-                        vchannel.attribute
-                    ]["value"]
-                elif (
-                    vchannel.attribute == "ColorAdd_B"
-                    or vchannel.attribute == "ColorRGB_Blue"
-                ):
-                    rgb_mixing_geometries[geometry][2] = data_virtual[
-                        vchannel.attribute
-                    ]["value"]
-                elif vchannel.attribute == "ColorSub_C":
-                    cmy[0] = data_virtual[vchannel.attribute]["value"]
-                elif vchannel.attribute == "ColorSub_M":
-                    cmy[1] = data_virtual[vchannel.attribute]["value"]
-                elif vchannel.attribute == "ColorSub_Y":
-                    cmy[2] = data_virtual[vchannel.attribute]["value"]
-                elif channel_function_attribute == "Pan":
-                    panTilt[0] = channel_function_physical_value
-                    pan_rotating_geometries[geometry][0] = (
-                        channel_function_physical_value
-                    )
-
-                elif channel_function_attribute == "Tilt":
-                    panTilt[1] = channel_function_physical_value
-                    tilt_rotating_geometries[geometry][0] = (
-                        channel_function_physical_value
-                    )
-
-                elif channel_function_attribute == "PanRotate":
-                    pan_cont_rotating_geometries[geometry][0] = (
-                        channel_function_physical_value
-                    )
-
-                elif channel_function_attribute == "TiltRotate":
-                    tilt_cont_rotating_geometries[geometry][0] = (
-                        channel_function_physical_value
-                    )
-
-                elif channel_function_attribute == "Zoom":
-                    zoom = channel_function_physical_value
-                elif channel_function_attribute == "Playmode":
-                    playmode = channel_function_physical_value
-                elif channel_function_attribute == "Recording":
-                    recording = channel_function_physical_value
-
-                elif channel_function_attribute == "CTC":
-                    ctc = channel_function_physical_value, dmx_value_virtual
-                elif channel_function_attribute == "CTO":
-                    ctc = channel_function_physical_value, dmx_value_virtual
-                elif channel_function_attribute == "CTB":
-                    ctc = channel_function_physical_value, dmx_value_virtual
-                elif vchannel.attribute == "XYZ_X":
-                    xyz_moving_geometries[geometry][0] = data_virtual[
-                        vchannel.attribute
-                    ]["value"]
-                elif vchannel.attribute == "XYZ_Y":
-                    xyz_moving_geometries[geometry][1] = data_virtual[
-                        vchannel.attribute
-                    ]["value"]
-                elif vchannel.attribute == "XYZ_Z":
-                    xyz_moving_geometries[geometry][2] = data_virtual[
-                        vchannel.attribute
-                    ]["value"]
-                elif vchannel.attribute == "Rot_X":
-                    xyz_rotating_geometries[geometry][0] = data_virtual[
-                        vchannel.attribute
-                    ]["value"]
-                elif vchannel.attribute == "Rot_Y":
-                    xyz_rotating_geometries[geometry][1] = data_virtual[
-                        vchannel.attribute
-                    ]["value"]
-                elif vchannel.attribute == "Rot_Z":
-                    xyz_rotating_geometries[geometry][2] = data_virtual[
-                        vchannel.attribute
-                    ]["value"]
-
-        for channel in self.channels:
-            if channel.dmx_break not in dmx_data:
-                continue  # this happens before the fixture is fully patched
-
-            geometry = channel.geometry
-            if geometry not in rgb_mixing_geometries.keys():
-                rgb_mixing_geometries[geometry] = [None] * 12
-            if geometry not in xyz_moving_geometries.keys():
-                xyz_moving_geometries[geometry] = [None, None, None]
-            if geometry not in xyz_rotating_geometries.keys():
-                xyz_rotating_geometries[geometry] = [None, None, None]
-            if geometry not in shutter_dimmer_geometries.keys():
-                shutter_dimmer_geometries[geometry] = [None, None, None]
-            if geometry not in pan_rotating_geometries.keys():
-                pan_rotating_geometries[geometry] = [None]
-            if geometry not in tilt_rotating_geometries.keys():
-                tilt_rotating_geometries[geometry] = [None]
-            if geometry not in pan_cont_rotating_geometries.keys():
-                pan_cont_rotating_geometries[geometry] = [None]
-            if geometry not in tilt_cont_rotating_geometries.keys():
-                tilt_cont_rotating_geometries[geometry] = [None]
-
-            if channel.offsets_bytes <= 0 or channel.offsets[0] <= 0:
-                # if channel has no address, we cannot continue
-                DMX_Log.log.error(
-                    (
-                        "No offsets in channel, skipping",
-                        channel.attribute,
-                        channel.offsets_bytes,
-                    )
-                )
-                continue
+        plan.last_values = cached_dmx_data
 
-            dmx_value_coarse = dmx_data[channel.dmx_break].get(channel.offsets[0], None)
-            if dmx_value_coarse is None:
-                DMX_Log.log.error(
-                    (
-                        "Address offset not in dmx data, skipping. You may have to re-insert or re-edit the GDTF fixture into the scene",
-                        channel.attribute,
-                        channel.dmx_break,
-                        channel.offsets[0],
-                    )
-                )
-                continue
-
-            dmx_value_fine = None
-            dmx_value_final = dmx_value_coarse
-            if channel.offsets_bytes > 1:
-                offsets_full = [
-                    offset
-                    for offset in channel.offsets[: channel.offsets_bytes]
-                    if offset > 0
-                ]
-                if len(offsets_full) > 1:
-                    raw_value = 0
-                    for offset in offsets_full:
-                        raw_value = (raw_value << 8) | dmx_data[channel.dmx_break].get(
-                            offset, 0
-                        )
-                    dmx_value_fine = dmx_data[channel.dmx_break].get(offsets_full[1], 0)
-                    source_bits = len(offsets_full) * 8
-                    if source_bits > 16:
-                        dmx_value_final = _normalize_dmx_value(
-                            raw_value, source_bits, 16
-                        )
-                    else:
-                        dmx_value_final = raw_value
-                else:
-                    dmx_value_fine = dmx_data[channel.dmx_break].get(
-                        channel.offsets[1], 0
-                    )
-                    dmx_value_final = (dmx_value_coarse << 8) | dmx_value_fine
-
-            # Default to the channel's own attribute when fixture functions are disabled.
-            channel_function_attribute = channel.attribute
-            channel_function_physical_value = None
-            channel_set_wheel_slot = None
-
-            skip_attr_search = False
-            if "cached_channel" in channel:
-                cached_dmx = channel["cached_channel"].get("dmx_value")
-                cached_attr = channel["cached_channel"].get("attribute", None)
-                cached_value = channel["cached_channel"].get("value")
-                cached_slot = channel["cached_channel"].get("index")
-
-                if dmx_value_final == int(cached_dmx) and cached_attr is not None:
-                    skip_attr_search = True
-                    channel_function_attribute = cached_attr
-                    channel_function_physical_value = cached_value
-                    channel_set_wheel_slot = cached_slot
-                    DMX_Log.log.debug(
-                        (
-                            "use cached data",
-                            channel.name_,
-                            channel_function_attribute,
-                            channel_function_physical_value,
-                            channel_set_wheel_slot,
-                        )
-                    )
-
-            if not skip_attr_search and self.use_fixtures_channel_functions:
-                DMX_Log.log.debug(
-                    ("search for fresh attribute data", channel.attribute)
-                )
-                DMX_Log.log.debug(
-                    (
-                        "start function search",
-                        channel.name_,
-                        channel.offsets,
-                        channel.offsets_bytes,
-                    )
-                )
-
-                (
-                    channel_function_attribute,
-                    channel_function_physical_value,
-                    channel_set_wheel_slot,
-                ) = channel.get_function_attribute_data(dmx_value_final, dmx_data)
-
-                if "cached_channel" in channel:
-                    DMX_Log.log.debug(("set cached data", channel.attribute))
-                    channel["cached_channel"]["dmx_value"] = dmx_value_final
-                    channel["cached_channel"]["attribute"] = channel_function_attribute
-                    channel["cached_channel"]["value"] = channel_function_physical_value
-                    channel["cached_channel"]["index"] = channel_set_wheel_slot or -1
-
-            if not self.use_fixtures_channel_functions:
-                channel_function = dmx.get_default_channel_function_by_attribute(
-                    channel_function_attribute
-                )
-                if channel_function:
-                    channel_function_attribute = channel_function.attribute
-                    channel_function_physical_value = channel_function.dmx_to_physical(
-                        dmx_value_coarse
-                    )
-
-            DMX_Log.log.debug(
-                (
-                    "channel function",
-                    channel_function_attribute,
-                    channel_function_physical_value,
-                    dmx_value_coarse,
-                )
-            )
-
-            if channel_function_attribute == "Dimmer":
-                shutter_dimmer_geometries[geometry][0] = channel_function_physical_value
-            elif channel_function_attribute == "Shutter1":
-                shutter_dimmer_geometries[geometry][1] = (
-                    channel_function_physical_value if dmx_value_coarse > 0 else 1
-                )
-            # we set the shutter to be open by default
-
-            elif channel_function_attribute == "Shutter1Strobe":
-                shutter_dimmer_geometries[geometry][2] = channel_function_physical_value
-            elif (
-                channel.attribute == "ColorAdd_R" or channel.attribute == "ColorRGB_Red"
-            ):
-                rgb_mixing_geometries[geometry][0] = dmx_data[channel.dmx_break][
-                    channel.offsets[0]
-                ]
-            elif (
-                channel.attribute == "ColorAdd_G"
-                or channel.attribute == "ColorRGB_Green"
-            ):
-                rgb_mixing_geometries[geometry][1] = dmx_data[channel.dmx_break][
-                    channel.offsets[0]
-                ]
-            elif (
-                channel.attribute == "ColorAdd_B"
-                or channel.attribute == "ColorRGB_Blue"
-            ):
-                rgb_mixing_geometries[geometry][2] = dmx_data[channel.dmx_break][
-                    channel.offsets[0]
-                ]
-            elif channel.attribute == "ColorAdd_W":
-                rgb_mixing_geometries[geometry][3] = dmx_data[channel.dmx_break][
-                    channel.offsets[0]
-                ]
-            elif channel.attribute == "ColorAdd_WW":
-                rgb_mixing_geometries[geometry][4] = dmx_data[channel.dmx_break][
-                    channel.offsets[0]
-                ]
-            elif channel.attribute == "ColorAdd_CW":
-                rgb_mixing_geometries[geometry][5] = dmx_data[channel.dmx_break][
-                    channel.offsets[0]
-                ]
-            elif channel.attribute == "ColorAdd_RY":
-                rgb_mixing_geometries[geometry][6] = dmx_data[channel.dmx_break][
-                    channel.offsets[0]
-                ]
-            elif channel.attribute == "ColorAdd_GY":
-                rgb_mixing_geometries[geometry][7] = dmx_data[channel.dmx_break][
-                    channel.offsets[0]
-                ]
-            elif channel.attribute == "ColorAdd_UV":
-                rgb_mixing_geometries[geometry][8] = dmx_data[channel.dmx_break][
-                    channel.offsets[0]
-                ]
-            elif channel.attribute == "ColorAdd_C":
-                rgb_mixing_geometries[geometry][9] = dmx_data[channel.dmx_break][
-                    channel.offsets[0]
-                ]
-            elif channel.attribute == "ColorAdd_M":
-                rgb_mixing_geometries[geometry][10] = dmx_data[channel.dmx_break][
-                    channel.offsets[0]
-                ]
-            elif channel.attribute == "ColorAdd_Y":
-                rgb_mixing_geometries[geometry][11] = dmx_data[channel.dmx_break][
-                    channel.offsets[0]
-                ]
-            elif channel.attribute == "ColorSub_C":
-                cmy[0] = dmx_data[channel.dmx_break][channel.offsets[0]]
-            elif channel.attribute == "ColorSub_M":
-                cmy[1] = dmx_data[channel.dmx_break][channel.offsets[0]]
-            elif channel.attribute == "ColorSub_Y":
-                cmy[2] = dmx_data[channel.dmx_break][channel.offsets[0]]
-            elif channel_function_attribute == "Pan":
-                panTilt[0] = channel_function_physical_value
-                pan_rotating_geometries[geometry][0] = channel_function_physical_value
-            elif channel_function_attribute == "Tilt":
-                panTilt[1] = channel_function_physical_value
-                tilt_rotating_geometries[geometry][0] = channel_function_physical_value
-
-            elif channel_function_attribute == "PanRotate":
-                pan_cont_rotating_geometries[geometry][0] = (
-                    channel_function_physical_value
-                )
-            elif channel_function_attribute == "TiltRotate":
-                tilt_cont_rotating_geometries[geometry][0] = (
-                    channel_function_physical_value
-                )
-            elif channel_function_attribute == "Zoom":
-                zoom = channel_function_physical_value
-            elif channel_function_attribute == "Playmode":
-                playmode = channel_function_physical_value
-            elif channel_function_attribute == "Recording":
-                recording = channel_function_physical_value
-            elif channel_function_attribute == "Color1":
-                color1 = channel_set_wheel_slot
-            elif channel_function_attribute == "Color2":
-                color2 = channel_set_wheel_slot
-            elif channel_function_attribute == "Color3":
-                color3 = channel_set_wheel_slot
-            elif channel_function_attribute == "ColorMacro1":
-                color4 = channel_set_wheel_slot
-            elif channel_function_attribute == "CTC":
-                ctc = channel_function_physical_value, dmx_value_coarse
-            elif channel_function_attribute == "CTO":
-                ctc = channel_function_physical_value, dmx_value_coarse
-            elif channel_function_attribute == "CTB":
-                ctc = channel_function_physical_value, dmx_value_coarse
-            elif channel_function_attribute == "Iris":
-                iris = channel_function_physical_value
-            elif channel_function_attribute == "Gobo1":
-                gobo1[0] = channel_set_wheel_slot
-            elif channel_function_attribute == "Gobo1Pos":
-                gobo1[1] = channel_function_physical_value
-            elif channel_function_attribute == "Gobo1PosRotate":
-                gobo1[2] = channel_function_physical_value
-            elif channel_function_attribute == "Gobo2":
-                gobo2[0] = channel_set_wheel_slot
-            elif channel_function_attribute == "Gobo2Pos":
-                gobo2[1] = channel_function_physical_value
-            elif channel_function_attribute == "Gobo2PosRotate":
-                gobo2[2] = channel_function_physical_value
-            elif channel.attribute == "XYZ_X":
-                xyz_moving_geometries[geometry][0] = dmx_data[channel.dmx_break][
-                    channel.offsets[0]
-                ]
-            elif channel.attribute == "XYZ_Y":
-                xyz_moving_geometries[geometry][1] = dmx_data[channel.dmx_break][
-                    channel.offsets[0]
-                ]
-            elif channel.attribute == "XYZ_Z":
-                xyz_moving_geometries[geometry][2] = dmx_data[channel.dmx_break][
-                    channel.offsets[0]
-                ]
-            elif channel.attribute == "Rot_X":
-                xyz_rotating_geometries[geometry][0] = dmx_data[channel.dmx_break][
-                    channel.offsets[0]
-                ]
-            elif channel.attribute == "Rot_Y":
-                xyz_rotating_geometries[geometry][1] = dmx_data[channel.dmx_break][
-                    channel.offsets[0]
-                ]
-            elif channel.attribute == "Rot_Z":
-                xyz_rotating_geometries[geometry][2] = dmx_data[channel.dmx_break][
-                    channel.offsets[0]
-                ]
+        frame = plan.decode(
+            dmx_data,
+            data_virtual,
+            self.use_fixtures_channel_functions,
+            dmx.get_default_channel_function_by_attribute,
+        )
+        panTilt = frame.pan_tilt
+        cmy = frame.cmy
+        zoom = frame.zoom
+        playmode = frame.playmode
+        recording = frame.recording
+        color1, color2, color3, color4 = frame.color_wheels
+        ctc = frame.ctc
+        iris = frame.iris
+        gobo1 = frame.gobo1
+        gobo2 = frame.gobo2
+        rgb_mixing_geometries = frame.rgb_mixing_geometries
+        xyz_moving_geometries = frame.xyz_moving_geometries
+        xyz_rotating_geometries = frame.xyz_rotating_geometries
+        shutter_dimmer_geometries = frame.shutter_dimmer_geometries
+        pan_rotating_geometries = frame.pan_rotating_geometries
+        tilt_rotating_geometries = frame.tilt_rotating_geometries
+        pan_cont_rotating_geometries = frame.pan_cont_rotating_geometries
+        tilt_cont_rotating_geometries = frame.tilt_cont_rotating_geometries
 
         self.remove_unset_geometries_from_multigeometry_attributes_all(
             rgb_mixing_geometries
@@ -1742,6 +1149,8 @@ class DMX_Fixture(PropertyGroup):
         self.remove_unset_geometries_from_multigeometry_attributes_1(
             tilt_cont_rotating_geometries
         )
+        if profiler:
+            profiler.mark("decode")
 
         if "BlenderControl" in self.name:
             # special fixture to control Blender itself
@@ -1821,6 +1230,8 @@ class DMX_Fixture(PropertyGroup):
 
         if cmy[0] is not None and cmy[1] is not None and cmy[2] is not None:
             self.updateCMY(cmy, colorwheel_color, color_temperature, current_frame)
+        if profiler:
+            profiler.mark("color")
 
         if "Target" in self.objects and self.use_target:
             if self.ignore_movement_dmx:
@@ -1864,9 +1275,13 @@ class DMX_Fixture(PropertyGroup):
                 rotation=tilt_rotate[0],
                 current_frame=current_frame,
             )
+        if profiler:
+            profiler.mark("pan_tilt")
 
         if zoom is not None:
             self.update_zoom(zoom, current_frame)
+        if profiler:
+            profiler.mark("zoom")
 
         self.hide_gobo_geometry(gobo1, gobo2, iris, current_frame)
 
@@ -1880,6 +1295,8 @@ class DMX_Fixture(PropertyGroup):
             if 0 <= iris <= 255:
                 iris = 12 - (iris * 12)
                 self.update_iris(iris, current_frame)
+        if profiler:
+            profiler.mark("gobo_iris")
 
         for geometry, xyz in xyz_moving_geometries.items():
             self.updatePosition(
@@ -1898,6 +1315,8 @@ class DMX_Fixture(PropertyGroup):
                 z=xyz[2],
                 current_frame=current_frame,
             )
+        if profiler:
+            profiler.mark("position")
 
         for geometry, shutter_dimmer in shutter_dimmer_geometries.items():
             if len(shutter_dimmer_geometries) == 1:
@@ -1918,11 +1337,16 @@ class DMX_Fixture(PropertyGroup):
                 zoom,
                 current_frame,
             )
+        if profiler:
+            profiler.mark("shutter_dimmer")
 
         self.keyframe_objects_with_bdmx_drivers(current_frame)
 
         if current_frame:
             self.dmx_cache_dirty = False
+        if profiler:
+            profiler.mark("keyframes")
+            profiler.finish()
         # end of render block
 
     def set_pan_tilt_no_rotation(self, geometry, axis):
@@ -2617,7 +2041,7 @@ class DMX_Fixture(PropertyGroup):
         if dmx.display_2D:
             # in 2D view deselect the 2D symbol, unhide the fixture and select base,
             # to allow movement and rotation
-            self.objects["2D Symbol"].object.select_set(False)
+            DMX_Selection.select_object(self.objects["2D Symbol"].object, False)
             targets = []
 
             for obj in self.collection.objects:
@@ -2640,7 +2064,7 @@ class DMX_Fixture(PropertyGroup):
             if not select_target:
                 if "Root" in self.objects:
                     try:
-                        self.objects["Root"].object.select_set(True)
+                        DMX_Selection.select_object(self.objects["Root"].object, True)
                     except Exception:
                         DMX_Log.log.error(
                             "Fixture doesn't exist, remove it via Fixture list → Edit → X"
@@ -2648,13 +2072,13 @@ class DMX_Fixture(PropertyGroup):
             else:
                 if len(targets):
                     for target in targets:
-                        target.select_set(True)
+                        DMX_Selection.select_object(target, True)
 
         else:
             if not select_target:
                 if "Root" in self.objects:
                     try:
-                        self.objects["Root"].object.select_set(True)
+                        DMX_Selection.select_object(self.objects["Root"].object, True)
                     except Exception:
                         DMX_Log.log.error(
                             "Fixture doesn't exist, remove it via Fixture list → Edit → X"
@@ -2667,36 +2091,34 @@ class DMX_Fixture(PropertyGroup):
 
                 if len(targets):
                     for target in targets:
-                        target.select_set(True)
+                        DMX_Selection.select_object(target, True)
 
         DMX_OSC_Handlers.fixture_selection(self)
-        dmx.updatePreviewVolume()
-        self.sync_fixture_selection()
+        DMX_Selection.fixture_changed(self)
 
     def sync_fixture_selection(self):
         """This sets the active selection in the Fixtures list, as
         we may select by shortcuts, mouse or an operator"""
 
         dmx = bpy.context.scene.dmx
-        for idx, fixture in enumerate(dmx.fixtures):
-            if fixture == self:
-                dmx.selected_fixture_index = idx
-                return
+        idx = dmx.fixtures.find(self.name)
+        if idx >= 0:
+            dmx.selected_fixture_index = idx
 
     def unselect(self):
         dmx = bpy.context.scene.dmx
         if "Root" in self.objects:
             try:
-                self.objects["Root"].object.select_set(False)
+                DMX_Selection.select_object(self.objects["Root"].object, False)
             except Exception:
                 DMX_Log.log.error(
                     "Fixture doesn't exist, remove it via Fixture list → Edit → X"
                 )
         if "Target" in self.objects:
-            self.objects["Target"].object.select_set(False)
+            DMX_Selection.select_object(self.objects["Target"].object, False)
         if "2D Symbol" in self.objects:
             try:
-                self.objects["2D Symbol"].object.select_set(False)
+                DMX_Selection.select_object(self.objects["2D Symbol"].object, False)
             except Exception:
                 DMX_Log.log.error(
                     "Fixture doesn't exist, remove it via Fixture list → Edit → X"
@@ -2710,42 +2132,35 @@ class DMX_Fixture(PropertyGroup):
                 obj.hide_set(True)
                 obj.hide_viewport = True  # need for keyframing
                 obj.hide_render = True
-        dmx.updatePreviewVolume()
-        self.sync_fixture_selection()
+        DMX_Selection.fixture_changed(self)
 
     def toggleSelect(self):
-        selected = False
-        for obj in self.objects:
-            if obj.object in bpy.context.selected_objects:
-                selected = True
-                break
-        if selected:
+        if self.is_selected():
             self.unselect()
         else:
             self.select()
 
     def is_selected(self):
-        selected = False
-        for obj in self.objects:
-            if obj.object in bpy.context.selected_objects:
-                selected = True
-                break
-        return selected
+        return any(DMX_Selection.is_selected(obj.object) for obj in self.objects)
 
     def clear(self):
+        writes = []
         for dmx_break in self.dmx_breaks:
             for channel in self.channels:
                 if channel.dmx_break == dmx_break.dmx_break:
                     for byte, offset in enumerate(
                         channel.offsets[: channel.offsets_bytes]
                     ):
-                        DMX_Data.set(
-                            dmx_break.universe,
-                            dmx_break.address + offset - 1,
-                            channel.defaults[byte]
-                            if byte < len(channel.defaults)
-                            else 0,
+                        writes.append(
+                            (
+                                dmx_break.universe,
+                                dmx_break.address + offset - 1,
+                                channel.defaults[byte]
+                                if byte < len(channel.defaults)
+                                else 0,
+                            )
                         )
+        DMX_Data.set_many(writes)
         self.render()
 
     def set_gobo_slot(self, n, index=-1, current_frame=None):
@@ -3096,7 +2511,7 @@ class DMX_Fixture(PropertyGroup):
             target = self.objects["Target"].object
             update_by_target = False
             for obj in self.objects:
-                if obj.object in bpy.context.selected_objects:
+                if DMX_Selection.is_selected(obj.object):
                     if obj.object != target:
                         # exit early if body (any part) and target were selected and moved
                         return
@@ -0,0 +1,137 @@
+# Copyright (C) 2026 vanous
+#
+# This file is part of BlenderDMX.
+#
+# BlenderDMX is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# BlenderDMX is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>.
+
+from .logging_setup import DMX_Log
+
+
+class DMX_Fixture_Index:
+    """Runtime lookups of fixture names by object, UUID and DMX address. Not
+    stored in the file, rebuilt on first use after invalidation. Objects are
+    keyed by pointer, so renaming them, like the label updates do, is fine."""
+
+    _valid = False
+    _by_object = {}  # object pointer: fixture name
+    _by_uuid = {}  # fixture uuid: fixture name
+    _by_address = {}  # (universe, address): {fixture names}, every patched address
+    _entries = {}  # fixture name: (object keys, uuid, address keys)
+
+    @staticmethod
+    def invalidate():
+        DMX_Fixture_Index._valid = False
+
+    @staticmethod
+    def rebuild(fixtures):
+        DMX_Fixture_Index._by_object = {}
+        DMX_Fixture_Index._by_uuid = {}
+        DMX_Fixture_Index._by_address = {}
+        DMX_Fixture_Index._entries = {}
+        DMX_Fixture_Index._valid = True
+        for fixture in fixtures:
+            DMX_Fixture_Index.add(fixture)
+        DMX_Log.log.debug(f"Built fixture index for {len(fixtures)} fixtures")
+
+    @staticmethod
+    def ensure(fixtures):
+        if not DMX_Fixture_Index._valid:
+            DMX_Fixture_Index.rebuild(fixtures)
+
+    @staticmethod
+    def add(fixture):
+        """Index a fixture, replacing its previous entries"""
+        if not DMX_Fixture_Index._valid:
+            return
+        name = fixture.name
+        DMX_Fixture_Index.remove(name)
+
+        object_keys = ()
+        if fixture.collection is not None:
+            object_keys = tuple(obj.as_pointer() for obj in fixture.collection.objects)
+        address_keys = tuple(
+            (dmx_break.universe, address)
+            for dmx_break in fixture.dmx_breaks
+            for address in range(
+                dmx_break.address, dmx_break.address + dmx_break.channels_count
+            )
+        )
+
+        for key in object_keys:
+            DMX_Fixture_Index._by_object[key] = name
+        DMX_Fixture_Index._by_uuid[fixture.uuid] = name
+        for key in address_keys:
+            DMX_Fixture_Index._by_address.setdefault(key, set()).add(name)
+        DMX_Fixture_Index._entries[name] = (object_keys, fixture.uuid, address_keys)
+
+    @staticmethod
+    def remove(fixture_name):
+        entry = DMX_Fixture_Index._entries.pop(fixture_name, None)
+        if entry is None:
+            return
+        object_keys, uuid, address_keys = entry
+        for key in object_keys:
+            if DMX_Fixture_Index._by_object.get(key) == fixture_name:
+                del DMX_Fixture_Index._by_object[key]
+        if DMX_Fixture_Index._by_uuid.get(uuid) == fixture_name:
+            del DMX_Fixture_Index._by_uuid[uuid]
+        for key in address_keys:
+            names = DMX_Fixture_Index._by_address.get(key)
+            if names is not None:
+                names.discard(fixture_name)
+                if not names:
+                    del DMX_Fixture_Index._by_address[key]
+
+    @staticmethod
+    def lookup(fixtures, table, key, check):
+        """Fixture of an index hit, None on a miss. The index is kept current by
+        add/remove and invalidated on undo, redo and file load, so a miss means
+        there is no such fixture. A hit which does not check out, like an object
+        pointer reused by a new object, rebuilds the index once."""
+        DMX_Fixture_Index.ensure(fixtures)
+        for attempt in range(2):
+            name = getattr(DMX_Fixture_Index, table).get(key)
+            if name is None:
+                return None
+            fixture = fixtures.get(name)
+            if fixture is not None and check(fixture):
+                return fixture
+            if attempt == 0:
+                DMX_Log.log.debug("Fixture index is stale, rebuilding")
+                DMX_Fixture_Index.rebuild(fixtures)
+        return None
+
+    @staticmethod
+    def by_object(fixtures, obj):
+        return DMX_Fixture_Index.lookup(
+            fixtures,
+            "_by_object",
+            obj.as_pointer(),
+            lambda fixture: (
+                fixture.collection is not None
+                and fixture.collection.objects.get(obj.name) == obj
+            ),
+        )
+
+    @staticmethod
+    def by_uuid(fixtures, uuid):
+        return DMX_Fixture_Index.lookup(
+            fixtures, "_by_uuid", uuid, lambda fixture: fixture.uuid == uuid
+        )
+
+    @staticmethod
+    def by_address(fixtures, universe, address):
+        """Names of fixtures patched on the given address"""
+        DMX_Fixture_Index.ensure(fixtures)
+        return DMX_Fixture_Index._by_address.get((universe, address), set())
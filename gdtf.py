@@ -28,6 +28,7 @@ import pygdtf
 from io_scene_3ds.import_3ds import load_3ds
 from mathutils import Matrix, Vector
 
+from .extract_cache import DMX_Extract_Cache
 from .logging_setup import DMX_Log
 from .util import sanitize_obj_name
 from .color_utils import xyY2rgbaa, is_default_white
@@ -137,13 +138,13 @@ class DMX_GDTF:
         if not attr_gobo_wheels:
             return result
 
-        for image_name in profile._package.namelist():
-            if image_name.startswith("wheels"):
-                profile._package.extract(image_name, gdtf_path)
-
-        images_path = os.path.join(gdtf_path, "wheels")
-
-        images_paths = list(pathlib.Path(images_path).rglob("*"))
+        package = profile._package
+        wheel_images = {}  # file name without extension: archive member
+        for image_name in package.namelist():
+            if image_name.startswith("wheels") and not image_name.endswith("/"):
+                wheel_images.setdefault(
+                    pathlib.PurePosixPath(image_name).stem, image_name
+                )
 
         for index, (attribute_name, wheel) in enumerate(attr_gobo_wheels):
             sequence_path = os.path.join(gdtf_path, attribute_name.lower())
@@ -156,13 +157,18 @@ class DMX_GDTF:
                 if not slot.media_file_name.name:
                     continue
 
-                for image in images_paths:
-                    if slot.media_file_name.name == image.stem:
-                        destination = pathlib.Path(sequence_path, f"image_{idx:04}.png")
-                        destination.write_bytes(image.read_bytes())
-                        if first is None:
-                            first = str(destination.resolve())
-                        break
+                image_name = wheel_images.get(slot.media_file_name.name)
+                if image_name is not None:
+                    image = DMX_Extract_Cache.extract(package, image_name, gdtf_path)
+                    destination = DMX_Extract_Cache.copy(
+                        package,
+                        image_name,
+                        image,
+                        gdtf_path,
+                        f"{attribute_name.lower()}/image_{idx:04}.png",
+                    )
+                    if first is None:
+                        first = str(pathlib.Path(destination).resolve())
 
                 if idx == 256:  # more gobos then values on a channel, must stop
                     DMX_Log.log.info("Only 255 gobos are supported at the moment")
@@ -189,7 +195,9 @@ class DMX_GDTF:
         filename = f"{profile.thumbnail}.svg"
         obj = None
         if filename in profile._package.namelist():
-            profile._package.extract(filename, extract_to_folder_path)
+            DMX_Extract_Cache.extract(
+                profile._package, filename, extract_to_folder_path
+            )
         else:
             # default 2D
             extract_to_folder_path = DMX_GDTF.getPrimitivesPath()
@@ -234,8 +242,9 @@ class DMX_GDTF:
             if inside_zip_path not in profile._package.namelist():
                 inside_zip_path = f"models/3ds/{model.file.name}.{model.file.extension}"
 
-            profile._package.extract(inside_zip_path, extract_to_folder_path)
-            file_name = os.path.join(extract_to_folder_path, inside_zip_path)
+            file_name = DMX_Extract_Cache.extract(
+                profile._package, inside_zip_path, extract_to_folder_path
+            )
             try:
                 load_3ds(
                     file_name,
@@ -258,8 +267,9 @@ class DMX_GDTF:
                     f"models/gltf/{model.file.name}.{model.file.extension}"
                 )
 
-            profile._package.extract(inside_zip_path, extract_to_folder_path)
-            file_name = os.path.join(extract_to_folder_path, inside_zip_path)
+            file_name = DMX_Extract_Cache.extract(
+                profile._package, inside_zip_path, extract_to_folder_path
+            )
             bpy.ops.import_scene.gltf(filepath=file_name)
 
         objs = list(bpy.context.selected_objects)
@@ -15,7 +15,12 @@
 # You should have received a copy of the GNU General Public License along
 # with this program. If not, see <https://www.gnu.org/licenses/>.
 
+import importlib
+import multiprocessing
 import os
+import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 
 import bpy
 import pygdtf
@@ -23,12 +28,27 @@ import json
 from .logging_setup import DMX_Log
 
 
+def index_module():
+    """The profile reading module of the index build. It is imported as a top
+    level module, so that worker processes can import it without the add-on."""
+    path = os.path.join(os.path.dirname(os.path.realpath(__file__)), "workers")
+    if path not in sys.path:
+        sys.path.append(path)
+    return importlib.import_module("dmx_gdtf_index")
+
+
 class DMX_GDTF_File:
     instance = None
     profiles_list = {}
     # filename: name, short_name, filename, modes
 
-    gdtf_fixtures = {}
+    # loaded pygdtf.FixtureType objects, least recently used first
+    # filename: (fixture type, (size, mtime) of the file)
+    gdtf_fixtures = OrderedDict()
+    gdtf_fixtures_bytes = 0  # size of the loaded profile files
+    cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
+    # index at least this many profiles in worker processes, less are read directly
+    PARALLEL_MIN = 8
 
     # manfacturer_name:  {profiles}
 
@@ -82,48 +102,80 @@ class DMX_GDTF_File:
         if DMX_GDTF_File.instance is None:
             DMX_GDTF_File.instance = DMX_GDTF_File()
         filepath = os.path.join(DMX_GDTF_File.get_profiles_path(), file_name)
-        try:
-            with DMX_GDTF_File.load_gdtf_profile(filepath) as fixture_type:
-                modes = []
-                for mode in fixture_type.dmx_modes:
-                    modes.append(
-                        {
-                            "mode_name": mode.name,
-                            "dmx_channels_count": mode.dmx_channels_count,
-                            "description": mode.description,
-                            "dmx_breaks": [
-                                dmx_break.as_dict() for dmx_break in mode.dmx_breaks
-                            ],
-                        }
-                    )
+        DMX_GDTF_File.update_data(*index_module().index_profile(filepath))
 
-                revisions = fixture_type.revisions.sorted()
-                revision = ""
-                if revisions:
-                    revision = revisions[0].text
-                data = {
-                    "name": f"{fixture_type.name}",
-                    "short_name": fixture_type.short_name,
-                    "manufacturer_name": f"{fixture_type.manufacturer or 'No manufacturer'}",
-                    "filename": file_name,
-                    "modes": modes,
-                    "revision": revision,
-                }
-                if file_name not in DMX_GDTF_File.profiles_list:
-                    DMX_GDTF_File.profiles_list[file_name] = data
-        except Exception as e:
-            DMX_Log.log.error((file_name, e))
+    @staticmethod
+    def update_data(file_name, signature, data, error):
+        """Store a result of dmx_gdtf_index.index_profile in the profiles list"""
+        if error is not None:
+            DMX_Log.log.error((file_name, error))
+            return
+        if data is None:  # same content, only the file changed
+            DMX_GDTF_File.profiles_list[file_name]["signature"] = signature
+            return
+        data["signature"] = signature
+        DMX_GDTF_File.profiles_list[file_name] = data
+        DMX_GDTF_File.release_gdtf_profile(file_name)
+
+    @staticmethod
+    def index_profiles(items):
+        """Read (path, known hash) profiles, in worker processes if there are many"""
+        index = index_module()
+        if len(items) >= DMX_GDTF_File.PARALLEL_MIN:
+            workers = max(1, min(len(items) // 4, (os.cpu_count() or 2) - 1))
+            try:
+                with ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                ) as pool:
+                    return list(
+                        pool.map(index.index_profile, *zip(*items), chunksize=8)
+                    )
+            except Exception as e:
+                DMX_Log.log.error(("Parallel profile indexing failed", e))
+        return [index.index_profile(path, known_hash) for path, known_hash in items]
 
     @staticmethod
     def recreate_data(recreate_profiles=False):
+        """Bring the profiles list up to date with the profiles folder. Only new
+        profiles and profiles with a changed size or modification time are read,
+        and those with unchanged content are not parsed again."""
         if DMX_GDTF_File.instance is None:
             DMX_GDTF_File.instance = DMX_GDTF_File()
         DMX_Log.log.info("Regenerating fixture profiles list...")
         if recreate_profiles:
             DMX_GDTF_File.profiles_list = {}
-        for file in os.listdir(DMX_GDTF_File.get_profiles_path()):
-            if file not in DMX_GDTF_File.profiles_list:
-                DMX_GDTF_File.add_to_data(file)
+        profiles_path = DMX_GDTF_File.get_profiles_path()
+        files = {
+            file for file in os.listdir(profiles_path) if file.lower().endswith(".gdtf")
+        }
+        changed = False
+        for file_name in list(DMX_GDTF_File.profiles_list):
+            if file_name not in files:
+                del DMX_GDTF_File.profiles_list[file_name]
+                changed = True
+
+        index = index_module()
+        stale = []
+        for file_name in files:
+            path = os.path.join(profiles_path, file_name)
+            signature = DMX_GDTF_File.profiles_list.get(file_name, {}).get("signature")
+            try:
+                size, mtime = index.file_signature(path)
+            except OSError:
+                continue
+            if signature is not None:
+                if signature["size"] == size and signature["mtime"] == mtime:
+                    continue
+            stale.append((path, signature["hash"] if signature else None))
+
+        if stale:
+            DMX_Log.log.info(f"Indexing {len(stale)} of {len(files)} fixture profiles")
+            for result in DMX_GDTF_File.index_profiles(stale):
+                DMX_GDTF_File.update_data(*result)
+            changed = True
+        if changed:
+            DMX_GDTF_File.write_cache()
 
     @staticmethod
     def remove_from_data(file_name):
@@ -131,6 +183,7 @@ class DMX_GDTF_File:
             DMX_GDTF_File.instance = DMX_GDTF_File()
         if file_name in DMX_GDTF_File.profiles_list:
             del DMX_GDTF_File.profiles_list[file_name]
+        DMX_GDTF_File.release_gdtf_profile(file_name)
 
     @staticmethod
     def get_manufacturers_list():
@@ -183,12 +236,72 @@ class DMX_GDTF_File:
 
     @staticmethod
     def load_gdtf_profile(file_name):
+        """Return the loaded profile, from the cache if the file did not change.
+        Least recently used profiles are released when the cache is over the
+        limits set in the add-on preferences."""
         if DMX_GDTF_File.instance is None:
             DMX_GDTF_File.instance = DMX_GDTF_File()
-        if file_name in DMX_GDTF_File.gdtf_fixtures:
-            return DMX_GDTF_File.gdtf_fixtures[file_name]
-
         path = os.path.join(DMX_GDTF_File.get_profiles_path(), file_name)
+        try:
+            stat = os.stat(path)
+            signature = (stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            signature = None
+
+        cached = DMX_GDTF_File.gdtf_fixtures.get(file_name)
+        if cached is not None:
+            if cached[1] == signature:
+                DMX_GDTF_File.gdtf_fixtures.move_to_end(file_name)
+                DMX_GDTF_File.cache_stats["hits"] += 1
+                return cached[0]
+            DMX_Log.log.info(f"Profile changed on disk, reloading {file_name}")
+            DMX_GDTF_File.release_gdtf_profile(file_name)
+
+        DMX_GDTF_File.cache_stats["misses"] += 1
         profile = pygdtf.FixtureType(path)
-        DMX_GDTF_File.gdtf_fixtures[file_name] = profile
+        DMX_GDTF_File.gdtf_fixtures[file_name] = (profile, signature)
+        if signature is not None:
+            DMX_GDTF_File.gdtf_fixtures_bytes += signature[0]
+        DMX_GDTF_File.trim_gdtf_profiles(keep=file_name)
         return profile
+
+    @staticmethod
+    def cache_limits():
+        """(profiles count, bytes) limits of the loaded profiles cache"""
+        try:
+            prefs = bpy.context.preferences.addons[__package__].preferences
+            return prefs.profiles_cache_count, prefs.profiles_cache_size * 1024 * 1024
+        except Exception:
+            return 32, 256 * 1024 * 1024
+
+    @staticmethod
+    def trim_gdtf_profiles(keep=None):
+        max_count, max_bytes = DMX_GDTF_File.cache_limits()
+        for file_name in list(DMX_GDTF_File.gdtf_fixtures):
+            if (
+                len(DMX_GDTF_File.gdtf_fixtures) <= max_count
+                and DMX_GDTF_File.gdtf_fixtures_bytes <= max_bytes
+            ):
+                break
+            if file_name == keep:
+                continue
+            DMX_GDTF_File.release_gdtf_profile(file_name)
+            DMX_GDTF_File.cache_stats["evictions"] += 1
+
+    @staticmethod
+    def release_gdtf_profile(file_name=None):
+        """Drop a loaded profile, or all if no name is given, closing their files"""
+        if file_name is None:
+            names = list(DMX_GDTF_File.gdtf_fixtures)
+        else:
+            names = [file_name]
+        for name in names:
+            cached = DMX_GDTF_File.gdtf_fixtures.pop(name, None)
+            if cached is None:
+                continue
+            profile, signature = cached
+            if signature is not None:
+                DMX_GDTF_File.gdtf_fixtures_bytes -= signature[0]
+            if profile._package is not None:
+                profile._package.close()
+            DMX_Log.log.debug(f"Released profile {name}")
@@ -22,6 +22,8 @@ import bpy
 from bpy.props import StringProperty
 from bpy.types import PropertyGroup
 
+from .selection import DMX_Selection
+
 
 class FixtureGroup:
     def __init__(self, name, uuid):
@@ -47,11 +49,7 @@ class DMX_Group(PropertyGroup):
     # Store a list with those fixtures
     def update(self):
         # Get selected fixtures
-        sel_fixtures = []
-        for fixture in bpy.context.scene.dmx.fixtures:
-            for obj in fixture.collection.objects:
-                if obj in bpy.context.selected_objects:
-                    sel_fixtures.append(fixture)
+        sel_fixtures = DMX_Selection.fixtures(bpy.context.scene.dmx)
         # If there's any fixture selected, clear fixtures list
         # and repopulate it
         if len(sel_fixtures):
@@ -60,6 +58,7 @@ class DMX_Group(PropertyGroup):
         else:
             self.dump = ""
 
+    @DMX_Selection.batched
     def select(self):
         # Comment left here for legacy reasons. We now use json to serialize the array
         # Rebuilding the groups array everytime takes a long time
@@ -76,6 +75,7 @@ class DMX_Group(PropertyGroup):
             pass
         else:
             bpy.ops.object.select_all(action="DESELECT")
+            DMX_Selection.reset()
 
         for fixture in [
             dmx.findFixtureByUUID(f_uuid) for f_uuid in json.loads(self.dump)
@@ -85,4 +85,3 @@ class DMX_Group(PropertyGroup):
                     fixture.unselect()
                 else:
                     fixture.select()
-        bpy.context.scene.dmx.updatePreviewVolume()
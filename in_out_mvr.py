@@ -40,7 +40,6 @@ from .panels import profiles as Profiles
 from .gdtf_file import DMX_GDTF_File
 from .util import (
     clear_status_overlay,
-    force_view3d_redraw,
     is_status_overlay_dismissible,
     is_status_overlay_visible,
     status_overlay_contains_window_point,
@@ -304,38 +303,66 @@ class DMX_OT_Export_MVR(Operator, ExportHelper):
         box.prop(self, "export_active_layer_only")
 
     def execute(self, context):
-        dmx = context.scene.dmx
         DMX_Log.log.info(self.filepath)
-        started_at = time.monotonic()
-        show_status_overlay(
-            "Exporting MVR package",
-            progress=None,
-            status="running",
-            title="MVR Export In Progress!",
-            hint="Please wait...",
-        )
-        force_view3d_redraw()
-        result = dmx.export_mvr(
-            self.filepath,
+        return bpy.ops.dmx.export_mvr_modal(
+            "INVOKE_DEFAULT",
+            filepath=self.filepath,
             export_focus_points=self.export_focus_points,
             selected_fixtures_only=self.selected_fixtures_only,
             export_fixtures_only=self.export_fixtures_only,
             export_active_layer_only=self.export_active_layer_only,
         )
 
-        if result.ok:
-            elapsed = max(0.0, time.monotonic() - started_at)
+
+class DMX_OT_Export_MVR_Modal(Operator):
+    """Export My Virtual Rig in steps, showing the progress"""
+
+    bl_idname = "dmx.export_mvr_modal"
+    bl_label = "Export MVR (Modal)"
+
+    filepath: StringProperty(options={"HIDDEN"})
+
+    export_focus_points: BoolProperty(default=True, options={"HIDDEN"})
+    selected_fixtures_only: BoolProperty(default=False, options={"HIDDEN"})
+    export_fixtures_only: BoolProperty(default=False, options={"HIDDEN"})
+    export_active_layer_only: BoolProperty(default=False, options={"HIDDEN"})
+
+    _timer = None
+    _export_iter = None
+    _started_at = 0.0
+
+    def _progress_cb(self, progress, message):
+        show_status_overlay(
+            message,
+            progress=progress,
+            status="running",
+            title="MVR Export In Progress!",
+            hint="Press ESC to cancel the export",
+        )
+
+    def _finish(self, context, result=None, cancelled=False):
+        elapsed = max(0.0, time.monotonic() - self._started_at)
+        if self._timer is not None:
+            context.window_manager.event_timer_remove(self._timer)
+            self._timer = None
+        if self._export_iter is not None:
+            # closing the steps removes the unfinished package
+            self._export_iter.close()
+            self._export_iter = None
+
+        if cancelled:
             show_status_overlay(
-                f"Exported in {elapsed:.1f} sec",
-                progress=1.0,
-                status="complete",
-                title="MVR Export Complete",
+                f"Canceled after {elapsed:.1f} sec",
+                progress=None,
+                status="cancelled",
+                title="MVR Export Canceled",
                 hint="Click overlay to dismiss",
                 auto_hide_after=10.0,
             )
             bpy.ops.dmx.dismiss_status_overlay_modal("INVOKE_DEFAULT")
-            self.report({"INFO"}, "Data exported to: {}".format(self.filepath))
-        else:
+            self.report({"WARNING"}, "MVR export cancelled")
+            return {"CANCELLED"}
+        if not result.ok:
             show_status_overlay(
                 result.error,
                 progress=None,
@@ -346,9 +373,62 @@ class DMX_OT_Export_MVR(Operator, ExportHelper):
             )
             bpy.ops.dmx.dismiss_status_overlay_modal("INVOKE_DEFAULT")
             self.report({"ERROR"}, result.error)
+            return {"CANCELLED"}
 
+        show_status_overlay(
+            f"Exported in {elapsed:.1f} sec",
+            progress=1.0,
+            status="complete",
+            title="MVR Export Complete",
+            hint="Click overlay to dismiss",
+            auto_hide_after=10.0,
+        )
+        bpy.ops.dmx.dismiss_status_overlay_modal("INVOKE_DEFAULT")
+        self.report({"INFO"}, "Data exported to: {}".format(self.filepath))
         return {"FINISHED"}
 
+    def invoke(self, context, event):
+        self._started_at = time.monotonic()
+        if not self.filepath:
+            self.report({"ERROR"}, "No MVR file selected")
+            return {"CANCELLED"}
+
+        show_status_overlay(
+            "Preparing export",
+            progress=0.0,
+            status="running",
+            title="MVR Export In Progress!",
+            hint="Press ESC to cancel the export",
+        )
+        self._export_iter = context.scene.dmx.export_mvr_steps(
+            self.filepath,
+            export_focus_points=self.export_focus_points,
+            selected_fixtures_only=self.selected_fixtures_only,
+            export_fixtures_only=self.export_fixtures_only,
+            export_active_layer_only=self.export_active_layer_only,
+            progress_cb=self._progress_cb,
+        )
+        self._timer = context.window_manager.event_timer_add(
+            0.05, window=context.window
+        )
+        context.window_manager.modal_handler_add(self)
+        return {"RUNNING_MODAL"}
+
+    def modal(self, context, event):
+        if event.type == "ESC":
+            return self._finish(context, cancelled=True)
+
+        if event.type != "TIMER":
+            return {"PASS_THROUGH"}
+
+        try:
+            next(self._export_iter)
+        except StopIteration as stop:
+            self._export_iter = None
+            return self._finish(context, result=stop.value)
+
+        return {"RUNNING_MODAL"}
+
 
 class DMX_OT_Import_MVR_Modal(Operator):
     """Import My Virtual Rig using a modal staged importer"""
@@ -584,6 +664,7 @@ def register():
     bpy.utils.register_class(DMX_OT_Import_MVR_Modal)
     bpy.utils.register_class(DMX_OT_Dismiss_Status_Overlay_Modal)
     bpy.utils.register_class(DMX_OT_Export_MVR)
+    bpy.utils.register_class(DMX_OT_Export_MVR_Modal)
     bpy.types.TOPBAR_MT_file_import.append(menu_func_import)
     bpy.types.TOPBAR_MT_file_export.append(menu_func_export)
     bpy.utils.register_class(DMX_IO_FH_MVR)
@@ -599,3 +680,4 @@ def unregister():
     bpy.utils.unregister_class(DMX_OT_LoadShare_MVR)
     bpy.utils.unregister_class(DMX_OT_SaveShared_MVR)
     bpy.utils.unregister_class(DMX_OT_Export_MVR)
+    bpy.utils.unregister_class(DMX_OT_Export_MVR_Modal)
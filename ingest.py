@@ -0,0 +1,176 @@
+# Copyright (C) 2026 vanous
+#
+# This file is part of BlenderDMX.
+#
+# BlenderDMX is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# BlenderDMX is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>.
+
+import time
+
+import numpy as np
+
+from .data import DMX_Data
+from .logging_setup import DMX_Log
+
+
+# sources not sending for this time (in seconds) are removed from the merge
+SOURCE_TIMEOUT = 2.5
+
+
+class DMX_Ingest_Slot:
+    """Latest received frame of one universe from one source. Written by a single
+    network thread, read by the main thread. The sequence is odd while a frame
+    is being written, a reader seeing it change retries on the next tick."""
+
+    __slots__ = (
+        "sequence",
+        "length",
+        "data",
+        "front",
+        "published",
+        "priority",
+        "received",
+        "modified",
+        "terminated",
+    )
+
+    def __init__(self):
+        self.sequence = 0
+        self.length = 0
+        self.data = bytearray(512)
+        self.front = bytearray(512)  # copy taken by the main thread
+        self.published = 0
+        self.priority = 100
+        self.received = 0.0  # time of the last frame
+        self.modified = 0.0  # time of the last frame with different data, main thread
+        self.terminated = False
+
+    def write(self, data, priority=100, terminated=False):
+        length = min(len(data), 512)
+        self.sequence += 1
+        self.data[:length] = data[:length]
+        self.length = length
+        self.priority = priority
+        self.terminated = terminated
+        self.received = time.monotonic()
+        self.sequence += 1
+
+    def read(self):
+        """Return a view of a new frame, or None if there is none or it is being written"""
+        sequence = self.sequence
+        if sequence == self.published or sequence & 1:
+            return None
+        length = self.length
+        modified = self.front[:length] != self.data[:length]
+        self.front[:length] = self.data[:length]
+        if self.sequence != sequence:
+            return None
+        self.published = sequence
+        if modified:
+            self.modified = self.received
+        return memoryview(self.front)[:length]
+
+
+class DMX_Ingest:
+    """Hands over DMX data from network threads to the main thread.
+    Network threads must not touch bpy data, they only write into the slots."""
+
+    _slots = {}  # (source, universe, origin): DMX_Ingest_Slot
+    _inputs = ()  # input of every universe, snapshot taken on the main thread
+    _online = set()  # sources which received data
+    _status_properties = {"ARTNET": "artnet_status", "sACN": "sacn_status"}
+
+    @staticmethod
+    def update_inputs(universes):
+        """Main thread: take a snapshot of inputs of the universes"""
+        DMX_Ingest._inputs = tuple(universe.input for universe in universes)
+
+    @staticmethod
+    def inputs():
+        return DMX_Ingest._inputs
+
+    @staticmethod
+    def accepts(source, universe):
+        inputs = DMX_Ingest._inputs
+        return 0 <= universe < len(inputs) and inputs[universe] == source
+
+    @staticmethod
+    def is_online(source):
+        return source in DMX_Ingest._online
+
+    @staticmethod
+    def write(source, universe, data, origin=None, priority=100, terminated=False):
+        """Network thread: store the newest frame of the universe. Frames of
+        different origins (senders) of the same universe are merged when published."""
+        key = (source, universe, origin)
+        slot = DMX_Ingest._slots.get(key)
+        if slot is None:
+            slot = DMX_Ingest._slots.setdefault(key, DMX_Ingest_Slot())
+        slot.write(data, priority, terminated)
+        DMX_Ingest._online.add(source)
+
+    @staticmethod
+    def publish(dmx):
+        """Main thread: move new frames into DMX_Data and update the status"""
+        for source in tuple(DMX_Ingest._online):
+            status_property = DMX_Ingest._status_properties[source]
+            if getattr(dmx, status_property) != "online":
+                setattr(dmx, status_property, "online")
+
+        now = time.monotonic()
+        merged = {}  # (source, universe): [changed, slots]
+        for key, slot in tuple(DMX_Ingest._slots.items()):
+            source, universe, origin = key
+            data = slot.read()
+            if origin is None:
+                if data is not None and DMX_Ingest.accepts(source, universe):
+                    DMX_Data.set_universe(universe, data, source)
+                continue
+
+            group = merged.setdefault((source, universe), [False, []])
+            if slot.terminated or now - slot.received > SOURCE_TIMEOUT:
+                DMX_Log.log.info(("Source lost", source, universe, origin))
+                del DMX_Ingest._slots[key]
+                group[0] = True
+                continue
+            if slot.published:
+                group[0] |= data is not None
+                group[1].append(slot)
+
+        for (source, universe), (changed, slots) in merged.items():
+            if changed and slots and DMX_Ingest.accepts(source, universe):
+                data = DMX_Ingest.merge(slots, dmx.sacn_merge_mode)
+                DMX_Data.set_universe(universe, data, source)
+
+    @staticmethod
+    def merge(slots, mode):
+        """Merge frames of sources of one universe. Only sources with the highest
+        priority are used, these are merged by the highest value (HTP) or the
+        source with most recently changed data is used (LTP)."""
+        priority = max(slot.priority for slot in slots)
+        slots = [slot for slot in slots if slot.priority == priority]
+        if len(slots) == 1 or mode == "LTP":
+            slot = max(slots, key=lambda slot: slot.modified)
+            return memoryview(slot.front)[: slot.length]
+        return np.maximum.reduce(
+            [np.frombuffer(slot.front, dtype=np.uint8) for slot in slots]
+        )
+
+    @staticmethod
+    def clear(source):
+        """Main thread: forget data of a stopped source"""
+        DMX_Ingest._online.discard(source)
+        for key in tuple(DMX_Ingest._slots):
+            if key[0] == source:
+                del DMX_Ingest._slots[key]
+        DMX_Log.log.debug(f"Cleared ingest of {source}")
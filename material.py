@@ -43,12 +43,33 @@ SHADER_NODE_COLOR_RAMP = bpy.app.translations.pgettext("ShaderNodeValToRGB")
 SHADER_NODE_NOISE_TEXTURE = bpy.app.translations.pgettext("ShaderNodeTexNoise")
 SHADER_NODE_TEX_IES = bpy.app.translations.pgettext("ShaderNodeTexIES")
 
+# Emitter and gobo materials of fixtures are copies of these templates, copying
+# a material is much faster than building its node tree node by node.
+# The names start with a dot to keep them out of material lists.
+EMITTER_TEMPLATE = ".DMX_Emitter_Template"
+GOBO_TEMPLATE = ".DMX_Gobo_Template"
+
+
+def copy_template_material(name, template_name, build):
+    """New material with given name, copied from the template (built if needed),
+    removes a material of the same name if already present"""
+    if name in bpy.data.materials:
+        bpy.data.materials.remove(bpy.data.materials[name])
+    template = bpy.data.materials.get(template_name)
+    if template is None:
+        template = build(template_name)
+    material = template.copy()
+    material.name = name
+    return material
+
 
 # <get Emitter Material>
 #   Create an emissive material with given name, remove if already present
 def getEmitterMaterial(name):
-    if name in bpy.data.materials:
-        bpy.data.materials.remove(bpy.data.materials[name])
+    return copy_template_material(name, EMITTER_TEMPLATE, build_emitter_material)
+
+
+def build_emitter_material(name):
     material = bpy.data.materials.new(name)
     material.use_nodes = True
     # BUG: Internationalization
@@ -108,13 +129,15 @@ def getVolumeScatterMaterial():
 
 
 def get_gobo_material(name):
+    return copy_template_material(name, GOBO_TEMPLATE, build_gobo_material)
+
+
+def build_gobo_material(name):
     """Material for gobo projection.
     The commented out lines have originally been used
     but there doesn't seem to be difference without them
     keeping them here just in case."""
 
-    if name in bpy.data.materials:
-        bpy.data.materials.remove(bpy.data.materials[name])
     material = bpy.data.materials.new(name)
     material.use_nodes = True
     material.node_tree.nodes.remove(material.node_tree.nodes[PRINCIPLED_BSDF])
@@ -15,15 +15,24 @@
 # You should have received a copy of the GNU General Public License along
 # with this program. If not, see <https://www.gnu.org/licenses/>.
 
+import glob
+import os
 import traceback
 
 import bpy
 
 from .gdtf import DMX_GDTF
+from .gdtf_file import index_module
 from .logging_setup import DMX_Log
 
 
 class DMX_Model:
+    # Built model collections are also saved to a library of .blend files, keyed
+    # by the collection name and the content hash of the profile, and appended
+    # from there when the collection is needed in another file.
+    # Bump the version when buildCollection changes what it builds.
+    LIBRARY_VERSION = 1
+
     #   Return the fixture model collection by profile
     #   If not imported, build the collection from the GDTF profile
     #   This collection is then deep-copied by the Fixture class
@@ -47,7 +56,17 @@ class DMX_Model:
             DMX_Log.log.debug(f"Getting collection from cache: {name}")
             return collections[name]
 
-        # Otherwise, build it from profile
+        library_path = DMX_Model.get_library_path(profile, name)
+        if library_path is not None and os.path.exists(library_path):
+            collection = DMX_Model.load_from_library(library_path, name)
+            if collection is not None:
+                DMX_Log.log.debug(f"Getting collection from library: {name}")
+                return collection
+
+        # Otherwise, build it from profile. The importers select what they
+        # create, so start from an empty selection
+        bpy.ops.object.select_all(action="DESELECT")
+        bpy.context.view_layer.objects.active = None
         try:
             new_collection = DMX_GDTF.buildCollection(
                 profile, dmx_mode, display_beams, add_target, use_high_mesh
@@ -59,4 +78,61 @@ class DMX_Model:
             if name in collections:
                 collections.remove(collections[name])
             return None
+        if library_path is not None:
+            DMX_Model.save_to_library(library_path, new_collection)
         return new_collection
+
+    @staticmethod
+    def get_library_folder():
+        dmx = bpy.context.scene.dmx
+        version = f"{bpy.app.version[0]}.{bpy.app.version[1]}"
+        return os.path.join(
+            dmx.get_addon_path(),
+            "assets",
+            "models",
+            "library",
+            f"{version}-{DMX_Model.LIBRARY_VERSION}",
+        )
+
+    @staticmethod
+    def get_library_path(profile, name):
+        """Library file of the model collection, None for profiles without a file"""
+        if profile.path is None:
+            return None
+        try:
+            content_hash = index_module().file_hash(profile.path)
+        except OSError as e:
+            DMX_Log.log.error(f"Cannot read profile {profile.path}: {e}")
+            return None
+        return os.path.join(
+            DMX_Model.get_library_folder(), f"{name}_{content_hash[:16]}.blend"
+        )
+
+    @staticmethod
+    def load_from_library(path, name):
+        try:
+            with bpy.data.libraries.load(path, link=False) as (data_from, data_to):
+                data_to.collections = [c for c in data_from.collections if c == name]
+        except Exception as e:
+            DMX_Log.log.error(f"Cannot load model library {path}: {e}")
+            return None
+        if not data_to.collections or data_to.collections[0] is None:
+            return None
+        collection = data_to.collections[0]
+        # same as a freshly built collection, not kept in the file without users
+        collection.use_fake_user = False
+        return collection
+
+    @staticmethod
+    def save_to_library(path, collection):
+        folder = os.path.dirname(path)
+        try:
+            os.makedirs(folder, exist_ok=True)
+            # files of previous versions of the profile
+            for stale in glob.glob(os.path.join(folder, f"{collection.name}_*.blend")):
+                os.remove(stale)
+            temp_path = f"{path}.tmp"
+            bpy.data.libraries.write(temp_path, {collection}, fake_user=True)
+            os.replace(temp_path, path)
+        except Exception as e:
+            DMX_Log.log.error(f"Cannot write model library {path}: {e}")
@@ -15,11 +15,7 @@
 # You should have received a copy of the GNU General Public License along
 # with this program. If not, see <https://www.gnu.org/licenses/>.
 
-import hashlib
-import json
 import os
-import re
-import tempfile
 import time
 from pathlib import Path
 from types import SimpleNamespace
@@ -32,8 +28,13 @@ import uuid as py_uuid
 from io_scene_3ds.import_3ds import load_3ds
 from mathutils import Matrix
 
+from .bulk_build import DMX_Bulk_Build
 from .group import FixtureGroup
 from .logging_setup import DMX_Log
+from .mvr_delta import DMX_MVR_Delta
+from .mvr_glb_export import DMX_MVR_GLB_Export
+from .mvr_prefetch import DMX_MVR_Prefetch
+from .mvr_writer import DMX_MVR_Writer
 from .color_utils import xyY2rgbaa
 
 auxData = {}
@@ -42,7 +43,7 @@ direct_fixture_children = []
 MVR_UNIT_SCALE = 0.001
 
 
-def _noop_progress():
+def _noop_progress(progress, message):
     return None
 
 
@@ -886,12 +887,6 @@ def extract_mvr_object(file, mvr_scene, folder, import_globals):
             import_globals.extracted[file] += 1
 
 
-def extract_mvr_textures(mvr_scene, folder):
-    for name in mvr_scene._package.namelist():
-        if name.endswith(".png"):
-            mvr_scene._package.extract(name, folder)
-
-
 def add_mvr_fixture(
     dmx,
     mscale,
@@ -908,12 +903,30 @@ def add_mvr_fixture(
 ):
     """Add fixture to the scene"""
 
-    existing_fixture = None
-    for _fixture in dmx.fixtures:
-        if _fixture.uuid == fixture.uuid:
-            existing_fixture = _fixture
-            DMX_Log.log.info(f"Update existing fixture {fixture.uuid}")
-            break
+    existing_fixture = dmx.findFixtureByUUID(fixture.uuid)
+    null_matrix = pymvr.Matrix([[0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0]])
+    # ensure that fixture is not scaled to 0
+    if fixture.matrix == null_matrix:
+        fixture.matrix = pymvr.Matrix(0)
+    patch_hash, full_hash = DMX_MVR_Delta.fixture_hashes(
+        fixture, focus_points[0] if len(focus_points) else None
+    )
+    if existing_fixture is not None:
+        DMX_Log.log.info(f"Update existing fixture {fixture.uuid}")
+        # a changes-only commit: keep fixtures with an unchanged patch, move them only
+        if (
+            import_globals.delta
+            and existing_fixture.get("mvr_patch_hash") == patch_hash
+        ):
+            if existing_fixture.get("mvr_hash") != full_hash:
+                focus_point = None
+                if import_globals.import_focus_points and len(focus_points):
+                    focus_point = get_matrix(focus_points[0], mscale)
+                existing_fixture.set_mvr_placement(
+                    get_matrix(fixture, mscale), focus_point
+                )
+                existing_fixture["mvr_hash"] = full_hash
+            return
 
     if f"{fixture.gdtf_spec}" in mvr_scene._package.namelist():
         if fixture.gdtf_spec not in import_globals.extracted.keys():
@@ -944,10 +957,6 @@ def add_mvr_fixture(
     connections_xml = serialize_connections_xml(fixture.connections)
     protocols_xml = serialize_protocols_xml(fixture.protocols)
     networks_xml = serialize_addresses_networks_xml(fixture.addresses)
-    null_matrix = pymvr.Matrix([[0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0]])
-    # ensure that fixture is not scaled to 0
-    if fixture.matrix == null_matrix:
-        fixture.matrix = pymvr.Matrix(0)
 
     """Get Focuspoints."""
     focus_point = mscale
@@ -1026,27 +1035,11 @@ def add_mvr_fixture(
                 user_fixture_name=fixture.name,
                 use_high_mesh=import_globals.use_high_mesh,
             )
-            dmx.addFixture(
-                fixture.gdtf_spec,
-                fixture.gdtf_mode or "",
-                addresses,
-                gel_color,
-                True,
-                add_target,
-                position=fixture_matrix,
-                focus_point=focus_point,
-                uuid=fixture.uuid,
-                fixture_id=fixture.fixture_id,
-                custom_id=fixture.custom_id,
-                fixture_id_numeric=fixture.fixture_id_numeric,
-                unit_number=fixture.unit_number,
-                classing=fixture.classing,
-                user_fixture_name=fixture.name,
-                use_high_mesh=import_globals.use_high_mesh,
-            )
         added_fixture = dmx.findFixtureByUUID(fixture.uuid)
 
     if added_fixture:
+        added_fixture["mvr_hash"] = full_hash
+        added_fixture["mvr_patch_hash"] = patch_hash
         added_fixture.mvr_connections_xml = connections_xml
         added_fixture.mvr_protocols_xml = protocols_xml
         added_fixture.mvr_addresses_networks_xml = networks_xml
@@ -1060,18 +1053,9 @@ def add_mvr_fixture(
         )
 
     if fixture_group is not None:
-        if fixture_group.name in dmx.groups:
-            group = dmx.groups[fixture_group.name]
-        else:
-            group = dmx.groups.add()
-            group.name = fixture_group.name
-            group.uuid = fixture_group.uuid
-        if group.dump:
-            dump = json.loads(group.dump)
-        else:
-            dump = []
-        dump.append(fixture.uuid)
-        group.dump = json.dumps(dump)
+        DMX_Bulk_Build.add_to_group(
+            fixture_group.name, fixture_group.uuid, fixture.uuid
+        )
 
         if added_fixture:
             added_fixture["layer_name"] = layer_collection.name
@@ -1153,7 +1137,13 @@ def load_mvr(
         pass
 
 
-def load_mvr_steps(
+def load_mvr_steps(*args, **kwargs):
+    """Steps of the MVR import, see _load_mvr_steps. Fixtures are built in bulk
+    while a step runs, not in between."""
+    return DMX_Bulk_Build().steps(_load_mvr_steps(*args, **kwargs))
+
+
+def _load_mvr_steps(
     dmx,
     file_name,
     import_focus_points,
@@ -1180,6 +1170,7 @@ def load_mvr_steps(
         import_video_screens=import_video_screens,
         use_high_mesh=use_high_mesh,
         should_stop=should_stop,
+        delta=False,
     )
     progress_cb = progress_cb or _noop_progress
     imported_layers = []
@@ -1192,6 +1183,7 @@ def load_mvr_steps(
     view_collect = viewlayer.layer_collection
     layer_collect = view_collect.collection
     mvr_scene = None
+    prefetch = DMX_MVR_Prefetch(file_name)
 
     bpy.context.window_manager.dmx.pause_render = True
 
@@ -1207,16 +1199,36 @@ def load_mvr_steps(
         if _should_stop_import(import_globals):
             return
 
-        progress_cb(0.08, "Parsing MVR package")
-        mvr_scene = pymvr.GeneralSceneDescription(file_name)
-        yield {"progress": 0.08, "message": "Parsing MVR package"}
+        def should_stop():
+            return _should_stop_import(import_globals)
+
+        parse = prefetch.parse()
+        yield from prefetch.wait(
+            [parse], 0.08, "Parsing MVR package", progress_cb, should_stop
+        )
+        if should_stop():
+            return
+        mvr_scene = parse.result()
+        import_globals.delta = DMX_MVR_Delta.is_delta(mvr_scene)
 
         aux_dir = scene_collect.children.get("AUXData")
         dmx = bpy.context.scene.dmx
+        if import_globals.delta and import_fixtures:
+            for uuid in DMX_MVR_Delta.removed_fixtures(mvr_scene):
+                removed_fixture = dmx.findFixtureByUUID(uuid)
+                if removed_fixture is not None:
+                    DMX_Log.log.info(f"Remove fixture {uuid}")
+                    dmx.removeFixture(removed_fixture)
         current_path = dmx.get_addon_path()
         folder_path = os.path.join(current_path, "assets", "profiles")
         media_folder_path = os.path.join(current_path, "assets", "models", "mvr")
-        extract_mvr_textures(mvr_scene, media_folder_path)
+        # unpack profiles, models and textures on worker threads
+        extracting = prefetch.extract(
+            mvr_scene._package.namelist(),
+            folder_path,
+            media_folder_path,
+            profiles=import_fixtures,
+        )
 
         if hasattr(mvr_scene, "scene") and mvr_scene.scene:
             auxdata = mvr_scene.scene.aux_data
@@ -1246,6 +1258,15 @@ def load_mvr_steps(
             new_class.name = "Focus Points"
             new_class.uuid = str(py_uuid.uuid4())
 
+        yield from prefetch.wait(
+            extracting, 0.12, "Unpacking MVR assets", progress_cb, should_stop
+        )
+        if should_stop():
+            return
+        for future in extracting:
+            for name in future.result():
+                import_globals.extracted[name] = 0
+
         progress_cb(0.18, "Preparing symbol definitions")
         yield {"progress": 0.18, "message": "Preparing symbol definitions"}
 
@@ -1320,7 +1341,8 @@ def load_mvr_steps(
 
             layer_class = layer.__class__.__name__
             layer_collection = next(
-                (col for col in data_collect if col.get("UUID") == layer.uuid), False
+                (col for col in data_collect if col.get("UUID") == layer.uuid),
+                False,
             )
             if not layer_collection:
                 layer_collection = data_collect.new(layer.name)
@@ -1436,6 +1458,7 @@ def load_mvr_steps(
         progress_cb(0.96, "Finalizing import")
         yield {"progress": 0.96, "message": "Finalizing import"}
     finally:
+        prefetch.shutdown()
         _reset_import_state(
             viewlayer, mvr_scene=mvr_scene, imported_layers=imported_layers
         )
@@ -1452,8 +1475,47 @@ def export_mvr(
     selected_fixtures_only=False,
     export_fixtures_only=False,
     export_active_layer_only=False,
+    only_changed=None,
 ):
+    steps = export_mvr_steps(
+        dmx,
+        file_name,
+        export_focus_points=export_focus_points,
+        selected_fixtures_only=selected_fixtures_only,
+        export_fixtures_only=export_fixtures_only,
+        export_active_layer_only=export_active_layer_only,
+        only_changed=only_changed,
+    )
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+
+def export_mvr_steps(
+    dmx,
+    file_name,
+    export_focus_points=True,
+    selected_fixtures_only=False,
+    export_fixtures_only=False,
+    export_active_layer_only=False,
+    only_changed=None,
+    *,
+    progress_cb=None,
+):
+    """Export the scene into an MVR file, yield progress steps, return the result"""
+    progress_cb = progress_cb or _noop_progress
     start_time = time.time()
+    # a delta commit carries changed fixtures only, see DMX_MVR_Delta
+    if only_changed is not None:
+        export_fixtures_only = True
+    fixture_hashes = {}
+    removed = []
+    if only_changed is not None:
+        fixture_uuids = {dmx_fixture.uuid for dmx_fixture in dmx.fixtures}
+        removed = [uuid for uuid in only_changed if uuid not in fixture_uuids]
+    changed = len(removed)
     bpy.context.window_manager.dmx.pause_render = (
         True  # this stops the render loop, to prevent slowness and crashes
     )
@@ -1470,11 +1532,15 @@ def export_mvr(
     folder_path = os.path.join(addon_path, "assets", "profiles")
     universe_add = dmx.is_there_universe_zero()
 
+    assets_list = None
     try:
-        assets_list = []
+        # members are packed on a worker thread while the export goes on
+        assets_list = DMX_MVR_Writer(file_name)
         mvr_layers = pymvr.Layers()
         mvr = pymvr.GeneralSceneDescriptionWriter()
-        mvr.serialize_user_data(pymvr.UserData())
+        mvr.serialize_user_data(
+            DMX_MVR_Delta.user_data(only_changed is not None, removed)
+        )
         active_layer_item = None
         if export_active_layer_only:
             if 0 <= dmx.mvr_layer_list_i < len(dmx.mvr_layers):
@@ -1508,93 +1574,6 @@ def export_mvr(
             trans_mtx = rotate[0][:] + rotate[1][:] + rotate[2][:] + translate[:]
             obj["MVR Local Transform"] = trans_mtx
 
-        def export_glb_object(obj, file_path):
-            if obj.type != "MESH":
-                return
-            context = bpy.context
-            selected = list(context.selected_objects)
-            active = context.view_layer.objects.active
-            temp_collection = bpy.data.collections.new(
-                f"DMX_GLTF_TMP_{py_uuid.uuid4()}"
-            )
-            context.scene.collection.children.link(temp_collection)
-            temp_obj = obj.copy()
-            if obj.data is not None:
-                temp_obj.data = obj.data.copy()
-            temp_obj.parent = None
-            temp_obj.matrix_world = obj.matrix_world.copy()
-            temp_collection.objects.link(temp_obj)
-            try:
-                temp_layer = context.view_layer.layer_collection.children.get(
-                    temp_collection.name
-                )
-                if temp_layer is not None:
-                    context.view_layer.active_layer_collection = temp_layer
-                try:
-                    bpy.ops.export_scene.gltf(
-                        filepath=file_path,
-                        export_format="GLB",
-                        use_active_collection=True,
-                    )
-                except TypeError:
-                    bpy.ops.export_scene.gltf(
-                        filepath=file_path,
-                        export_format="GLB",
-                        export_active_collection=True,
-                    )
-            except TypeError:
-                bpy.ops.export_scene.gltf(
-                    filepath=file_path,
-                    export_format="GLB",
-                )
-            finally:
-                try:
-                    temp_collection.objects.unlink(temp_obj)
-                except Exception:
-                    pass
-                try:
-                    if temp_obj.data is not None:
-                        bpy.data.meshes.remove(temp_obj.data)
-                except Exception:
-                    pass
-                try:
-                    bpy.data.objects.remove(temp_obj)
-                except Exception:
-                    pass
-                try:
-                    context.scene.collection.children.unlink(temp_collection)
-                    bpy.data.collections.remove(temp_collection)
-                except Exception:
-                    pass
-                bpy.ops.object.select_all(action="DESELECT")
-                for item in selected:
-                    item.select_set(True)
-                context.view_layer.objects.active = active
-                context.view_layer.update()
-
-        def resolve_geometry_file(obj, temp_dir, used_names):
-            file_name = obj.get("Reference", None)
-            if not file_name and obj.data is not None:
-                file_name = obj.data.get("Reference", None)
-            if file_name:
-                base_name = Path(file_name).stem
-            else:
-                obj_uuid = obj.get("UUID", None)
-                base_name = obj_uuid or obj.name
-            safe_name = re.sub(r"[^A-Za-z0-9._-]+", "_", base_name)
-            if len(safe_name) > 120:
-                name_hash = hashlib.md5(safe_name.encode("utf-8")).hexdigest()[:8]
-                safe_name = f"{safe_name[:111]}_{name_hash}"
-            file_name = f"{safe_name}.glb"
-            if file_name in used_names:
-                used_names[file_name] += 1
-                file_name = f"{safe_name}_{used_names[file_name]}.glb"
-            else:
-                used_names[file_name] = 0
-            file_path = os.path.join(temp_dir, file_name)
-            export_glb_object(obj, file_path)
-            return file_name, file_path
-
         def is_invalid_symbol_uuid(uuid_value):
             return (
                 not uuid_value or uuid_value == "00000000-0000-0000-0000-000000000000"
@@ -1637,14 +1616,16 @@ def export_mvr(
                         continue
                 if obj.type == "MESH":
                     set_local_transform(obj)
-                    file_name, file_path = resolve_geometry_file(
-                        obj, temp_dir, used_names
+                    file_name, file_path = glb_export.resolve(
+                        obj, geometries.geometry3d
                     )
                     if file_name:
                         geometries.geometry3d.append(
                             pymvr.Geometry3D(
                                 file_name=file_name,
-                                matrix=pymvr.Matrix(0),
+                                matrix=pymvr.Matrix(
+                                    matrix_world_to_mvr(obj.matrix_world)
+                                ),
                             )
                         )
                         files_list.append((file_path, file_name))
@@ -1715,14 +1696,16 @@ def export_mvr(
                         return symbol_matrix
                     continue
                 if obj.type == "MESH":
-                    file_name, file_path = resolve_geometry_file(
-                        obj, temp_dir, used_names
+                    file_name, file_path = glb_export.resolve(
+                        obj, geometries.geometry3d
                     )
                     if file_name:
                         geometries.geometry3d.append(
                             pymvr.Geometry3D(
                                 file_name=file_name,
-                                matrix=pymvr.Matrix(0),
+                                matrix=pymvr.Matrix(
+                                    matrix_world_to_mvr(obj.matrix_world)
+                                ),
                             )
                         )
                         files_list.append((file_path, file_name))
@@ -1740,14 +1723,16 @@ def export_mvr(
                     continue
                 if obj.type == "MESH":
                     set_local_transform(obj)
-                    file_name, file_path = resolve_geometry_file(
-                        obj, temp_dir, used_names
+                    file_name, file_path = glb_export.resolve(
+                        obj, child_list.geometry3d
                     )
                     if file_name:
                         child_list.geometry3d.append(
                             pymvr.Geometry3D(
                                 file_name=file_name,
-                                matrix=pymvr.Matrix(0),
+                                matrix=pymvr.Matrix(
+                                    matrix_world_to_mvr(obj.matrix_world)
+                                ),
                             )
                         )
                         files_list.append((file_path, file_name))
@@ -1838,7 +1823,12 @@ def export_mvr(
                 )
             ]
 
-        for dmx_fixture in dmx.fixtures:
+        fixtures_count = max(1, len(dmx.fixtures))
+        for fixture_idx, dmx_fixture in enumerate(dmx.fixtures):
+            if fixture_idx % 50 == 0:
+                progress = 0.05 + 0.25 * fixture_idx / fixtures_count
+                progress_cb(progress, "Exporting fixtures")
+                yield {"progress": progress, "message": "Exporting fixtures"}
             if selected_fixtures_only and not dmx_fixture.is_selected():
                 continue
             fixture_layer_name = dmx_fixture.get("layer_name", "DMX")
@@ -1847,6 +1837,16 @@ def export_mvr(
                 active_layer_item, fixture_layer_uuid, fixture_layer_name
             ):
                 continue
+
+            fixture_object = dmx_fixture.to_mvr_fixture(universe_add=universe_add)
+            focus_point = dmx_fixture.focus_to_mvr_focus_point()
+            _, full_hash = DMX_MVR_Delta.fixture_hashes(fixture_object, focus_point)
+            fixture_hashes[fixture_object.uuid] = full_hash
+            if only_changed is not None:
+                if only_changed.get(fixture_object.uuid) == full_hash:
+                    continue
+            changed += 1
+
             if fixture_layer_uuid is not None:
                 use_layer = next(
                     (l for l in mvr_layers if l.uuid == fixture_layer_uuid), None
@@ -1863,9 +1863,6 @@ def export_mvr(
                     use_layer = get_or_create_layer("DMX", str(py_uuid.uuid4()))
 
             child_list = use_layer.child_list
-
-            fixture_object = dmx_fixture.to_mvr_fixture(universe_add=universe_add)
-            focus_point = dmx_fixture.focus_to_mvr_focus_point()
             if export_focus_points and focus_point is not None and fixture_object.focus:
                 child_list.focus_points.append(focus_point)
             child_list.fixtures.append(fixture_object)
@@ -2111,13 +2108,15 @@ def export_mvr(
                         collection.children.link(obj_collection)
                 if obj.name not in obj_collection.objects:
                     obj_collection.objects.link(obj)
-                file_name, file_path = resolve_geometry_file(obj, temp_dir, used_names)
+                file_name, file_path = glb_export.resolve(obj)
                 if file_name:
                     geometries = pymvr.Geometries(
                         geometry3d=[
                             pymvr.Geometry3D(
                                 file_name=file_name,
-                                matrix=pymvr.Matrix(0),
+                                matrix=pymvr.Matrix(
+                                    matrix_world_to_mvr(obj.matrix_world)
+                                ),
                             )
                         ]
                     )
@@ -2130,11 +2129,18 @@ def export_mvr(
                     )
                     layer.child_list.scene_objects.append(mvr_object)
 
-        with tempfile.TemporaryDirectory(prefix="blenderdmx_mvr_") as temp_dir:
-            used_geometry_names = {}
-            used_symbol_uuids = set()
+        temp_dir = assets_list.temp_dir
+        used_geometry_names = {}
+        used_symbol_uuids = set()
+        glb_export = DMX_MVR_GLB_Export(temp_dir, used_geometry_names)
+        try:
             if not export_fixtures_only:
-                for layer_uuid, layer_name, collection in layer_collections:
+                for collection_idx, (layer_uuid, layer_name, collection) in enumerate(
+                    layer_collections
+                ):
+                    progress = 0.3 + 0.4 * collection_idx / len(layer_collections)
+                    progress_cb(progress, "Exporting scene objects")
+                    yield {"progress": progress, "message": "Exporting scene objects"}
                     layer = get_or_create_layer(
                         layer_name or collection.get("MVR Name", collection.name),
                         layer_uuid or collection.get("UUID", None),
@@ -2156,6 +2162,8 @@ def export_mvr(
 
             aux_collection = bpy.data.collections.get("AUXData")
             if aux_collection:
+                progress_cb(0.7, "Exporting symbols")
+                yield {"progress": 0.7, "message": "Exporting symbols"}
                 for sym_collection in aux_collection.children:
                     if sym_collection.get("MVR Class") == "Symdef":
                         symdef = pymvr.Symdef(
@@ -2170,17 +2178,35 @@ def export_mvr(
                             ),
                         )
                         aux_data.symdefs.append(symdef)
-
-            scene = pymvr.Scene(layers=mvr_layers, aux_data=aux_data)
-            mvr.serialize_scene(scene)
-            mvr.files_list = list(set(assets_list))
-            mvr.write_mvr(file_name)
-            file_size = Path(file_name).stat().st_size
+        finally:
+            glb_export.close()
+
+        scene = pymvr.Scene(layers=mvr_layers, aux_data=aux_data)
+        mvr.serialize_scene(scene)
+        assets_list.write_scene(mvr.xml_root)
+        while not assets_list.wait(0.05):
+            progress = 0.8 + 0.2 * assets_list.progress()
+            progress_cb(progress, "Writing MVR package")
+            yield {"progress": progress, "message": "Writing MVR package"}
+        assets_list.close()
+        file_size = Path(file_name).stat().st_size
 
     except Exception as e:
         traceback.print_exception(e)
         return SimpleNamespace(ok=False, error=str(e))
 
-    bpy.context.window_manager.dmx.pause_render = False  # re-enable render loop
+    finally:
+        if assets_list is not None:
+            assets_list.abort()
+        bpy.context.window_manager.dmx.pause_render = False  # re-enable render loop
+
+    progress_cb(1.0, "Export complete")
+    yield {"progress": 1.0, "message": "Export complete"}
     print("INFO", "MVR scene exported in %.4f sec." % (time.time() - start_time))
-    return SimpleNamespace(ok=True, file_size=file_size)
+    return SimpleNamespace(
+        ok=True,
+        file_size=file_size,
+        fixture_hashes=fixture_hashes,
+        removed=removed,
+        changed=changed,
+    )
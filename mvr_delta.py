@@ -0,0 +1,113 @@
+# Copyright (C) 2026 vanous
+#
+# This file is part of BlenderDMX.
+#
+# BlenderDMX is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# BlenderDMX is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>.
+
+import hashlib
+from xml.etree import ElementTree
+from xml.etree.ElementTree import Element
+
+import pymvr
+
+
+class DMX_MVR_Delta:
+    """Changes-only MVR-xchange commits. Fixtures are compared by UUID and by a
+    hash of their MVR XML: the patch hash leaves out the placement, the full
+    hash also covers the matrix and the focus point. The sharing station keeps
+    the hashes of what it shared last, receivers keep the hashes of what they
+    imported on the fixtures themselves. Fixtures removed since the last share
+    are listed in the marker, as RemovedFixture elements.
+
+    A delta commit is only complete on top of the commits before it, so
+    requests for the latest version are served the last full commit, and a
+    station joining the group makes the next share a full one."""
+
+    PROVIDER = "BlenderDMX"
+    MARKER = "DeltaCommit"  # UserData of a commit holding changed fixtures only
+    REMOVED = "RemovedFixture"
+    _shared = None  # {fixture uuid: full hash} of the shared commits
+
+    @staticmethod
+    def fixture_hashes(mvr_fixture, focus_point=None):
+        """Return (patch hash, full hash) of a pymvr fixture"""
+        element = mvr_fixture.to_xml()
+        full = hashlib.sha1(ElementTree.tostring(element))
+        if focus_point is not None:
+            full.update(ElementTree.tostring(focus_point.to_xml()))
+        matrix = element.find("Matrix")
+        if matrix is not None:
+            element.remove(matrix)
+        patch = hashlib.sha1(ElementTree.tostring(element))
+        return patch.hexdigest(), full.hexdigest()
+
+    @staticmethod
+    def user_data(delta, removed=()):
+        data = []
+        if delta:
+            marker = pymvr.Data(provider=DMX_MVR_Delta.PROVIDER, ver="1")
+            marker.text = DMX_MVR_Delta.MARKER
+            marker.extra_children = [
+                Element(DMX_MVR_Delta.REMOVED, uuid=uuid) for uuid in removed
+            ]
+            data.append(marker)
+        return pymvr.UserData(data=data)
+
+    @staticmethod
+    def marker(mvr_scene):
+        user_data = getattr(mvr_scene, "user_data", None)
+        if user_data is None:
+            return None
+        return next(
+            (
+                data
+                for data in user_data.data
+                if data.provider == DMX_MVR_Delta.PROVIDER
+                and (data.text or "").strip() == DMX_MVR_Delta.MARKER
+            ),
+            None,
+        )
+
+    @staticmethod
+    def is_delta(mvr_scene):
+        return DMX_MVR_Delta.marker(mvr_scene) is not None
+
+    @staticmethod
+    def removed_fixtures(mvr_scene):
+        """UUIDs of fixtures removed by a delta commit"""
+        marker = DMX_MVR_Delta.marker(mvr_scene)
+        if marker is None:
+            return []
+        return [
+            child.get("uuid")
+            for child in marker.extra_children
+            if child.tag == DMX_MVR_Delta.REMOVED and child.get("uuid")
+        ]
+
+    @staticmethod
+    def shared_hashes():
+        """Hashes to diff the next commit against, None before the first share"""
+        return DMX_MVR_Delta._shared
+
+    @staticmethod
+    def remember_shared(hashes, removed=()):
+        if DMX_MVR_Delta._shared is None:
+            DMX_MVR_Delta._shared = {}
+        DMX_MVR_Delta._shared.update(hashes)
+        for uuid in removed:
+            DMX_MVR_Delta._shared.pop(uuid, None)
+
+    @staticmethod
+    def forget_shared():
+        DMX_MVR_Delta._shared = None
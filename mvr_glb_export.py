@@ -0,0 +1,230 @@
+# Copyright (C) 2026 vanous
+#
+# This file is part of BlenderDMX.
+#
+# BlenderDMX is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# BlenderDMX is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>.
+
+import hashlib
+import os
+import re
+import uuid as py_uuid
+from array import array
+from pathlib import Path
+
+import bpy
+from mathutils import Matrix
+
+from .logging_setup import DMX_Log
+
+
+class DMX_MVR_GLB_Export:
+    """GLB files of mesh objects for the MVR export. Meshes are exported in their
+    local space, once per distinct content, the placement of each object goes
+    into the Geometry3D matrix. Identical meshes, like truss segments, share one
+    file. All exports run from one temporary collection, the selection and the
+    active collection are restored once, in close()."""
+
+    # attribute data type: (foreach property, values per element, array typecode)
+    ATTRIBUTE_VALUES = {
+        "FLOAT": ("value", 1, "f"),
+        "INT": ("value", 1, "i"),
+        "INT8": ("value", 1, "i"),
+        "BOOLEAN": ("value", 1, "b"),
+        "FLOAT2": ("vector", 2, "f"),
+        "INT16_2D": ("value", 2, "i"),
+        "INT32_2D": ("value", 2, "i"),
+        "FLOAT_VECTOR": ("vector", 3, "f"),
+        "FLOAT_COLOR": ("color", 4, "f"),
+        "BYTE_COLOR": ("color", 4, "f"),
+        "QUATERNION": ("value", 4, "f"),
+        "FLOAT4X4": ("value", 16, "f"),
+    }
+
+    def __init__(self, temp_dir, used_names):
+        self.temp_dir = temp_dir
+        self.used_names = used_names
+        self.files = {}  # content key: (file name, file path)
+        self.mesh_hashes = {}  # mesh pointer: geometry hash
+        self.collection = None
+        self.context = None
+        self.exported = 0
+        self.reused = 0
+
+    @staticmethod
+    def geometry_hash(mesh):
+        """Hash of the mesh data which ends up in the GLB. Meshes with attribute
+        data which cannot be read are keyed by their datablock, so they are
+        never shared."""
+        digest = hashlib.sha1()
+        for items, attribute, size, typecode in (
+            (mesh.vertices, "co", 3, "f"),
+            (mesh.edges, "vertices", 2, "i"),
+            (mesh.loops, "vertex_index", 1, "i"),
+            (mesh.polygons, "loop_total", 1, "i"),
+            (mesh.polygons, "material_index", 1, "i"),
+            (mesh.polygons, "use_smooth", 1, "b"),
+        ):
+            values = array(typecode, [0]) * (len(items) * size)
+            items.foreach_get(attribute, values)
+            digest.update(values.tobytes())
+        for uv_layer in mesh.uv_layers:
+            values = array("f", [0]) * (len(uv_layer.data) * 2)
+            uv_layer.data.foreach_get("uv", values)
+            digest.update(uv_layer.name.encode("utf-8"))
+            digest.update(values.tobytes())
+        # color attributes and any other custom data, the GLB exporter may
+        # write them as vertex colors or custom attributes
+        for mesh_attribute in mesh.attributes:
+            name = mesh_attribute.name
+            if name.startswith(".") or name == "position" or name in mesh.uv_layers:
+                continue
+            read = DMX_MVR_GLB_Export.ATTRIBUTE_VALUES.get(mesh_attribute.data_type)
+            if read is None:
+                return f"mesh:{mesh.as_pointer()}"
+            attribute, size, typecode = read
+            values = array(typecode, [0]) * (len(mesh_attribute.data) * size)
+            mesh_attribute.data.foreach_get(attribute, values)
+            digest.update(
+                f"{name}:{mesh_attribute.domain}:{mesh_attribute.data_type}".encode(
+                    "utf-8"
+                )
+            )
+            digest.update(values.tobytes())
+        if mesh.has_custom_normals:
+            values = array("f", [0]) * (len(mesh.loops) * 3)
+            mesh.corner_normals.foreach_get("vector", values)
+            digest.update(b"custom_normals")
+            digest.update(values.tobytes())
+        return digest.hexdigest()
+
+    def content_key(self, obj):
+        mesh = obj.data
+        pointer = mesh.as_pointer()
+        geometry_hash = self.mesh_hashes.get(pointer)
+        if geometry_hash is None:
+            geometry_hash = self.geometry_hash(mesh)
+            self.mesh_hashes[pointer] = geometry_hash
+        materials = tuple(
+            slot.material.name if slot.material else "" for slot in obj.material_slots
+        )
+        return geometry_hash, materials
+
+    def file_name(self, obj):
+        file_name = obj.get("Reference", None)
+        if not file_name and obj.data is not None:
+            file_name = obj.data.get("Reference", None)
+        if file_name:
+            base_name = Path(file_name).stem
+        else:
+            obj_uuid = obj.get("UUID", None)
+            base_name = obj_uuid or obj.name
+        safe_name = re.sub(r"[^A-Za-z0-9._-]+", "_", base_name)
+        if len(safe_name) > 120:
+            name_hash = hashlib.md5(safe_name.encode("utf-8")).hexdigest()[:8]
+            safe_name = f"{safe_name[:111]}_{name_hash}"
+        file_name = f"{safe_name}.glb"
+        if file_name in self.used_names:
+            self.used_names[file_name] += 1
+            file_name = f"{safe_name}_{self.used_names[file_name]}.glb"
+        else:
+            self.used_names[file_name] = 0
+        return file_name
+
+    def resolve(self, obj, siblings=()):
+        """Return (file name, file path) of the GLB holding the mesh of obj. The
+        importer adds a file once per MVR object, so a file already used by one
+        of the sibling Geometry3D entries is not shared again."""
+        key = self.content_key(obj)
+        entry = self.files.get(key)
+        if entry is not None and all(g.file_name != entry[0] for g in siblings):
+            self.reused += 1
+            return entry
+        file_name = self.file_name(obj)
+        file_path = os.path.join(self.temp_dir, file_name)
+        self.export(obj, file_path)
+        self.files.setdefault(key, (file_name, file_path))
+        self.exported += 1
+        return file_name, file_path
+
+    def open(self):
+        context = bpy.context
+        self.context = context
+        self.selected = list(context.selected_objects)
+        self.active = context.view_layer.objects.active
+        self.active_layer = context.view_layer.active_layer_collection
+        self.collection = bpy.data.collections.new(f"DMX_GLTF_TMP_{py_uuid.uuid4()}")
+        context.scene.collection.children.link(self.collection)
+        temp_layer = context.view_layer.layer_collection.children.get(
+            self.collection.name
+        )
+        if temp_layer is not None:
+            context.view_layer.active_layer_collection = temp_layer
+
+    def export(self, obj, file_path):
+        if self.collection is None:
+            self.open()
+        temp_obj = obj.copy()
+        temp_obj.parent = None
+        temp_obj.matrix_world = Matrix.Identity(4)
+        self.collection.objects.link(temp_obj)
+        try:
+            try:
+                bpy.ops.export_scene.gltf(
+                    filepath=file_path,
+                    export_format="GLB",
+                    use_active_collection=True,
+                )
+            except TypeError:
+                bpy.ops.export_scene.gltf(
+                    filepath=file_path,
+                    export_format="GLB",
+                    export_active_collection=True,
+                )
+        except TypeError:
+            bpy.ops.export_scene.gltf(
+                filepath=file_path,
+                export_format="GLB",
+            )
+        finally:
+            try:
+                self.collection.objects.unlink(temp_obj)
+            except Exception:
+                pass
+            try:
+                bpy.data.objects.remove(temp_obj)
+            except Exception:
+                pass
+
+    def close(self):
+        if self.collection is None:
+            return
+        context = self.context
+        try:
+            context.scene.collection.children.unlink(self.collection)
+            bpy.data.collections.remove(self.collection)
+        except Exception:
+            pass
+        self.collection = None
+        try:
+            context.view_layer.active_layer_collection = self.active_layer
+        except Exception:
+            pass
+        bpy.ops.object.select_all(action="DESELECT")
+        for item in self.selected:
+            item.select_set(True)
+        context.view_layer.objects.active = self.active
+        context.view_layer.update()
+        DMX_Log.log.info(
+            f"GLB export: {self.exported} files, {self.reused} reused geometries"
+        )
@@ -0,0 +1,95 @@
+# Copyright (C) 2026 vanous
+#
+# This file is part of BlenderDMX.
+#
+# BlenderDMX is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# BlenderDMX is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import pymvr
+
+from .extract_cache import DMX_Extract_Cache
+from .logging_setup import DMX_Log
+
+
+class DMX_MVR_Prefetch:
+    """Parse an MVR file and unpack its GDTF profiles, 3D models and textures on
+    worker threads. The importer keeps yielding progress while it waits, and
+    finds the assets already on disk when it builds the scene.
+
+    Threads, not processes: the parsed scene cannot be pickled, and
+    decompressing and writing the members releases the GIL."""
+
+    WORKERS = min(8, os.cpu_count() or 1)
+    MEDIA_SUFFIXES = {".3ds", ".glb", ".gltf", ".bin", ".png", ".jpg", ".jpeg"}
+
+    def __init__(self, file_name):
+        self.file_name = file_name
+        self.executor = ThreadPoolExecutor(
+            max_workers=DMX_MVR_Prefetch.WORKERS, thread_name_prefix="mvr_prefetch"
+        )
+
+    def parse(self):
+        return self.executor.submit(pymvr.GeneralSceneDescription, self.file_name)
+
+    def extract(self, names, profiles_folder, media_folder, profiles=True):
+        """Unpack members of the package in parallel, return futures of lists of
+        extracted member names"""
+        members = []
+        for name in names:
+            suffix = os.path.splitext(name)[1].lower()
+            if suffix == ".gdtf":
+                if profiles:
+                    members.append((name, profiles_folder))
+            elif suffix in DMX_MVR_Prefetch.MEDIA_SUFFIXES:
+                members.append((name, media_folder))
+        chunks = [
+            members[index :: DMX_MVR_Prefetch.WORKERS]
+            for index in range(DMX_MVR_Prefetch.WORKERS)
+        ]
+        return [
+            self.executor.submit(self._extract_chunk, chunk)
+            for chunk in chunks
+            if chunk
+        ]
+
+    def _extract_chunk(self, members):
+        # every worker reads through its own handle of the archive
+        extracted = []
+        with zipfile.ZipFile(self.file_name) as package:
+            for name, folder in members:
+                try:
+                    DMX_Extract_Cache.extract(package, name, folder)
+                except Exception as e:
+                    # left for the importer, which extracts missing members itself
+                    DMX_Log.log.error(f"Cannot prefetch {name}: {e}")
+                    continue
+                extracted.append(name)
+        return extracted
+
+    @staticmethod
+    def wait(futures, progress, message, progress_cb, should_stop):
+        """Yield import steps until all futures are done"""
+        pending = set(futures)
+        while pending:
+            if should_stop():
+                return
+            progress_cb(progress, message)
+            yield {"progress": progress, "message": message}
+            _, pending = wait(pending, timeout=0.05, return_when=FIRST_COMPLETED)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
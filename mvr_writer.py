@@ -0,0 +1,124 @@
+# Copyright (C) 2026 vanous
+#
+# This file is part of BlenderDMX.
+#
+# BlenderDMX is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# BlenderDMX is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import shutil
+import sys
+import tempfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, wait
+from xml.etree import ElementTree
+
+from .logging_setup import DMX_Log
+
+
+class DMX_MVR_Writer:
+    """Streaming writer of an MVR package. Members are zipped on a worker thread
+    as soon as they are added, while the exporter keeps producing the scene;
+    compressing releases the GIL. Members which are compressed already are
+    stored as they are. The package is written next to the target and moved in
+    place by close(), abort() leaves the target untouched.
+
+    append() takes (file path, member name) tuples, like files_list of
+    pymvr.GeneralSceneDescriptionWriter, and skips repeated members. Files to be
+    packed can be placed into temp_dir, it is removed with the writer."""
+
+    STORED_SUFFIXES = {".gdtf", ".glb", ".png", ".jpg", ".jpeg"}
+    SCENE_MEMBER = "GeneralSceneDescription.xml"
+
+    def __init__(self, path):
+        self.path = path
+        self.part_path = f"{path}.part"
+        self.temp_dir = tempfile.mkdtemp(prefix="blenderdmx_mvr_")
+        self.package = zipfile.ZipFile(self.part_path, "w", zipfile.ZIP_DEFLATED)
+        self.executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="mvr_writer"
+        )
+        self.futures = []
+        self.names = set()
+        self.closed = False
+
+    def append(self, entry):
+        file_path, name = entry
+        if name in self.names:
+            return
+        self.names.add(name)
+        self.futures.append(self.executor.submit(self._write_file, file_path, name))
+
+    def write_scene(self, xml_root):
+        """Add the GeneralSceneDescription.xml, serialized on the worker"""
+        self.futures.append(self.executor.submit(self._write_scene, xml_root))
+
+    def _write_file(self, file_path, name):
+        suffix = os.path.splitext(name)[1].lower()
+        if suffix in DMX_MVR_Writer.STORED_SUFFIXES:
+            compress_type = zipfile.ZIP_STORED
+        else:
+            compress_type = zipfile.ZIP_DEFLATED
+        try:
+            self.package.write(file_path, arcname=name, compress_type=compress_type)
+        except FileNotFoundError:
+            DMX_Log.log.error(f"File does not exist {file_path}")
+
+    def _write_scene(self, xml_root):
+        if sys.version_info >= (3, 9):
+            ElementTree.indent(xml_root, space="    ", level=0)
+        xml = ElementTree.tostring(xml_root, encoding="UTF-8", xml_declaration=True)
+        self.package.writestr(DMX_MVR_Writer.SCENE_MEMBER, xml)
+
+    def progress(self):
+        """Share of the added members already in the package"""
+        if not self.futures:
+            return 1.0
+        done = sum(1 for future in self.futures if future.done())
+        return done / len(self.futures)
+
+    def wait(self, timeout):
+        """Wait for the worker up to timeout seconds, return True when all added
+        members are written"""
+        _, pending = wait(self.futures, timeout=timeout)
+        return not pending
+
+    def close(self):
+        """Finish the package and move it to the target path, raise the first
+        error of the worker"""
+        self.executor.shutdown(wait=True)
+        try:
+            for future in self.futures:
+                future.result()
+            self.package.close()
+            os.replace(self.part_path, self.path)
+        except Exception:
+            self.abort()
+            raise
+        self.closed = True
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def abort(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        try:
+            self.package.close()
+        except Exception:
+            pass
+        try:
+            os.remove(self.part_path)
+        except OSError:
+            pass
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
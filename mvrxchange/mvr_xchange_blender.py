@@ -46,6 +46,10 @@ class DMX_MVR_Xchange_Commit(PropertyGroup):
     timestamp_saved: IntProperty(name=_("Time of saving"), default=0)
     subscribed: BoolProperty(name=_("Subscribed to"))
     self_requested: BoolProperty(name=_("We requested latest file without UUID"))
+    changes_only: BoolProperty(
+        name=_("Changes only"),
+        description=_("Holds changes since the previous commit, not the whole scene"),
+    )
 
 
 class DMX_MVR_Xchange_Client(PropertyGroup):
@@ -193,3 +197,11 @@ class DMX_MVR_Xchange(PropertyGroup):
         description=_("Export fixtures only (skip all non-fixture objects)"),
         default=False,
     )
+
+    share_changes_only: BoolProperty(
+        name=_("Share changes only"),
+        description=_(
+            "Share only fixtures changed since the last shared version, receivers update them in place"
+        ),
+        default=False,
+    )
@@ -52,26 +52,29 @@ class mvrx_message:
         return header
 
     @staticmethod
-    def craft_packet(message=None, length=None, buffer=None, msg_type=0):
+    def craft_header(length, msg_type=0):
+        """Header of a packet, for payloads which are sent separately"""
         MVR_PACKAGE_HEADER = 778682
         MVR_PACKAGE_VERSION = 1
         MVR_PACKAGE_NUMBER = 0
         MVR_PACKAGE_COUNT = 1
-        MVR_PACKAGE_TYPE = msg_type
-        MVR_PAYLOAD_BUFFER = buffer or json.dumps(message).encode("utf-8")
-        MVR_PAYLOAD_LENGTH = length or len(MVR_PAYLOAD_BUFFER)
 
         # Pack entire header in one call (5x uint32 + 1x uint64)
-        header = struct.pack(
+        return struct.pack(
             "!IIIIIQ",
             MVR_PACKAGE_HEADER,
             MVR_PACKAGE_VERSION,
             MVR_PACKAGE_NUMBER,
             MVR_PACKAGE_COUNT,
-            MVR_PACKAGE_TYPE,
-            MVR_PAYLOAD_LENGTH,
+            msg_type,
+            length,
         )
 
+    @staticmethod
+    def craft_packet(message=None, length=None, buffer=None, msg_type=0):
+        MVR_PAYLOAD_BUFFER = buffer or json.dumps(message).encode("utf-8")
+        MVR_PAYLOAD_LENGTH = length or len(MVR_PAYLOAD_BUFFER)
+        header = mvrx_message.craft_header(MVR_PAYLOAD_LENGTH, msg_type)
         return header + MVR_PAYLOAD_BUFFER
 
     join_message_ret = {
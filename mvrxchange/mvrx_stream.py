@@ -0,0 +1,199 @@
+# Copyright (C) 2026 vanous
+#
+# This file is part of BlenderDMX.
+#
+# BlenderDMX is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# BlenderDMX is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>.
+
+import os
+
+from ..logging_setup import DMX_Log
+from .mvrx_message import mvrx_message
+
+HEADER_LEN = 28
+CHUNK_SIZE = 1 << 20
+
+
+class mvrx_transfers:
+    """Progress of running file transfers, {commit uuid: (done bytes, total bytes)}.
+    Written by the network threads, read by the UI."""
+
+    _transfers = {}
+
+    @staticmethod
+    def update(key, done, total):
+        if done >= total:
+            mvrx_transfers.finish(key)
+        else:
+            mvrx_transfers._transfers[key] = (done, total)
+
+    @staticmethod
+    def finish(key):
+        mvrx_transfers._transfers.pop(key, None)
+
+    @staticmethod
+    def progress(key):
+        transfer = mvrx_transfers._transfers.get(key)
+        if transfer is None:
+            return None
+        done, total = transfer
+        return done / total if total else 1.0
+
+
+class mvrx_receiver:
+    """Incremental parser of received MVR-xchange packets. The header is parsed
+    once per packet, JSON payloads are collected in memory and file payloads
+    are written to disk as they arrive."""
+
+    def __init__(self, file_path=None, progress=None):
+        self.file_path = file_path  # callable, path to store an incoming file
+        self.progress = progress  # callable(received bytes, total bytes)
+        self.header = None
+        self.head = bytearray()
+        self.payload = bytearray()
+        self.path = None
+        self.file = None
+        self.received = 0
+
+    def feed(self, data):
+        """Consume received bytes, return completed packets as (header, payload)
+        for JSON messages and (header, file path) for files"""
+        completed = []
+        view = memoryview(data)
+        while len(view):
+            if self.header is None:
+                missing = HEADER_LEN - len(self.head)
+                self.head += view[:missing]
+                view = view[missing:]
+                if len(self.head) < HEADER_LEN:
+                    break
+                header = mvrx_message.parse_header(self.head)
+                self.head = bytearray()
+                if header["Error"]:
+                    DMX_Log.log.error("Invalid MVR-xchange header, dropping data")
+                    break
+                self.start(header)
+            else:
+                remaining = self.header["Data_len"] - self.received
+                part = view[:remaining]
+                view = view[len(part) :]
+                if self.header["Type"] == 0:
+                    self.payload += part
+                elif self.file is not None:
+                    self.file.write(part)
+                self.received += len(part)
+                if self.header["Type"] != 0 and self.progress is not None:
+                    self.progress(self.received, self.header["Data_len"])
+            if self.header is not None and self.received == self.header["Data_len"]:
+                completed.append(self.complete())
+        return completed
+
+    def start(self, header):
+        self.header = header
+        self.received = 0
+        if header["Type"] == 0:
+            return
+        self.path = self.file_path() if self.file_path is not None else None
+        if self.path:
+            self.file = open(f"{self.path}.part", "wb")
+        else:
+            DMX_Log.log.error("No target for the received MVR file, dropping it")
+
+    def complete(self):
+        header = self.header
+        self.header = None
+        if header["Type"] == 0:
+            payload = bytes(self.payload)
+            self.payload = bytearray()
+            return header, payload
+        path = self.path
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+            os.replace(f"{path}.part", path)
+        self.path = None
+        return header, path
+
+    def close(self):
+        """Connection is gone, drop a partially received file"""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+            try:
+                os.remove(f"{self.path}.part")
+            except OSError:
+                pass
+        self.header = None
+
+
+class mvrx_outgoing:
+    """Data queued for a non-blocking socket, sent in parts as the socket
+    accepts it. Files are sent straight from disk after their header."""
+
+    def __init__(self, data=b"", path=None, progress=None, transfer=None):
+        self.view = memoryview(data)
+        self.progress = progress  # callable(sent bytes, total bytes)
+        self.transfer = transfer  # mvrx_transfers key of this file
+        self.sent = 0  # bytes sent so far, header and file
+        self.file = None
+        self.offset = 0
+        self.size = 0
+        if path is not None:
+            self.file = open(path, "rb")
+            self.size = os.fstat(self.file.fileno()).st_size
+
+    @staticmethod
+    def from_file(path, progress=None, transfer=None):
+        size = os.path.getsize(path)
+        header = mvrx_message.craft_header(size, msg_type=1)
+        return mvrx_outgoing(header, path, progress, transfer)
+
+    def send(self, sock, budget=None):
+        """Send as much as the socket takes, or up to budget bytes. Return True
+        when everything was sent."""
+        budget = budget or float("inf")
+        try:
+            while len(self.view) and budget > 0:
+                sent = sock.send(self.view[: int(min(budget, len(self.view)))])
+                self.view = self.view[sent:]
+                self.sent += sent
+                budget -= sent
+            if len(self.view):
+                return False
+            while self.offset < self.size and budget > 0:
+                count = int(min(CHUNK_SIZE, budget, self.size - self.offset))
+                sent = self.send_file(sock, count)
+                if sent == 0:
+                    raise ConnectionError("MVR file was truncated while sending")
+                self.offset += sent
+                self.sent += sent
+                budget -= sent
+                if self.progress is not None:
+                    self.progress(self.offset, self.size)
+        except BlockingIOError:
+            return False
+        if self.offset < self.size:
+            return False
+        self.close()
+        return True
+
+    def send_file(self, sock, count):
+        if hasattr(os, "sendfile"):
+            return os.sendfile(sock.fileno(), self.file.fileno(), self.offset, count)
+        self.file.seek(self.offset)
+        return sock.send(self.file.read(count))
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
@@ -16,9 +16,9 @@
 # with this program. If not, see <https://www.gnu.org/licenses/>.
 
 import json
+import os
 import selectors
 import socket
-import time
 from datetime import datetime
 from queue import Queue
 from threading import Thread
@@ -26,6 +26,7 @@ import bpy
 
 from ..logging_setup import DMX_Log
 from .mvrx_message import mvrx_message
+from .mvrx_stream import CHUNK_SIZE, mvrx_outgoing, mvrx_receiver, mvrx_transfers
 
 
 class client(Thread):
@@ -42,6 +43,7 @@ class client(Thread):
         self.port = port
         self.filepath = ""
         self.commit = ""
+        self.transfer_key = ""
         self.sel = selectors.DefaultSelector()
         self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
@@ -93,6 +95,7 @@ class client(Thread):
     def request_file(self, commit, path):
         self.filepath = path
         self.commit = commit
+        self.transfer_key = commit.commit_uuid
         if commit.self_requested:  # we need to provide empty UUID in this case
             commit_uuid = ""
         else:
@@ -110,6 +113,7 @@ class client(Thread):
 
     def stop(self):
         self.running = False
+        mvrx_transfers.finish(self.transfer_key)
         if self.socket is not None:
             self.sel.close()
             self.socket.close()
@@ -121,68 +125,61 @@ class client(Thread):
         self.sel.modify(self.socket, events)
 
     def run(self):
-        data = b""
+        receiver = mvrx_receiver(
+            file_path=lambda: self.filepath, progress=self.receive_progress
+        )
+        buffer = memoryview(bytearray(CHUNK_SIZE))
+        sending = None
         while self.running:
             events = self.sel.select(timeout=1)
-            if events:
-                for key, mask in events:
-                    sock = key.fileobj
-                    if mask & selectors.EVENT_READ:
+            for key, mask in events:
+                sock = key.fileobj
+                if mask & selectors.EVENT_READ:
+                    try:
+                        received = sock.recv_into(buffer)  # Should be ready to read
+                    except BlockingIOError:
+                        received = None
+                    if received == 0:
+                        receiver.close()
                         try:
-                            recv_data = sock.recv(16384)  # Should be ready to read
-                        except BlockingIOError:
-                            pass
-                        else:
-                            if recv_data:
-                                DMX_Log.log.debug(f"Received {recv_data!r}")
-                                data += recv_data
-                                if data:
-                                    header = mvrx_message.parse_header(data)
-                                    if header["Error"]:
-                                        data = b""
-
-                                    if len(data) >= header["Total_len"]:
-                                        total_len = header["Total_len"]
-                                        DMX_Log.log.debug("go to parsing")
-                                        self.parse_data(data[:total_len], self.callback)
-                                        data = data[total_len:]
-
-                        if not recv_data:
-                            try:
-                                self.disconnect(sock)
-                            except Exception as e:
-                                DMX_Log.log.debug(e)
-                            return
-                            # pass
-
-                    if not self.queue.empty():
-                        if mask & selectors.EVENT_WRITE:
-                            message = self.queue.get()
-                            if message:
-                                sock.sendall(message)
-
-                            if self.queue.empty():
-                                events = selectors.EVENT_READ
-                                self.sel.modify(self.socket, events)
-
-                    if data == b"":
-                        time.sleep(0.2)
-
-    def parse_data(self, data, callback):
-        DMX_Log.log.debug(f"parsing {data}")
-        header = mvrx_message.parse_header(data)
+                            self.disconnect(sock)
+                        except Exception as e:
+                            DMX_Log.log.debug(e)
+                        return
+                    if received:
+                        DMX_Log.log.debug(f"Received {received} bytes")
+                        for header, payload in receiver.feed(buffer[:received]):
+                            DMX_Log.log.debug("go to parsing")
+                            self.parse_data(header, payload, self.callback)
+                            if not self.running:
+                                return
+
+                if mask & selectors.EVENT_WRITE:
+                    if sending is None and not self.queue.empty():
+                        sending = mvrx_outgoing(self.queue.get())
+                    if sending is not None and sending.send(sock):
+                        sending = None
+                    if sending is None and self.queue.empty():
+                        events = selectors.EVENT_READ
+                        self.sel.modify(self.socket, events)
+
+    def receive_progress(self, received, total):
+        mvrx_transfers.update(self.transfer_key, received, total)
+
+    def parse_data(self, header, payload, callback):
+        DMX_Log.log.debug(f"parsing {header}")
         if header["Type"] == 0:  # json
-            json_data = json.loads(data[28:].decode("utf-8"))
+            json_data = json.loads(payload.decode("utf-8"))
             callback(json_data)
-        else:  # file
-            with open(self.filepath, "bw") as f:
-                f.write(data[28:])
-            self.commit.file_size = len(data[28:])
+        elif payload is not None:  # file, already written to self.filepath
+            self.commit.file_size = os.path.getsize(payload)
             callback(
                 {
                     "file_downloaded": self.commit,
                     "StationUUID": self.commit.station_uuid,
                 }
             )
+        else:
+            DMX_Log.log.error("Received a file which was not requested")
         # Automatically close thread after processing response
         self.stop()
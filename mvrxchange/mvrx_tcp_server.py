@@ -21,6 +21,7 @@ import selectors
 import socket
 import time
 import types
+from collections import deque
 from datetime import datetime
 from queue import Queue
 from threading import Thread
@@ -28,11 +29,22 @@ from uuid import uuid4
 import bpy
 
 from ..logging_setup import DMX_Log
+from ..mvr_delta import DMX_MVR_Delta
 from .mvrx_message import mvrx_message
+from .mvrx_stream import CHUNK_SIZE, mvrx_outgoing, mvrx_receiver, mvrx_transfers
 
 
 class server(Thread):
-    """MVR TCP server for incoming connections, it is instanced via blender specific DMX_MVR_X_Server class located in mvrx_protocol.py"""
+    """MVR TCP server for incoming connections, it is instanced via blender specific DMX_MVR_X_Server class located in mvrx_protocol.py
+
+    Non-blocking reactor: every connection has its own queue of outgoing
+    messages and files. Each select round sends at most SEND_BUDGET bytes to
+    every writable peer, so a large file to one station does not stall the
+    others. A connection with QUEUE_LIMIT pending items is not read from until
+    its queue drains, so a peer cannot pile up replies it does not receive."""
+
+    QUEUE_LIMIT = 32
+    SEND_BUDGET = 256 * 1024
 
     def __init__(self, callback, uuid=str(uuid4())):
         Thread.__init__(self, name=f"server {int(datetime.now().timestamp())}")
@@ -67,84 +79,129 @@ class server(Thread):
         self.lsock.setblocking(False)
         self.sel.register(self.lsock, selectors.EVENT_READ, data=None)
         self.files = []
-        self.post_data = Queue()  # TODO: need a queue per service connection
+        self.buffer = memoryview(bytearray(CHUNK_SIZE))
+        self.post_data = Queue()  # broadcasts from other threads
+        # written to from other threads to wake up the select loop
+        self.wake_recv, self.wake_send = socket.socketpair()
+        self.wake_recv.setblocking(False)
+        self.sel.register(self.wake_recv, selectors.EVENT_READ, data=None)
 
     def stop(self):
         self.running = False
-        if self.lsock is not None:
-            self.sel.close()
-            self.lsock.close()
+        self.wake()
         self.join()
 
+    def wake(self):
+        try:
+            self.wake_send.send(b"\0")
+        except OSError:
+            pass
+
     def set_post_data(self, data):
+        """Broadcast a packet to all joined stations"""
         DMX_Log.log.debug("Setting post data")
         self.post_data.put(data)
+        self.wake()
 
     def accept_wrapper(self, sock):
         conn, addr = sock.accept()  # Should be ready to read
         DMX_Log.log.debug(f"Accepted connection from {addr}")
         conn.setblocking(False)
-        data = types.SimpleNamespace(addr=addr, inb=b"", outb=[], file_uuid="")
-        events = selectors.EVENT_READ | selectors.EVENT_WRITE
-        self.sel.register(conn, events, data=data)
+        data = types.SimpleNamespace(
+            addr=addr,
+            receiver=mvrx_receiver(file_path=lambda: self.filepath),
+            outb=deque(),
+            sending=None,
+            paused=False,
+            joined=False,
+            file_uuid="",
+        )
+        self.sel.register(conn, selectors.EVENT_READ, data=data)
+
+    def enqueue(self, data, item):
+        """Queue bytes or an mvrx_outgoing for the connection"""
+        data.outb.append(item)
+        if len(data.outb) >= self.QUEUE_LIMIT:
+            data.paused = True
+
+    def update_events(self, sock, data):
+        """Read unless paused, write while there is something to send"""
+        if data.paused and len(data.outb) < self.QUEUE_LIMIT // 2:
+            data.paused = False
+        events = 0 if data.paused else selectors.EVENT_READ
+        if data.sending is not None or data.outb:
+            events |= selectors.EVENT_WRITE
+        if events and events != self.sel.get_key(sock).events:
+            self.sel.modify(sock, events, data=data)
+
+    def close_connection(self, sock, data):
+        DMX_Log.log.debug(f"Closing connection to {data.addr}")
+        try:
+            self.sel.unregister(sock)
+        except (KeyError, ValueError):
+            return  # already closed
+        sock.close()
+        data.receiver.close()
+        # files which will not be sent anymore must not show progress
+        for item in [data.sending, *data.outb]:
+            if isinstance(item, mvrx_outgoing):
+                item.close()
+                if item.transfer is not None:
+                    mvrx_transfers.finish(item.transfer)
+        data.sending = None
+        data.outb.clear()
+
+    def broadcast(self):
+        while not self.post_data.empty():
+            packet = self.post_data.get()
+            for key in list(self.sel.get_map().values()):
+                if key.data is not None and key.data.joined:
+                    self.enqueue(key.data, packet)
+                    self.update_events(key.fileobj, key.data)
 
     def get_port(self):
         return self.port
 
-    def parse_data(self, data):
-        DMX_Log.log.debug(f"parse data {data}")
-        header = mvrx_message.parse_header(data.inb)
+    def parse_data(self, header, payload, data):
+        DMX_Log.log.debug(f"parse data {header}")
         if header["Type"] == 0:  # json
-            json_data = json.loads(data.inb[28:].decode("utf-8"))
+            json_data = json.loads(payload.decode("utf-8"))
             self.process_json_message(json_data, data)
-        else:  # file
+        elif payload is not None:  # file, already written to self.filepath
             dmx = bpy.context.scene.dmx
-            DMX_Log.log.debug("writing file")
-            with open(self.filepath, "bw") as f:
-                f.write(data.inb[28:])
             dmx.fetched_mvr_downloaded_file(self.commit)
 
     def service_connection(self, key, mask):
         sock = key.fileobj
         data = key.data
         if mask & selectors.EVENT_READ:
-            recv_data = sock.recv(16384)  # Should be ready to read
-            if recv_data:
-                data.inb += recv_data
-                DMX_Log.log.debug(
-                    ("server received", len(data.inb), data.inb, data.addr, "\n")
-                )
-                header = mvrx_message.parse_header(data.inb)
-                DMX_Log.log.debug(f"header {header}")
-                if header["Error"]:
-                    DMX_Log.log.error(f"error {data.inb}")
-                    data.inb = b""
-                elif len(data.inb) >= header["Total_len"]:
-                    total_len = header["Total_len"]
-                    left_over = data.inb[total_len:]
-                    DMX_Log.log.debug(f"go to parsing {left_over}")
-                    data.inb = data.inb[:total_len]
-                    self.parse_data(data)
-                    data.inb = left_over
+            received = sock.recv_into(self.buffer)  # Should be ready to read
+            if received:
+                DMX_Log.log.debug(("server received", received, data.addr, "\n"))
+                for header, payload in data.receiver.feed(self.buffer[:received]):
+                    DMX_Log.log.debug(f"header {header}")
+                    self.parse_data(header, payload, data)
             else:
-                DMX_Log.log.debug(f"Closing connection to {data.addr}")
-                self.sel.unregister(sock)
-                sock.close()
+                self.close_connection(sock, data)
+                return
         if mask & selectors.EVENT_WRITE:
-            if len(data.outb):
-                msg = data.outb.pop(0)
-                DMX_Log.log.debug(
-                    "send msg" + str(msg)
-                )  # strange, but logger didn't want to convert it via f-strings
-                header = mvrx_message.parse_header(msg)
-                if not header["Error"]:
-                    DMX_Log.log.debug("Reply" + str(msg))  # same here
-                try:
-                    sock.sendall(msg)  # Should be ready to write
-                except Exception as e:
-                    print("INFO", e)
-                # sent = sock.send(data.outb)  # Should be ready to write
-                # data.outb = data.outb[sent:]
+            budget = self.SEND_BUDGET
+            while budget > 0:
+                if data.sending is None:
+                    if not data.outb:
+                        break
+                    msg = data.outb.popleft()
+                    if not isinstance(msg, mvrx_outgoing):
+                        DMX_Log.log.debug("send msg" + str(msg))
+                        msg = mvrx_outgoing(msg)
+                    data.sending = msg
+                sent_before = data.sending.sent
+                done = data.sending.send(sock, budget)
+                budget -= data.sending.sent - sent_before
+                if not done:
+                    break  # socket is full or the budget is used up
+                data.sending = None
+        self.update_events(sock, data)
 
     def process_json_message(self, json_data, data):
         DMX_Log.log.debug(f"Json message {json_data} {data}")
@@ -161,38 +218,45 @@ class server(Thread):
                 commit_template["FileName"] = f"{file_name}.mvr"
                 commit_template["Comment"] = commit.comment
                 commits.append(commit_template)
-            data.outb.append(
+            self.enqueue(
+                data,
                 mvrx_message.craft_packet(
                     mvrx_message.create_message(
                         "MVR_JOIN_RET", commits=commits, uuid=self.uuid
                     )
-                )
+                ),
             )
 
+            data.joined = True
             dmx.toggle_join_MVR_Client(json_data["StationUUID"], True)
+            # the new station has none of our scene, share it whole next time
+            DMX_MVR_Delta.forget_shared()
             # NOTE: this is sending the JOIN/LEAVE 2x, because the subscribe
             # event will trigger client side sending
 
         if json_data["Type"] == "MVR_LEAVE":
             dmx = bpy.context.scene.dmx
-            data.outb.append(
+            self.enqueue(
+                data,
                 mvrx_message.craft_packet(
                     mvrx_message.create_message("MVR_LEAVE_RET", uuid=self.uuid)
-                )
+                ),
             )
             station_uuid = json_data.get("StationUUID") or json_data.get(
                 "FromStationUUID"
             )
+            data.joined = False
             if station_uuid:
                 dmx.toggle_join_MVR_Client(station_uuid, False)
             # NOTE: this is sending the JOIN/LEAVE 2x, because the subscribe
             # event will trigger client side sending
 
         if json_data["Type"] == "MVR_COMMIT":
-            data.outb.append(
+            self.enqueue(
+                data,
                 mvrx_message.craft_packet(
                     mvrx_message.create_message("MVR_COMMIT_RET", uuid=self.uuid)
-                )
+                ),
             )
         if json_data["Type"] == "MVR_REQUEST":
             dmx = bpy.context.scene.dmx
@@ -201,8 +265,16 @@ class server(Thread):
                 shared_commits = (
                     bpy.context.window_manager.dmx.mvr_xchange.shared_commits
                 )
-                if len(shared_commits):
-                    last_commit = shared_commits[-1]
+                # a changes-only commit is incomplete on its own
+                last_commit = next(
+                    (
+                        commit
+                        for commit in reversed(shared_commits)
+                        if not commit.changes_only
+                    ),
+                    None,
+                )
+                if last_commit is not None:
                     file_uuid = last_commit.commit_uuid
                     DMX_Log.log.debug("Sharing last version")
 
@@ -214,44 +286,57 @@ class server(Thread):
             DMX_Log.log.debug("sending file")
             if not os.path.exists(file_path):
                 DMX_Log.log.error("MVR file for sending via MVR-xchange does not exist")
-                data.outb.append(
+                self.enqueue(
+                    data,
                     mvrx_message.craft_packet(
                         mvrx_message.create_message(
                             "MVR_REQUEST_RET",
                             ok=False,
                             nok_reason="Requested file does not exist",
                         )
-                    )
+                    ),
                 )
                 return
 
-            file_size = os.path.getsize(file_path)
-            file_object = open(file_path, "br")
-            buffer = file_object.read(16384)
-            data.outb.append(mvrx_message.craft_packet(None, file_size, buffer, 1))
-            buffer = file_object.read(16384)
-            while buffer:
-                data.outb.append(buffer)
-                buffer = file_object.read(16384)
-            file_object.close()
+            # header first, the file is sent straight from disk
+            self.enqueue(
+                data,
+                mvrx_outgoing.from_file(
+                    file_path,
+                    progress=lambda sent, total: mvrx_transfers.update(
+                        (file_uuid, data.addr), sent, total
+                    ),
+                    transfer=(file_uuid, data.addr),
+                ),
+            )
 
         self.callback(json_data, data)
 
     def run(self):
-        data_to_send = None
         while self.running:
             events = self.sel.select(timeout=1)
-            if not self.post_data.empty():
-                data_to_send = self.post_data.get()
             for key, mask in events:
-                if key.data is None:
+                if key.fileobj is self.wake_recv:
+                    try:
+                        self.wake_recv.recv(1024)
+                    except BlockingIOError:
+                        pass
+                elif key.data is None:
                     self.accept_wrapper(key.fileobj)
                 else:
-                    if data_to_send is not None:
-                        key.data.outb.append(data_to_send)
                     try:
                         self.service_connection(key, mask)
+                    except OSError as e:
+                        print("INFO", e)
+                        self.close_connection(key.fileobj, key.data)
                     except Exception as e:
                         print("INFO", e)
-            data_to_send = None
-        # self.sel.close()
+            self.broadcast()
+
+        for key in list(self.sel.get_map().values()):
+            if key.data is not None:
+                self.close_connection(key.fileobj, key.data)
+        self.sel.close()
+        self.lsock.close()
+        self.wake_recv.close()
+        self.wake_send.close()
@@ -22,6 +22,7 @@ from bpy.props import StringProperty
 from bpy.types import Operator, Panel
 
 from ..i18n import DMX_Lang
+from ..selection import DMX_Selection
 
 _ = DMX_Lang._
 
@@ -34,6 +35,7 @@ class DMX_OP_AlignLocationOperator(Operator):
 
     axis: StringProperty(name="axis")
 
+    @DMX_Selection.batched
     def execute(self, context):
         axis = {"x": 0, "y": 1, "z": 2}[self.axis]
 
@@ -45,7 +47,7 @@ class DMX_OP_AlignLocationOperator(Operator):
         selected_fixtures_objects = []
         for fixture in dmx.fixtures:
             for obj in fixture.collection.objects:
-                if obj in bpy.context.selected_objects:
+                if DMX_Selection.is_selected(obj):
                     if obj == bpy.context.active_object:
                         continue
                     selected_fixtures_objects.append(obj)
@@ -69,6 +71,7 @@ class DMX_OP_DistributeEvenlyOperator(Operator):
 
     axis: StringProperty(name="axis")
 
+    @DMX_Selection.batched
     def execute(self, context):
         axis = {"x": 0, "y": 1, "z": 2}[self.axis]
 
@@ -79,7 +82,7 @@ class DMX_OP_DistributeEvenlyOperator(Operator):
         selected_fixtures_objects = []
         for fixture in dmx.fixtures:
             for obj in fixture.collection.objects:
-                if obj in bpy.context.selected_objects:
+                if DMX_Selection.is_selected(obj):
                     if obj == bpy.context.active_object:
                         continue
                     selected_fixtures_objects.append(obj)
@@ -114,6 +117,7 @@ class DMX_OP_DistributeWithGapOperator(Operator):
 
     axis: StringProperty(name="axis")
 
+    @DMX_Selection.batched
     def execute(self, context):
         axis = {"x": 0, "y": 1, "z": 2}[self.axis]
         gap = bpy.context.window_manager.dmx.dist_gap
@@ -125,7 +129,7 @@ class DMX_OP_DistributeWithGapOperator(Operator):
         selected_fixtures_objects = []
         for fixture in dmx.sortedFixtures():
             for obj in fixture.collection.objects:
-                if obj in bpy.context.selected_objects:
+                if DMX_Selection.is_selected(obj):
                     if obj == bpy.context.active_object:
                         continue
                     selected_fixtures_objects.append(obj)
@@ -160,6 +164,7 @@ class DMX_OP_DistributeCircle(Operator):
             for x in range(0, n + 1)
         ]
 
+    @DMX_Selection.batched
     def execute(self, context):
         dmx = context.scene.dmx
         diameter = bpy.context.window_manager.dmx.dist_diameter
@@ -173,7 +178,7 @@ class DMX_OP_DistributeCircle(Operator):
 
         for fixture in dmx.sortedFixtures():
             for obj in fixture.collection.objects:
-                if obj in bpy.context.selected_objects:
+                if DMX_Selection.is_selected(obj):
                     if obj == bpy.context.active_object:
                         continue
                     selected_fixtures_objects.append(obj)
@@ -222,7 +227,7 @@ class DMX_PT_AlignAndDistributePanel(Panel):
         selected_fixtures = []
         for fixture in dmx.fixtures:
             for obj in fixture.collection.objects:
-                if obj in bpy.context.selected_objects:
+                if DMX_Selection.is_selected(obj):
                     selected_fixtures.append(fixture)
                     break
 
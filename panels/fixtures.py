@@ -25,9 +25,11 @@ from itertools import zip_longest
 from types import SimpleNamespace
 
 from ..fixture import DMX_Break
+from ..fixture_index import DMX_Fixture_Index
 from ..gdtf_file import DMX_GDTF_File
 from ..i18n import DMX_Lang
 from ..logging_setup import DMX_Log
+from ..selection import DMX_Selection
 from bpy.props import CollectionProperty
 
 _ = DMX_Lang._
@@ -48,18 +50,7 @@ class DMX_MT_Fixture(Menu):
         row = layout.row()
         row.operator("dmx.add_fixture", text=_("Add"), icon="ADD")
 
-        selected = False
-        for fixture in dmx.fixtures:
-            if not hasattr(fixture, "collection"):
-                continue
-            if not hasattr(fixture.collection, "objects"):
-                continue
-            for obj in fixture.collection.objects:
-                if obj in bpy.context.selected_objects:
-                    selected = True
-                    break
-            if selected:
-                break
+        selected = len(DMX_Selection.fixtures(dmx)) > 0
 
         # "Edit"
         row = layout.row()
@@ -1061,33 +1052,16 @@ class DMX_UL_Fixtures(UIList):
 
         if dmx.column_fixture_footprint:
             overlapping = False
-            item_channels = set(
-                range(
-                    item.dmx_breaks[0].address,
-                    item.dmx_breaks[0].address + item.dmx_breaks[0].channels_count,
+            for address in range(
+                item_dmx_break.address,
+                item_dmx_break.address + item_dmx_break.channels_count,
+            ):
+                names = DMX_Fixture_Index.by_address(
+                    dmx.fixtures, item_dmx_break.universe, address
                 )
-            )
-            for fixture in dmx.fixtures:
-                fixture_dmx_break = fixture.dmx_breaks[
-                    0
-                ]  # just get the first break for now
-                if overlapping:
+                if len(names) > 1 or (names and item.name not in names):
+                    overlapping = True
                     break
-                if fixture.name == item.name:  # TODO user_fixture_name
-                    continue
-                if fixture_dmx_break.universe == item_dmx_break.universe:
-                    channels = set(
-                        range(
-                            fixture_dmx_break.address,
-                            fixture_dmx_break.address
-                            + fixture_dmx_break.channels_count,
-                        )
-                    )
-                    if not item_channels.isdisjoint(
-                        channels
-                    ):  # should be fastest way of checking https://stackoverflow.com/a/17735466/2949947
-                        overlapping = True
-                        break
 
             c = layout.column()
             c.ui_units_x = 2
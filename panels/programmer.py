@@ -21,6 +21,7 @@ from bpy.types import Menu, Operator, Panel
 
 from ..i18n import DMX_Lang
 from ..osc_utils import DMX_OSC_Handlers
+from ..selection import DMX_Selection
 
 _ = DMX_Lang._
 # Operators #
@@ -46,19 +47,8 @@ class DMX_OT_Programmer_Set_Ignore_Movement(Operator):
 
     def execute(self, context):
         dmx = context.scene.dmx
-        selected = []
-        for fixture in dmx.fixtures:
-            if not hasattr(fixture, "collection"):
-                continue
-            if not hasattr(fixture.collection, "objects"):
-                continue
-            for obj in fixture.collection.objects:
-                if obj in bpy.context.selected_objects:
-                    selected.append(fixture)
-
-        for fixture in dmx.fixtures:
-            if fixture in selected:
-                fixture.ignore_movement_dmx = True
+        for fixture in DMX_Selection.fixtures(dmx):
+            fixture.ignore_movement_dmx = True
         return {"FINISHED"}
 
 
@@ -70,15 +60,8 @@ class DMX_OT_Programmer_Unset_Ignore_Movement(Operator):
 
     def execute(self, context):
         dmx = context.scene.dmx
-        selected = []
-        for fixture in dmx.fixtures:
-            for obj in fixture.collection.objects:
-                if obj in bpy.context.selected_objects:
-                    selected.append(fixture)
-
-        for fixture in dmx.fixtures:
-            if fixture in selected:
-                fixture.ignore_movement_dmx = False
+        for fixture in DMX_Selection.fixtures(dmx):
+            fixture.ignore_movement_dmx = False
         return {"FINISHED"}
 
 
@@ -90,15 +73,8 @@ class DMX_OT_Programmer_Set_Track_Target(Operator):
 
     def execute(self, context):
         dmx = context.scene.dmx
-        selected = []
-        for fixture in dmx.fixtures:
-            for obj in fixture.collection.objects:
-                if obj in bpy.context.selected_objects:
-                    selected.append(fixture)
-
-        for fixture in dmx.fixtures:
-            if fixture in selected:
-                fixture.use_target = True
+        for fixture in DMX_Selection.fixtures(dmx):
+            fixture.use_target = True
         return {"FINISHED"}
 
 
@@ -110,15 +86,8 @@ class DMX_OT_Programmer_Unset_Track_Target(Operator):
 
     def execute(self, context):
         dmx = context.scene.dmx
-        selected = []
-        for fixture in dmx.fixtures:
-            for obj in fixture.collection.objects:
-                if obj in bpy.context.selected_objects:
-                    selected.append(fixture)
-
-        for fixture in dmx.fixtures:
-            if fixture in selected:
-                fixture.use_target = False
+        for fixture in DMX_Selection.fixtures(dmx):
+            fixture.use_target = False
         return {"FINISHED"}
 
 
@@ -130,15 +99,8 @@ class DMX_OT_Programmer_Set_Use_Physical(Operator):
 
     def execute(self, context):
         dmx = context.scene.dmx
-        selected = []
-        for fixture in dmx.fixtures:
-            for obj in fixture.collection.objects:
-                if obj in bpy.context.selected_objects:
-                    selected.append(fixture)
-
-        for fixture in dmx.fixtures:
-            if fixture in selected:
-                fixture.use_fixtures_channel_functions = True
+        for fixture in DMX_Selection.fixtures(dmx):
+            fixture.use_fixtures_channel_functions = True
         return {"FINISHED"}
 
 
@@ -150,15 +112,8 @@ class DMX_OT_Programmer_Unset_Use_Physical(Operator):
 
     def execute(self, context):
         dmx = context.scene.dmx
-        selected = []
-        for fixture in dmx.fixtures:
-            for obj in fixture.collection.objects:
-                if obj in bpy.context.selected_objects:
-                    selected.append(fixture)
-
-        for fixture in dmx.fixtures:
-            if fixture in selected:
-                fixture.use_fixtures_channel_functions = False
+        for fixture in DMX_Selection.fixtures(dmx):
+            fixture.use_fixtures_channel_functions = False
         return {"FINISHED"}
 
 
@@ -182,11 +137,11 @@ class DMX_OT_Programmer_SelectAll(Operator):
     bl_description = _("Select every fixture in the Scene")
     bl_options = {"UNDO"}
 
+    @DMX_Selection.batched
     def execute(self, context):
         dmx = context.scene.dmx
         for fixture in dmx.fixtures:
             fixture.select()
-        bpy.context.scene.dmx.updatePreviewVolume()
         return {"FINISHED"}
 
 
@@ -196,12 +151,12 @@ class DMX_OT_Programmer_SelectFiltered(Operator):
     bl_description = _("Select every fixture which is visible in the fixtures list")
     bl_options = {"UNDO"}
 
+    @DMX_Selection.batched
     def execute(self, context):
         dmx = context.scene.dmx
         for fixture, enabled in zip(dmx.fixtures, dmx.fixtures_filter):
             if enabled:
                 fixture.select()
-        bpy.context.scene.dmx.updatePreviewVolume()
         return {"FINISHED"}
 
 
@@ -211,20 +166,15 @@ class DMX_OT_Programmer_SelectInvert(Operator):
     bl_description = _("Invert the selection")
     bl_options = {"UNDO"}
 
+    @DMX_Selection.batched
     def execute(self, context):
         dmx = context.scene.dmx
-        selected = []
+        selected = {fixture.name for fixture in DMX_Selection.fixtures(dmx)}
         for fixture in dmx.fixtures:
-            for obj in fixture.collection.objects:
-                if obj in bpy.context.selected_objects:
-                    selected.append(fixture)
-                    fixture.unselect()
-
-        for fixture in dmx.fixtures:
-            if fixture not in selected:
+            if fixture.name in selected:
+                fixture.unselect()
+            else:
                 fixture.select()
-
-        bpy.context.scene.dmx.updatePreviewVolume()
         return {"FINISHED"}
 
 
@@ -234,14 +184,14 @@ class DMX_OT_Programmer_SelectEveryOther(Operator):
     bl_description = _("Select every other light")
     bl_options = {"UNDO"}
 
+    @DMX_Selection.batched
     def execute(self, context):
         bpy.ops.object.select_all(action="DESELECT")
+        DMX_Selection.reset()
         dmx = context.scene.dmx
         for idx, fixture in enumerate(dmx.fixtures):
             if idx % 2 == 0:
                 fixture.select()
-
-        bpy.context.scene.dmx.updatePreviewVolume()
         return {"FINISHED"}
 
 
@@ -254,19 +204,9 @@ class DMX_OT_Programmer_Clear(Operator):
     def execute(self, context):
         scene = context.scene
         dmx = context.scene.dmx
-        selected_fixtures = False
-        for fixture in dmx.fixtures:
-            if fixture.is_selected():
-                selected_fixtures = True
-                break
-
-        if not selected_fixtures:
-            for fixture in dmx.fixtures:
-                fixture.clear()
-        else:
-            for fixture in dmx.fixtures:
-                if fixture.is_selected():
-                    fixture.clear()
+        selected = dmx.selectedFixtures()
+        for fixture in selected or dmx.fixtures:
+            fixture.clear()
 
         scene.dmx.syncProgrammer()
         return {"FINISHED"}
@@ -296,15 +236,9 @@ class DMX_OT_Programmer_TargetsToZero(Operator):
     def execute(self, context):
         dmx = context.scene.dmx
         select_targets(dmx)
-        for fixture in dmx.fixtures:
-            for obj in fixture.collection.objects:
-                if obj.get("geometry_root", False):
-                    break
-            for obj in fixture.collection.objects:
-                if obj in bpy.context.selected_objects:
-                    if "Target" in fixture.objects:
-                        fixture.objects["Target"].object.location = (0, 0, 0)
-                    break
+        for fixture in DMX_Selection.fixtures(dmx):
+            if "Target" in fixture.objects:
+                fixture.objects["Target"].object.location = (0, 0, 0)
 
         return {"FINISHED"}
 
@@ -354,55 +288,53 @@ class DMX_OT_Programmer_ResetTargets(Operator):
         select_targets(dmx)
         axis = self.axis
 
-        for fixture in dmx.fixtures:
+        for fixture in DMX_Selection.fixtures(dmx):
+            body = None
             for obj in fixture.collection.objects:
                 if obj.get("geometry_root", False):
                     body = obj
                     break
-            for obj in fixture.collection.objects:
-                if obj in bpy.context.selected_objects:
-                    if "Target" in fixture.objects:
-                        if body is not None:
-                            x = body.location[0]
-                            y = body.location[1]
-                            z = body.location[2]
-                            if axis == "-x":
-                                fixture.objects["Target"].object.location = (
-                                    x - 2,
-                                    y,
-                                    z,
-                                )
-                            if axis == "-y":
-                                fixture.objects["Target"].object.location = (
-                                    x,
-                                    y - 2,
-                                    z,
-                                )
-                            if axis == "-z":
-                                fixture.objects["Target"].object.location = (
-                                    x,
-                                    y,
-                                    z - 2,
-                                )
-                            if axis == "x":
-                                fixture.objects["Target"].object.location = (
-                                    x + 2,
-                                    y,
-                                    z,
-                                )
-                            if axis == "y":
-                                fixture.objects["Target"].object.location = (
-                                    x,
-                                    y + 2,
-                                    z,
-                                )
-                            if axis == "z":
-                                fixture.objects["Target"].object.location = (
-                                    x,
-                                    y,
-                                    z + 2,
-                                )
-                    break
+            if "Target" in fixture.objects:
+                if body is not None:
+                    x = body.location[0]
+                    y = body.location[1]
+                    z = body.location[2]
+                    if axis == "-x":
+                        fixture.objects["Target"].object.location = (
+                            x - 2,
+                            y,
+                            z,
+                        )
+                    if axis == "-y":
+                        fixture.objects["Target"].object.location = (
+                            x,
+                            y - 2,
+                            z,
+                        )
+                    if axis == "-z":
+                        fixture.objects["Target"].object.location = (
+                            x,
+                            y,
+                            z - 2,
+                        )
+                    if axis == "x":
+                        fixture.objects["Target"].object.location = (
+                            x + 2,
+                            y,
+                            z,
+                        )
+                    if axis == "y":
+                        fixture.objects["Target"].object.location = (
+                            x,
+                            y + 2,
+                            z,
+                        )
+                    if axis == "z":
+                        fixture.objects["Target"].object.location = (
+                            x,
+                            y,
+                            z + 2,
+                        )
 
         return {"FINISHED"}
 
@@ -416,13 +348,10 @@ class DMX_OT_Programmer_SelectBodies(Operator):
     def execute(self, context):
         dmx = context.scene.dmx
         bodies = []
-        for fixture in dmx.fixtures:
-            for obj in fixture.collection.objects:
-                if obj in bpy.context.selected_objects:
-                    for body in fixture.collection.objects:
-                        if body.get("geometry_root", False):
-                            bodies.append(body)
-                    break
+        for fixture in DMX_Selection.fixtures(dmx):
+            for body in fixture.collection.objects:
+                if body.get("geometry_root", False):
+                    bodies.append(body)
 
         if len(bodies):
             bpy.ops.object.select_all(action="DESELECT")
@@ -461,18 +390,16 @@ class DMX_OT_Programmer_SelectCamera(Operator):
             ),
             None,
         )
-        for fixture in dmx.fixtures:
+        for fixture in DMX_Selection.fixtures(dmx):
             for obj in fixture.collection.objects:
-                if obj in bpy.context.selected_objects:
-                    for obj in fixture.collection.objects:
-                        if "MediaCamera" in obj.name:
-                            bpy.context.scene.camera = obj
-                            if region:
-                                if region.view_perspective == "CAMERA":
-                                    region.view_perspective = "PERSP"
-                                else:
-                                    region.view_perspective = "CAMERA"
-                            break
+                if "MediaCamera" in obj.name:
+                    bpy.context.scene.camera = obj
+                    if region:
+                        if region.view_perspective == "CAMERA":
+                            region.view_perspective = "PERSP"
+                        else:
+                            region.view_perspective = "CAMERA"
+                    break
         return {"FINISHED"}
 
 
@@ -493,19 +420,8 @@ class DMX_PT_Programmer(Panel):
         dmx = scene.dmx
         temp_data = bpy.context.window_manager.dmx
 
-        locked = False
-        selected_fixtures = []
-        for fixture in dmx.fixtures:
-            if not hasattr(fixture, "collection"):
-                continue
-            if not hasattr(fixture.collection, "objects"):
-                continue
-            for obj in fixture.collection.objects:
-                if obj in bpy.context.selected_objects:
-                    selected_fixtures.append(fixture)
-                    if fixture.ignore_movement_dmx is True:
-                        locked = True
-                    break
+        selected_fixtures = DMX_Selection.fixtures(dmx)
+        locked = any(fixture.ignore_movement_dmx for fixture in selected_fixtures)
 
         selected = len(selected_fixtures) > 0
 
@@ -955,12 +871,9 @@ class DMX_PT_Programmer(Panel):
 
 def select_targets(dmx):
     targets = []
-    for fixture in dmx.fixtures:
-        for obj in fixture.collection.objects:
-            if obj in bpy.context.selected_objects:
-                if "Target" in fixture.objects:
-                    targets.append(fixture.objects["Target"].object)
-                break
+    for fixture in DMX_Selection.fixtures(dmx):
+        if "Target" in fixture.objects:
+            targets.append(fixture.objects["Target"].object)
 
     if len(targets):
         bpy.ops.object.select_all(action="DESELECT")
@@ -28,9 +28,11 @@ from bpy.types import Operator, Panel, UIList
 
 from ...i18n import DMX_Lang
 from ...logging_setup import DMX_Log
+from ...mvr_delta import DMX_MVR_Delta
 from ...mvrx_protocol import DMX_MVR_X_Client, DMX_MVR_X_WS_Client
 from ...util import sizeof_fmt
 from ...mvrxchange.mvrx_message import defined_station_name
+from ...mvrxchange.mvrx_stream import mvrx_transfers
 
 _ = DMX_Lang._
 
@@ -148,19 +150,31 @@ class DMX_OP_MVR_X_Export(Operator):
         ADDON_PATH = dmx.get_addon_path()
         uuid = str(py_uuid.uuid4()).upper()
         path = os.path.join(ADDON_PATH, "assets", "mvrs", f"{uuid}.mvr")
+        only_changed = None
+        if mvr_x.share_changes_only:
+            only_changed = DMX_MVR_Delta.shared_hashes()
         result = dmx.export_mvr(
             path,
             export_focus_points=mvr_x.export_focus_points,
             selected_fixtures_only=mvr_x.selected_fixtures_only,
             export_fixtures_only=mvr_x.export_fixtures_only,
+            only_changed=only_changed,
         )
         DMX_Log.log.info(path)
+        if result.ok and only_changed is not None and not result.changed:
+            os.remove(path)
+            self.report({"INFO"}, _("No changes to share"))
+            return {"CANCELLED"}
         if result.ok:
+            DMX_MVR_Delta.remember_shared(result.fixture_hashes, result.removed)
+            if only_changed is not None:
+                comment = f"{comment} ({_('changes only')})"
             commit = SimpleNamespace(
                 file_size=result.file_size,
                 file_uuid=uuid,
                 file_name=file_stem,
                 comment=comment,
+                changes_only=only_changed is not None,
             )
             dmx.createMVR_Shared_Commit(commit)
         return {"FINISHED"}
@@ -263,8 +277,12 @@ class DMX_UL_MVR_Commit(UIList):
         timestamp = datetime.fromtimestamp(item.timestamp).strftime("%H:%M:%S %b %d")
         col.label(text=f"{timestamp}")
         col = layout.column()
-        file_size = sizeof_fmt(item.file_size)
-        col.label(text=f"{file_size}")
+        progress = mvrx_transfers.progress(item.commit_uuid)
+        if progress is not None:
+            col.label(text=f"{progress:.0%}")
+        else:
+            file_size = sizeof_fmt(item.file_size)
+            col.label(text=f"{file_size}")
         col = layout.column()
         col.operator("dmx.mvr_download", text="", icon="IMPORT").uuid = item.commit_uuid
         col.enabled = dmx.mvrx_enabled
@@ -486,6 +504,7 @@ class DMX_PT_DMX_MVR_X(Panel):
             box.prop(mvr_x, "export_focus_points")
             box.prop(mvr_x, "selected_fixtures_only")
             box.prop(mvr_x, "export_fixtures_only")
+            box.prop(mvr_x, "share_changes_only")
 
             row = layout.row()
             row.operator(
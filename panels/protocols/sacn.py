@@ -47,5 +47,7 @@ class DMX_PT_DMX_sACN(Panel):
         row.prop(dmx, "sacn_enabled")
         row.enabled = len(sacn_universes) > 0
         row = layout.row()
+        row.prop(dmx, "sacn_merge_mode")
+        row = layout.row()
         row.label(text=_("sACN set for {} universe(s)").format(len(sacn_universes)))
         layout.label(text=_("Status") + ": " + dmx.sacn_status)
@@ -20,6 +20,7 @@ from bpy.types import Operator, Panel
 
 from ..i18n import DMX_Lang
 from ..logging_setup import DMX_Log
+from ..selection import DMX_Selection
 
 _ = DMX_Lang._
 
@@ -125,15 +126,8 @@ class DMX_OT_Recorder_Delete_Keyframes_Selected(Operator):
     def execute(self, context):
         dmx = context.scene.dmx
 
-        selected = []
-        for fixture in dmx.fixtures:
-            for obj in fixture.collection.objects:
-                if obj in bpy.context.selected_objects:
-                    selected.append(fixture)
-
-        for fixture in dmx.fixtures:
-            if fixture in selected:
-                clear_fixture_animation_data(fixture)
+        for fixture in DMX_Selection.fixtures(dmx):
+            clear_fixture_animation_data(fixture)
 
         return {"FINISHED"}
 
@@ -180,12 +174,7 @@ class DMX_PT_DMX_Recorder_Delete(Panel):
     def draw(self, context):
         layout = self.layout
         dmx = context.scene.dmx
-        selected_fixtures = []
-        for fixture in dmx.fixtures:
-            for obj in fixture.collection.objects:
-                if obj in bpy.context.selected_objects:
-                    selected_fixtures.append(fixture)
-                    break
+        selected_fixtures = DMX_Selection.fixtures(dmx)
 
         selected = len(selected_fixtures) > 0
         fixtures_exist = len(dmx.fixtures) > 0
@@ -28,6 +28,8 @@ from ..in_gdtf import DMX_OT_Import_GDTF
 from ..in_out_mvr import DMX_OT_Export_MVR, DMX_OT_Import_MVR
 from ..material import getVolumeScatterMaterial
 from ..panels import profiles as Profiles
+from ..profiler import DMX_Profiler
+from ..scheduler import DMX_Render_Scheduler
 from ..util import getSceneRect, split_text_on_spaces
 
 _ = DMX_Lang._
@@ -302,6 +304,16 @@ class DMX_PT_Setup_Viewport(Panel):
         row = layout.row()
         row.prop(context.window_manager.dmx, "pause_render")
         row = layout.row()
+        row.prop(dmx, "render_rate")
+        row = layout.row()
+        row.label(
+            text=_("Last tick: {:.1f} ms, dropped: {}, deferred: {}").format(
+                DMX_Render_Scheduler.last_tick * 1000,
+                DMX_Render_Scheduler.dropped_ticks,
+                DMX_Render_Scheduler.deferred,
+            )
+        )
+        row = layout.row()
         row.prop(dmx, "display_2D")
         row = layout.row()
         row.prop(dmx, "enable_device_label")
@@ -446,6 +458,87 @@ class DMX_PT_Setup_Logging(Panel):
         layout.operator("dmx.print_logging_path")
 
 
+class DMX_OT_Profiler_Export(Operator):
+    bl_label = _("Export Profiling Report")
+    bl_description = _("Save the profiling report as a JSON or CSV file")
+    bl_idname = "dmx.profiler_export"
+
+    filter_glob: StringProperty(default="*.json;*.csv", options={"HIDDEN"})
+
+    filepath: StringProperty(name=_("File Path"), subtype="FILE_PATH", maxlen=1024)
+
+    def invoke(self, context, event):
+        if not self.filepath:
+            self.filepath = "blenderdmx_profile.json"
+        context.window_manager.fileselect_add(self)
+        return {"RUNNING_MODAL"}
+
+    def execute(self, context):
+        try:
+            DMX_Profiler.export(self.filepath)
+        except OSError as e:
+            self.report({"ERROR"}, str(e))
+            return {"CANCELLED"}
+        self.report({"INFO"}, _("Profiling report saved to: {}").format(self.filepath))
+        return {"FINISHED"}
+
+
+class DMX_OT_Profiler_Reset(Operator):
+    bl_label = _("Reset")
+    bl_description = _("Clear measured profiling data")
+    bl_idname = "dmx.profiler_reset"
+
+    def execute(self, context):
+        DMX_Profiler.reset()
+        return {"FINISHED"}
+
+
+class DMX_PT_Setup_Profiler(Panel):
+    bl_label = _("Profiling")
+    bl_idname = "DMX_PT_Setup_Profiler"
+    bl_parent_id = "DMX_PT_Setup"
+    bl_space_type = "VIEW_3D"
+    bl_region_type = "UI"
+    bl_category = "DMX"
+    bl_context = "objectmode"
+    bl_options = {"DEFAULT_CLOSED"}
+
+    def draw(self, context):
+        layout = self.layout
+        row = layout.row()
+        row.prop(context.window_manager.dmx, "profiling_enabled")
+        row.operator("dmx.profiler_reset", icon="TRASH")
+        if not DMX_Profiler.enabled:
+            return
+
+        for kind, label in (
+            ("tick", _("Tick")),
+            ("stage", _("Stages")),
+            ("fixture_type", _("Fixture types")),
+            ("fixture", _("Fixtures")),
+        ):
+            box = layout.box()
+            box.label(text=label)
+            for name, timing in DMX_Profiler.top(kind):
+                row = box.row()
+                row.label(text=name)
+                row.label(
+                    text=_("avg {:.2f} ms, max {:.2f} ms").format(
+                        timing.average() * 1000, timing.max * 1000
+                    )
+                )
+
+        box = layout.box()
+        box.label(text=_("Packets per second"))
+        for (source, universe), rate in sorted(DMX_Profiler.packet_rates().items()):
+            row = box.row()
+            row.label(text=f"{source} {universe}")
+            row.label(text=f"{rate:.1f}")
+
+        row = layout.row()
+        row.operator("dmx.profiler_export", icon="EXPORT")
+
+
 # Panel #
 
 
@@ -18,11 +18,12 @@
 import uuid as py_uuid
 
 import bpy
-from bpy.props import StringProperty
+from bpy.props import IntProperty, StringProperty
 from bpy.types import AddonPreferences, Operator
 
 from .. import __package__ as base_package
 from .. import rna_keymap_ui
+from ..gdtf_file import DMX_GDTF_File
 
 
 class DMX_Regenrate_UUID(Operator):
@@ -37,6 +38,10 @@ class DMX_Regenrate_UUID(Operator):
         return {"FINISHED"}
 
 
+def onProfilesCache(self, context):
+    DMX_GDTF_File.trim_gdtf_profiles()
+
+
 class DMX_Preferences(AddonPreferences):
     bl_idname = base_package
 
@@ -59,6 +64,22 @@ class DMX_Preferences(AddonPreferences):
         description="Used for example for MVR xchange",
     )
 
+    profiles_cache_count: IntProperty(
+        default=32,
+        min=1,
+        name="Loaded Profiles",
+        description="Maximum number of GDTF profiles kept loaded in memory",
+        update=onProfilesCache,
+    )
+
+    profiles_cache_size: IntProperty(
+        default=256,
+        min=1,
+        name="Loaded Profiles Size (MB)",
+        description="Maximum size of the files of GDTF profiles kept loaded in memory",
+        update=onProfilesCache,
+    )
+
     def draw(self, context):
         layout = self.layout
         layout.use_property_split = True
@@ -76,6 +97,17 @@ class DMX_Preferences(AddonPreferences):
         col = row.column()
         col.operator("dmx.regenerate_uuid", text="", icon="FILE_REFRESH")
         layout.separator()
+        layout.label(text="GDTF profiles cache")
+        layout.prop(self, "profiles_cache_count")
+        layout.prop(self, "profiles_cache_size")
+        stats = DMX_GDTF_File.cache_stats
+        layout.label(
+            text=f"Loaded: {len(DMX_GDTF_File.gdtf_fixtures)}, "
+            f"{DMX_GDTF_File.gdtf_fixtures_bytes / (1024 * 1024):.1f} MB, "
+            f"hits: {stats['hits']}, misses: {stats['misses']}, "
+            f"evictions: {stats['evictions']}"
+        )
+        layout.separator()
         layout.label(text="Make sure to save the preferences after editing.")
 
         # https://blenderartists.org/t/keymap-for-addons/685544/28
@@ -0,0 +1,194 @@
+# Copyright (C) 2026 vanous
+#
+# This file is part of BlenderDMX.
+#
+# BlenderDMX is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# BlenderDMX is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>.
+
+import csv
+import json
+import time
+from bisect import bisect_right
+
+from .logging_setup import DMX_Log
+
+
+class DMX_Timing:
+    """Count, total, maximum and a histogram of measured durations"""
+
+    # upper bounds of histogram buckets in seconds, the last bucket is open
+    BOUNDS = (
+        0.00001,
+        0.00002,
+        0.00005,
+        0.0001,
+        0.0002,
+        0.0005,
+        0.001,
+        0.002,
+        0.005,
+        0.01,
+        0.02,
+        0.05,
+    )
+
+    __slots__ = ("count", "total", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(DMX_Timing.BOUNDS) + 1)
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.buckets[bisect_right(DMX_Timing.BOUNDS, seconds)] += 1
+
+    def average(self):
+        return self.total / self.count if self.count else 0.0
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "total_ms": self.total * 1000,
+            "average_ms": self.average() * 1000,
+            "max_ms": self.max * 1000,
+            "histogram": {
+                (
+                    f"<{bound * 1000:g}ms" if idx < len(DMX_Timing.BOUNDS) else "more"
+                ): count
+                for idx, (bound, count) in enumerate(
+                    zip(DMX_Timing.BOUNDS + (None,), self.buckets)
+                )
+            },
+        }
+
+
+class DMX_Profile_Marker:
+    """Measures consecutive stages of one fixture render"""
+
+    __slots__ = ("fixture_name", "fixture_type", "start", "last")
+
+    def __init__(self, fixture_name, fixture_type):
+        self.fixture_name = fixture_name
+        self.fixture_type = fixture_type
+        self.start = self.last = time.perf_counter()
+
+    def mark(self, stage):
+        """Record the time since the previous mark as the given stage"""
+        now = time.perf_counter()
+        DMX_Profiler.add("stage", stage, now - self.last)
+        self.last = now
+
+    def finish(self):
+        duration = time.perf_counter() - self.start
+        DMX_Profiler.add("fixture", self.fixture_name, duration)
+        DMX_Profiler.add("fixture_type", self.fixture_type, duration)
+
+
+class DMX_Profiler:
+    """Timing of the render loop and rates of received packets. When not enabled,
+    callers only check the enabled flag, nothing is measured."""
+
+    enabled = False
+    _timings = {"tick": {}, "stage": {}, "fixture": {}, "fixture_type": {}}
+    _packets = {}  # (source, universe): count
+    _since = 0.0
+
+    @staticmethod
+    def enable(enabled):
+        if enabled and not DMX_Profiler.enabled:
+            DMX_Profiler.reset()
+        DMX_Profiler.enabled = enabled
+        DMX_Log.log.info(f"Profiling {'enabled' if enabled else 'disabled'}")
+
+    @staticmethod
+    def reset():
+        for timings in DMX_Profiler._timings.values():
+            timings.clear()
+        DMX_Profiler._packets = {}
+        DMX_Profiler._since = time.perf_counter()
+
+    @staticmethod
+    def start(fixture):
+        return DMX_Profile_Marker(fixture.name, fixture.profile)
+
+    @staticmethod
+    def add(kind, name, seconds):
+        timings = DMX_Profiler._timings[kind]
+        timing = timings.get(name)
+        if timing is None:
+            timing = timings[name] = DMX_Timing()
+        timing.add(seconds)
+
+    @staticmethod
+    def count_packet(source, universe):
+        """Called from network threads"""
+        key = (source, universe)
+        DMX_Profiler._packets[key] = DMX_Profiler._packets.get(key, 0) + 1
+
+    @staticmethod
+    def packet_rates():
+        """Received packets per second, {(source, universe): rate}"""
+        elapsed = max(time.perf_counter() - DMX_Profiler._since, 1e-6)
+        return {
+            key: count / elapsed for key, count in tuple(DMX_Profiler._packets.items())
+        }
+
+    @staticmethod
+    def top(kind, count=5):
+        """Timings with the highest total time, [(name, DMX_Timing)]"""
+        timings = DMX_Profiler._timings[kind]
+        return sorted(timings.items(), key=lambda item: item[1].total, reverse=True)[
+            :count
+        ]
+
+    @staticmethod
+    def report():
+        return {
+            "duration_s": time.perf_counter() - DMX_Profiler._since,
+            **{
+                kind: {name: timing.as_dict() for name, timing in timings.items()}
+                for kind, timings in DMX_Profiler._timings.items()
+            },
+            "packets_per_second": {
+                f"{source}:{universe}": rate
+                for (source, universe), rate in DMX_Profiler.packet_rates().items()
+            },
+        }
+
+    @staticmethod
+    def export(file_path):
+        """Write the report as JSON or, for a .csv file path, as CSV rows"""
+        report = DMX_Profiler.report()
+        if str(file_path).lower().endswith(".csv"):
+            with open(file_path, "w", newline="") as f:
+                writer = csv.writer(f)
+                header = ["kind", "name", "count", "total_ms", "average_ms", "max_ms"]
+                writer.writerow(header + list(DMX_Timing().as_dict()["histogram"]))
+                for kind in DMX_Profiler._timings:
+                    for name, timing in report[kind].items():
+                        writer.writerow(
+                            [kind, name]
+                            + [timing[key] for key in header[2:]]
+                            + list(timing["histogram"].values())
+                        )
+                for name, rate in report["packets_per_second"].items():
+                    writer.writerow(["packets_per_second", name, rate])
+        else:
+            with open(file_path, "w") as f:
+                json.dump(report, f, indent=4)
+        DMX_Log.log.info(f"Profiling report written to {file_path}")
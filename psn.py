@@ -21,6 +21,7 @@ import bpy
 import pypsn
 
 from .logging_setup import DMX_Log
+from .profiler import DMX_Profiler
 
 
 class DMX_PSN:
@@ -35,6 +36,8 @@ class DMX_PSN:
 
     def callback(psn_data, tracker):
         if isinstance(psn_data, pypsn.psn_data_packet):
+            if DMX_Profiler.enabled:
+                DMX_Profiler.count_packet("PSN", tracker.name)
             for idx, slot in enumerate(psn_data.trackers):
                 position = slot.pos
                 DMX_PSN.set_data(tracker.uuid, idx, position)
@@ -0,0 +1,97 @@
+# Copyright (C) 2026 vanous
+#
+# This file is part of BlenderDMX.
+#
+# BlenderDMX is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# BlenderDMX is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>.
+
+import time
+
+from .logging_setup import DMX_Log
+
+
+class DMX_Render_Scheduler:
+    """Spreads fixture renders of the render timer over ticks. Fixtures waiting
+    to be rendered are queued in order, every tick renders from the front of
+    the queue until its time budget is spent, the rest waits for the next tick."""
+
+    # share of the frame period used for rendering, the rest is left to Blender
+    BUDGET = 0.75
+
+    _queue = {}  # fixture names waiting to be rendered, a dict used as an ordered set
+    _tick_start = 0.0
+
+    # counters, shown in the UI
+    ticks = 0
+    dropped_ticks = 0  # ticks which took longer than the frame period
+    deferred = 0  # fixture renders moved to a later tick
+    last_tick = 0.0  # duration of the last tick in seconds
+
+    @staticmethod
+    def add(fixture_names):
+        """Queue fixtures for rendering, already queued fixtures keep their place"""
+        for name in fixture_names:
+            DMX_Render_Scheduler._queue.setdefault(name)
+
+    @staticmethod
+    def clear():
+        DMX_Render_Scheduler._queue.clear()
+
+    @staticmethod
+    def pending():
+        return len(DMX_Render_Scheduler._queue)
+
+    @staticmethod
+    def reset_counters():
+        DMX_Render_Scheduler.ticks = 0
+        DMX_Render_Scheduler.dropped_ticks = 0
+        DMX_Render_Scheduler.deferred = 0
+        DMX_Render_Scheduler.last_tick = 0.0
+
+    @staticmethod
+    def start_tick():
+        DMX_Render_Scheduler._tick_start = time.perf_counter()
+
+    @staticmethod
+    def deadline(rate):
+        return DMX_Render_Scheduler._tick_start + DMX_Render_Scheduler.BUDGET / rate
+
+    @staticmethod
+    def run(fixtures, deadline=None, current_frame=None):
+        """Render queued fixtures until the deadline, at least one fixture is
+        rendered every tick. Without a deadline, the whole queue is rendered."""
+        queue = DMX_Render_Scheduler._queue
+        rendered = 0
+        while queue:
+            if deadline is not None and rendered and time.perf_counter() > deadline:
+                DMX_Render_Scheduler.deferred += len(queue)
+                DMX_Log.log.debug(f"Render over budget, {len(queue)} fixtures deferred")
+                break
+            name = next(iter(queue))
+            del queue[name]
+            fixture = fixtures.get(name)
+            if fixture is not None:
+                fixture.render(current_frame=current_frame)
+                rendered += 1
+
+    @staticmethod
+    def end_tick(rate):
+        """Update counters, returns the interval for the render timer"""
+        period = 1.0 / rate
+        duration = time.perf_counter() - DMX_Render_Scheduler._tick_start
+        DMX_Render_Scheduler.ticks += 1
+        DMX_Render_Scheduler.last_tick = duration
+        if duration > period:
+            DMX_Render_Scheduler.dropped_ticks += 1
+        # keep the frame rate, but always leave some time to Blender
+        return max(period - duration, period * (1 - DMX_Render_Scheduler.BUDGET))
@@ -0,0 +1,152 @@
+# Simulate several MVR-xchange stations against the MVR-xchange TCP server:
+# every station joins, then all of them download the same MVR file at once
+# while a probe station measures how quickly small commits are answered,
+# and a broadcast checks that all joined stations are reached.
+#
+# run this way:
+# blender --background --python ./bench_mvrx_server.py -- --stations 8 --size 200
+
+import argparse
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+import uuid as py_uuid
+
+import bpy
+from dmx.mvrxchange.mvrx_message import mvrx_message
+from dmx.mvrxchange.mvrx_stream import mvrx_receiver
+from dmx.mvrxchange.mvrx_tcp_server import server
+
+
+class Station(threading.Thread):
+    def __init__(self, port, file_uuid, folder):
+        super().__init__()
+        self.uuid = str(py_uuid.uuid4()).upper()
+        self.sock = socket.create_connection(("127.0.0.1", port))
+        self.file_uuid = file_uuid
+        self.path = os.path.join(folder, f"{self.uuid}.mvr")
+        self.receiver = mvrx_receiver(file_path=lambda: self.path)
+        self.buffer = memoryview(bytearray(1 << 20))
+        self.packets = []
+        self.joined = threading.Event()
+        self.broadcast = threading.Event()
+        self.download_time = None
+
+    def send(self, message):
+        self.sock.sendall(mvrx_message.craft_packet(message))
+
+    def receive(self):
+        """Return the next completed packet"""
+        while not self.packets:
+            received = self.sock.recv_into(self.buffer)
+            if not received:
+                raise ConnectionError("server closed the connection")
+            self.packets.extend(self.receiver.feed(self.buffer[:received]))
+        return self.packets.pop(0)
+
+    def run(self):
+        self.send(mvrx_message.create_message("MVR_JOIN", commits=[], uuid=self.uuid))
+        header, payload = self.receive()
+        self.joined.set()
+        self.start_download()
+
+    def start_download(self):
+        started = time.monotonic()
+        self.send(
+            mvrx_message.create_message(
+                "MVR_REQUEST", uuid="", file_uuid=self.file_uuid, app_uuid=self.uuid
+            )
+        )
+        while True:
+            header, payload = self.receive()
+            if header["Type"] == 1:
+                self.download_time = time.monotonic() - started
+            elif b"BENCH_BROADCAST" in payload:
+                self.broadcast.set()
+            if self.download_time is not None and self.broadcast.is_set():
+                break
+        self.sock.close()
+
+
+def probe(port, results, stop):
+    """Round trip of small commits while the downloads run"""
+    sock = socket.create_connection(("127.0.0.1", port))
+    buffer = memoryview(bytearray(65536))
+    receiver = mvrx_receiver()
+    commit = mvrx_message.commit_message.copy()
+    while not stop.is_set():
+        started = time.monotonic()
+        sock.sendall(mvrx_message.craft_packet(commit))
+        while not receiver.feed(buffer[: sock.recv_into(buffer)]):
+            pass
+        results.append(time.monotonic() - started)
+        time.sleep(0.01)
+    sock.close()
+
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stations", type=int, default=8)
+    parser.add_argument("--size", type=int, default=200, help="MVR size in MB")
+    args = parser.parse_args(argv)
+
+    dmx = bpy.context.scene.dmx
+    file_uuid = str(py_uuid.uuid4()).upper()
+    mvrs = os.path.join(dmx.get_addon_path(), "assets", "mvrs")
+    os.makedirs(mvrs, exist_ok=True)
+    file_path = os.path.join(mvrs, f"{file_uuid}.mvr")
+    with open(file_path, "wb") as f:
+        for _ in range(args.size):
+            f.write(os.urandom(1 << 20))
+
+    mvrx_server = server(callback=lambda json_data, data: None, uuid="BENCH")
+    mvrx_server.start()
+    port = mvrx_server.get_port()
+
+    with tempfile.TemporaryDirectory() as folder:
+        latencies = []
+        stop = threading.Event()
+        probe_thread = threading.Thread(target=probe, args=(port, latencies, stop))
+        stations = [Station(port, file_uuid, folder) for _ in range(args.stations)]
+        started = time.monotonic()
+        probe_thread.start()
+        for station in stations:
+            station.start()
+        for station in stations:
+            station.joined.wait()
+        mvrx_server.set_post_data(
+            mvrx_message.craft_packet(
+                {"Type": "MVR_COMMIT", "Comment": "BENCH_BROADCAST"}
+            )
+        )
+        for station in stations:
+            station.join()
+        total = time.monotonic() - started
+        stop.set()
+        probe_thread.join()
+
+        for index, station in enumerate(stations):
+            print("INFO", f"station {index}: {station.download_time:.2f} s")
+        moved = args.size * args.stations
+        print("INFO", f"{args.stations} stations, {moved} MB in {total:.2f} s")
+        print("INFO", f"throughput {moved / total:.1f} MB/s")
+        if latencies:
+            latencies.sort()
+            print(
+                "INFO",
+                f"commit round trip during transfers: median "
+                f"{latencies[len(latencies) // 2] * 1000:.1f} ms, max "
+                f"{latencies[-1] * 1000:.1f} ms",
+            )
+        reached = sum(station.broadcast.is_set() for station in stations)
+        print("INFO", f"broadcast reached {reached}/{args.stations} stations")
+
+    mvrx_server.stop()
+    os.remove(file_path)
+
+
+main()
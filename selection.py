@@ -0,0 +1,122 @@
+# Copyright (C) 2026 vanous
+#
+# This file is part of BlenderDMX.
+#
+# BlenderDMX is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# BlenderDMX is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>.
+
+from contextlib import contextmanager
+from functools import wraps
+
+import bpy
+
+from .fixture_index import DMX_Fixture_Index
+
+
+class DMX_Selection:
+    """Selected objects as a set, to check fixtures against. Inside a batch,
+    the set is collected once and kept up to date by select_object, and the
+    side effects of selecting fixtures (preview volume, fixture list) run once
+    at the end of the batch instead of for every fixture."""
+
+    _depth = 0
+    _selected = None  # pointers of selected objects, kept during a batch
+    _update_volume = False
+    _sync_fixture = None  # name of the fixture to highlight in the fixture list
+
+    @staticmethod
+    @contextmanager
+    def batch():
+        DMX_Selection._depth += 1
+        try:
+            yield
+        finally:
+            DMX_Selection._depth -= 1
+            if DMX_Selection._depth == 0:
+                DMX_Selection._selected = None
+                DMX_Selection._flush()
+
+    @staticmethod
+    def batched(function):
+        """Decorator running the function as a batch"""
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            with DMX_Selection.batch():
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    @staticmethod
+    def reset():
+        """Selection was changed by other means (for example an operator), collect it again"""
+        DMX_Selection._selected = None
+
+    @staticmethod
+    def selected():
+        selected = DMX_Selection._selected
+        if selected is None:
+            selected = {obj.as_pointer() for obj in bpy.context.selected_objects}
+            if DMX_Selection._depth:
+                DMX_Selection._selected = selected
+        return selected
+
+    @staticmethod
+    def is_selected(obj):
+        return obj is not None and obj.as_pointer() in DMX_Selection.selected()
+
+    @staticmethod
+    def select_object(obj, state=True):
+        obj.select_set(state)
+        selected = DMX_Selection._selected
+        if selected is not None:
+            if state:
+                selected.add(obj.as_pointer())
+            else:
+                selected.discard(obj.as_pointer())
+
+    @staticmethod
+    def fixtures(dmx):
+        """Fixtures with any of their objects selected, in the order of the fixture list"""
+        names = set()
+        for obj in bpy.context.selected_objects:
+            fixture = DMX_Fixture_Index.by_object(dmx.fixtures, obj)
+            if fixture is not None:
+                names.add(fixture.name)
+        if not names:
+            return []
+        return [fixture for fixture in dmx.fixtures if fixture.name in names]
+
+    @staticmethod
+    def fixture_changed(fixture):
+        """Fixture was selected or unselected, run side effects now or at the end of the batch"""
+        if DMX_Selection._depth:
+            DMX_Selection._update_volume = True
+            DMX_Selection._sync_fixture = fixture.name
+            return
+        bpy.context.scene.dmx.updatePreviewVolume()
+        fixture.sync_fixture_selection()
+
+    @staticmethod
+    def _flush():
+        update_volume = DMX_Selection._update_volume
+        sync_fixture = DMX_Selection._sync_fixture
+        DMX_Selection._update_volume = False
+        DMX_Selection._sync_fixture = None
+        if not update_volume:
+            return
+        dmx = bpy.context.scene.dmx
+        dmx.updatePreviewVolume()
+        fixture = dmx.fixtures.get(sync_fixture)
+        if fixture is not None:
+            fixture.sync_fixture_selection()
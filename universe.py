@@ -18,6 +18,8 @@
 from bpy.props import EnumProperty, IntProperty, StringProperty
 from bpy.types import PropertyGroup
 
+from .ingest import DMX_Ingest
+
 network_options_list = (
     ("BLENDERDMX", "BlenderDMX", "Set DMX buffer from the Programmer"),
     ("ARTNET", "ArtNet", "Read DMX buffer from ArtNet"),
@@ -26,6 +28,9 @@ network_options_list = (
 
 
 class DMX_Universe(PropertyGroup):
+    def onInput(self, context):
+        DMX_Ingest.update_inputs(context.scene.dmx.universes)
+
     id: IntProperty(name="ID", description="Number of the universe", default=0)
 
     name: StringProperty(
@@ -37,6 +42,7 @@ class DMX_Universe(PropertyGroup):
         description="Input source of the universe",
         default="BLENDERDMX",
         items=network_options_list,
+        update=onInput,
     )
 
     input_settings: StringProperty(default="Input Settings")
@@ -47,9 +53,11 @@ class DMX_Universe(PropertyGroup):
         universe = dmx.universes[-1]
         universe.id = id
         universe.name = name
+        DMX_Ingest.update_inputs(dmx.universes)
         return universe
 
     @staticmethod
     def remove(dmx, i):
         if i >= 0 and i < len(dmx.universes):
             dmx.universes.remove(i)
+            DMX_Ingest.update_inputs(dmx.universes)
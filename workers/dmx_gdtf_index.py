@@ -0,0 +1,81 @@
+# Copyright (C) 2026 vanous
+#
+# This file is part of BlenderDMX.
+#
+# BlenderDMX is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# BlenderDMX is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>.
+
+# Reading of GDTF profiles for the profiles index (fixtures_data.json).
+#
+# This module runs in worker processes of the index build. It is imported as a
+# top level module and must not import bpy or the add-on package.
+
+import hashlib
+import os
+
+import pygdtf
+
+
+def file_signature(path):
+    """Size and modification time, to detect changed files without reading them"""
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def file_hash(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def profile_data(fixture_type, file_name):
+    modes = []
+    for mode in fixture_type.dmx_modes:
+        modes.append(
+            {
+                "mode_name": mode.name,
+                "dmx_channels_count": mode.dmx_channels_count,
+                "description": mode.description,
+                "dmx_breaks": [dmx_break.as_dict() for dmx_break in mode.dmx_breaks],
+            }
+        )
+
+    revisions = fixture_type.revisions.sorted()
+    revision = ""
+    if revisions:
+        revision = revisions[0].text
+    return {
+        "name": f"{fixture_type.name}",
+        "short_name": fixture_type.short_name,
+        "manufacturer_name": f"{fixture_type.manufacturer or 'No manufacturer'}",
+        "filename": file_name,
+        "modes": modes,
+        "revision": revision,
+    }
+
+
+def index_profile(path, known_hash=None):
+    """Return (file name, signature, profile data, error). Data is None if the
+    content hash equals known_hash, as the profile then does not need parsing."""
+    file_name = os.path.basename(path)
+    try:
+        size, mtime = file_signature(path)
+        signature = {"size": size, "mtime": mtime, "hash": file_hash(path)}
+        if signature["hash"] == known_hash:
+            return file_name, signature, None, None
+        with pygdtf.FixtureType(path) as fixture_type:
+            return file_name, signature, profile_data(fixture_type, file_name), None
+    except Exception as e:
+        return file_name, None, None, repr(e)